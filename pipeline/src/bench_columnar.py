@@ -0,0 +1,102 @@
+"""
+Size and decode-time benchmark: published JSON vs the .col columnar encoding.
+
+Encodes every JSON under public/data (or a given directory) that contains
+time series or state tables, checks the round trip, and compares:
+
+  size     — raw and gzip-9 bytes, JSON vs .col
+  decode   — json.loads of the JSON, columnar.decode() back to the same
+             document, and columnar.read_tables() (numpy columns, no rows),
+             which is what a chart actually needs
+
+Usage:
+  python src/bench_columnar.py
+  python src/bench_columnar.py ../public/data/economy --repeat 200
+"""
+
+import argparse
+import gzip
+import json
+import logging
+import sys
+import time
+from pathlib import Path
+
+# Set up path so we can import our modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.publish import columnar, writer
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("bench-columnar")
+logger.setLevel(logging.INFO)
+
+
+def _best_of(fn, payload: bytes, repeat: int) -> float:
+    """Best-of-three mean seconds per call over `repeat` calls."""
+    best = float("inf")
+    for _ in range(3):
+        start = time.perf_counter()
+        for _ in range(repeat):
+            fn(payload)
+        best = min(best, (time.perf_counter() - start) / repeat)
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Compare JSON and columnar encodings of published data.")
+    parser.add_argument("root", type=Path, nargs="?", default=writer.DATA_DIR, help="Directory to scan")
+    parser.add_argument("--repeat", type=int, default=50, help="Decodes per timing run")
+    args = parser.parse_args(argv)
+
+    rows = []
+    for path in sorted(args.root.rglob("*.json")):
+        json_bytes = writer.serialize(json.loads(path.read_bytes()), "compact")
+        data = json.loads(json_bytes)
+        encoded = columnar.encode(data)
+        if encoded is None:
+            continue
+        if columnar.decode(encoded) != data:
+            logger.error(f"{path}: round trip mismatch")
+            return 1
+        rows.append((
+            path.relative_to(args.root).as_posix(),
+            len(json_bytes), len(gzip.compress(json_bytes, 9)),
+            len(encoded), len(gzip.compress(encoded, 9)),
+            _best_of(json.loads, json_bytes, args.repeat),
+            _best_of(columnar.decode, encoded, args.repeat),
+            _best_of(columnar.read_tables, encoded, args.repeat),
+        ))
+
+    if not rows:
+        logger.info(f"No tables found under {args.root}")
+        return 0
+    width = max(len(r[0]) for r in rows)
+    logger.info("=" * 60)
+    logger.info(
+        f"  {'file':<{width}}  {'json':>8}  {'json.gz':>8}  {'col':>8}  {'col.gz':>8}  "
+        f"{'loads µs':>9}  {'decode µs':>9}  {'tables µs':>9}"
+    )
+    for name, js, jgz, col, cgz, t_json, t_decode, t_tables in rows:
+        logger.info(
+            f"  {name:<{width}}  {js:>8,}  {jgz:>8,}  {col:>8,}  {cgz:>8,}  "
+            f"{t_json * 1e6:>9.1f}  {t_decode * 1e6:>9.1f}  {t_tables * 1e6:>9.1f}"
+        )
+    totals = [sum(r[i] for r in rows) for i in range(1, 8)]
+    logger.info(
+        f"  {'total':<{width}}  {totals[0]:>8,}  {totals[1]:>8,}  {totals[2]:>8,}  {totals[3]:>8,}  "
+        f"{totals[4] * 1e6:>9.1f}  {totals[5] * 1e6:>9.1f}  {totals[6] * 1e6:>9.1f}"
+    )
+    logger.info(
+        f"  {len(rows)} files: raw {totals[2] / totals[0]:.0%} of JSON, "
+        f"gzip {totals[3] / totals[1]:.0%} of JSON.gz"
+    )
+    logger.info("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,121 @@
+"""
+Offline FETCH-stage benchmark against the cassette stand-in server.
+
+Starts src/common/standin_server.py on the recorded cassettes, routes all
+HTTP through it, and times the World Bank prefetch plus each domain's fetch()
+under a few client settings. Every scenario runs twice on a throwaway cache:
+cold (empty cache), then warm (the same cache again).
+
+Record cassettes first (needs network), once:
+  python src/build.py --record cassettes/ --refresh
+
+Then benchmark anywhere:
+  python src/bench_fetch.py cassettes/
+  python src/bench_fetch.py cassettes/ --only economy,rbi --latency 0.2 --error-rate 0.05
+  python src/bench_fetch.py cassettes/ --in-flight 1,4,8 --batch-size 1,50
+"""
+
+import argparse
+import importlib
+import itertools
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Set up path so we can import our modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.build import DOMAINS, parse_only
+from src.common import cassette, http_client, indicator_registry, world_bank
+from src.common.cache import CACHE_MODE_ENV, DiskCache
+from src.common.standin_server import StandInServer
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("bench-fetch")
+logger.setLevel(logging.INFO)
+
+
+def _int_list(value: str) -> list[int]:
+    return [int(v) for v in value.split(",") if v.strip()]
+
+
+def run_fetch(domains: list[str]) -> dict[str, float]:
+    """Prefetch + every domain's fetch(), sequentially. Returns seconds per step."""
+    timings: dict[str, float] = {}
+    wb_domains = [d for d in domains if d in indicator_registry.SOURCES]
+    if wb_domains:
+        start = time.perf_counter()
+        indicator_registry.prefetch(wb_domains)
+        timings["world_bank:prefetch"] = time.perf_counter() - start
+    for domain in domains:
+        module = importlib.import_module(DOMAINS[domain])
+        start = time.perf_counter()
+        module.fetch()
+        timings[f"{domain}:fetch"] = time.perf_counter() - start
+    return timings
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark FETCH stages against recorded cassettes.")
+    parser.add_argument("cassettes", type=Path, help="Directory of recorded cassettes")
+    parser.add_argument("--only", help="Comma-separated domains (default: the World Bank domains)")
+    parser.add_argument("--latency", type=float, default=0.05, help="Stand-in delay per response (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay, 0..N (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--in-flight", type=_int_list, default=[1, world_bank.MAX_IN_FLIGHT],
+                        help="World Bank concurrency values to compare")
+    parser.add_argument("--batch-size", type=_int_list, default=[1, world_bank.BATCH_SIZE],
+                        help="Codes per World Bank request to compare (1 = unbatched)")
+    args = parser.parse_args(argv)
+
+    try:
+        domains = parse_only(args.only or ",".join(indicator_registry.SOURCES))
+    except ValueError as e:
+        parser.error(str(e))
+
+    os.environ.pop(CACHE_MODE_ENV, None)
+    os.environ.pop(cassette.RECORD_ENV, None)
+    rows = []
+    with StandInServer.from_directory(
+        args.cassettes,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+    ) as server:
+        os.environ[cassette.REPLAY_ENV] = server.url
+        logger.info(f"Stand-in server at {server.url} — domains: {', '.join(domains)}")
+
+        for in_flight, batch_size in itertools.product(args.in_flight, args.batch_size):
+            world_bank.MAX_IN_FLIGHT = in_flight
+            world_bank.BATCH_SIZE = batch_size
+            with tempfile.TemporaryDirectory() as tmp:
+                world_bank.CACHE = DiskCache(Path(tmp) / "world_bank")
+                for phase in ("cold", "warm"):
+                    http_client.configure()  # fresh connections per run
+                    before = dict(server.stats)
+                    timings = run_fetch(domains)
+                    requests_made = sum(server.stats.values()) - sum(before.values())
+                    rows.append((in_flight, batch_size, phase, sum(timings.values()), requests_made))
+                    logger.info(
+                        f"  in-flight={in_flight} batch={batch_size} {phase}: "
+                        f"{sum(timings.values()):.2f}s, {requests_made} requests"
+                    )
+
+    logger.info("=" * 60)
+    logger.info(f"  {'in-flight':>9}  {'batch':>5}  {'cache':<5}  {'seconds':>8}  {'requests':>8}")
+    for in_flight, batch_size, phase, seconds, requests_made in rows:
+        logger.info(f"  {in_flight:>9}  {batch_size:>5}  {phase:<5}  {seconds:>8.2f}  {requests_made:>8}")
+    logger.info("=" * 60)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
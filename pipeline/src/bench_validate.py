@@ -0,0 +1,105 @@
+"""
+VALIDATE-stage benchmark: the validation cache against plain validation.
+
+Builds each domain's outputs once (fetch() + transform(), from the on-disk
+API cache only), then times the domain's validate() as a fresh build worker
+would run it — compiled adapters and model fingerprints cleared first —
+in three settings:
+
+  off   — the default: every file validated
+  cold  — PIPELINE_VALIDATION_CACHE=1, empty cache: every file validated,
+          results stored
+  warm  — PIPELINE_VALIDATION_CACHE=1, filled cache: the unchanged-rebuild
+          case
+
+The cache is a net win when warm beats off; cold is the one-off price of
+filling it. With today's outputs warm/off is about 1.0 in total, which is
+why the cache stays opt-in.
+
+Usage:
+  python src/bench_validate.py
+  python src/bench_validate.py --only census,economy --repeat 10
+"""
+
+import argparse
+import importlib
+import logging
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Set up path so we can import our modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.build import DOMAINS, parse_only
+from src.common.cache import CACHE_MODE_ENV, DiskCache
+from src.validate import engine
+
+logging.basicConfig(
+    level=logging.WARNING,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("bench-validate")
+logger.setLevel(logging.INFO)
+
+
+def _fresh_worker() -> None:
+    """Forget what a new build worker would not know yet."""
+    engine.adapter_for.cache_clear()
+    engine.schema_fingerprint.cache_clear()
+    engine._module_digest.cache_clear()
+
+
+def _time_validate(module, outputs: dict, repeat: int, cache_dir: Path | None) -> float:
+    """Best seconds for one validate() over `repeat` fresh-worker runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        if cache_dir is not None:
+            engine.CACHE = DiskCache(cache_dir)
+        _fresh_worker()
+        start = time.perf_counter()
+        errors = module.validate(outputs)
+        best = min(best, time.perf_counter() - start)
+        if errors:
+            raise RuntimeError(f"{module.__name__}: {len(errors)} validation error(s)")
+    return best
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Time validation with and without the validation cache.")
+    parser.add_argument("--only", help="Comma-separated domains (default: all)")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per setting (best is reported)")
+    args = parser.parse_args(argv)
+
+    os.environ[CACHE_MODE_ENV] = "offline"
+    logging.disable(logging.WARNING)  # domain stage logs and fetch fallbacks
+    rows = []
+    with tempfile.TemporaryDirectory() as tmp:
+        for domain in parse_only(args.only):
+            module = importlib.import_module(DOMAINS[domain])
+            outputs = module.transform(module.fetch())
+
+            os.environ[engine.VALIDATION_CACHE_ENV] = "0"
+            off = _time_validate(module, outputs, args.repeat, None)
+            os.environ[engine.VALIDATION_CACHE_ENV] = "1"
+            cold = min(
+                _time_validate(module, outputs, 1, Path(tmp) / f"{domain}-cold{i}") for i in range(args.repeat)
+            )
+            warm = _time_validate(module, outputs, args.repeat, Path(tmp) / f"{domain}-cold0")
+            rows.append((domain, len(outputs), off, cold, warm))
+    logging.disable(logging.NOTSET)
+
+    logger.info(f"{'domain':<12} {'files':>5} {'off ms':>8} {'cold ms':>8} {'warm ms':>8} {'warm/off':>9}")
+    for domain, files, off, cold, warm in rows:
+        logger.info(
+            f"{domain:<12} {files:>5} {off * 1000:>8.1f} {cold * 1000:>8.1f} {warm * 1000:>8.1f} {warm / off:>9.2f}"
+        )
+    off, warm = sum(r[2] for r in rows), sum(r[4] for r in rows)
+    logger.info(f"{'total':<12} {'':>5} {off * 1000:>8.1f} {'':>8} {warm * 1000:>8.1f} {warm / off:>9.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,331 @@
+"""
+Build orchestrator — runs every domain pipeline as a single DAG.
+
+Each domain's main module exposes the same four stage functions:
+
+  fetch()            → raw inputs (API responses, curated tables)
+  transform(raw)     → {output path: data dict}
+  validate(outputs)  → list of error strings (empty when valid)
+  publish(outputs)   → list of written paths
+
+Every stage becomes a node in the build graph. Nodes whose dependencies have
+finished are submitted to a process pool, so independent domains run side by
+side and a full rebuild takes roughly as long as the slowest domain instead of
+the sum of all of them. A failed node marks everything downstream of it as
+skipped; other domains carry on.
+
+Each PUBLISH stage also rebuilds its topic page's <domain>/<year>/bundle.json
+(src/publish/bundles.py, called from writer.publish_outputs), so the frontend
+needs one request per page.
+
+With --years, the budget domain is built once per fiscal year: each year
+gets its own budget@<year>:fetch → ... → publish chain (fetch(year) in
+src/main.py), the chains run side by side on the pool, and a final
+budget:years node writes the consolidated years.json once they have all
+published.
+
+World Bank data is fetched once for the whole build by a single bulk node
+(world_bank:prefetch, see src/common/indicator_registry.py) that every
+World Bank-backed domain's FETCH node waits on; those FETCH stages then read
+their indicators from the shared cache.
+
+Usage:
+  python src/build.py                       # all domains
+  python src/build.py --only economy,rbi    # a subset
+  python src/build.py --workers 4
+  python src/build.py --only budget --years 2016-17,2025-26   # several budget years
+  python src/build.py --only budget --years all             # every year with inputs
+  python src/build.py --offline             # serve API data from the on-disk cache only
+  python src/build.py --refresh             # ignore cached API responses
+  python src/build.py --pretty              # indented JSON, for reviewing data diffs
+  python src/build.py --hashed              # also publish content-hashed names + manifest.json
+  python src/build.py --shard-indicators    # also one file per explorer indicator + index
+  python src/build.py --columnar            # also .col columnar encodings of tables/series
+  python src/build.py --precompress         # also .gz/.br sidecars, for a deploy step (gitignored)
+  python src/build.py --refresh --record cassettes/   # capture HTTP for offline replay
+  python src/build.py --replay http://127.0.0.1:8765  # use the cassette stand-in server
+"""
+
+import argparse
+import importlib
+import logging
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any
+
+# Set up path so we can import our modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from src.common import cassette, http_client, indicator_registry
+from src.common.cache import CACHE_MODE_ENV, REFRESH_AFTER_ENV
+from src.extract import csv_parser
+from src.publish import shards, writer
+
+logging.basicConfig(
+    level=logging.INFO,
+    format="%(asctime)s [%(levelname)s] %(name)s: %(message)s",
+)
+logger = logging.getLogger("build")
+
+# Domain name → module exposing fetch/transform/validate/publish
+DOMAINS: dict[str, str] = {
+    "budget": "src.main",
+    "economy": "src.economy.main",
+    "rbi": "src.rbi.main",
+    "states": "src.states.main",
+    "census": "src.census.main",
+    "education": "src.education.main",
+    "employment": "src.employment.main",
+    "healthcare": "src.healthcare.main",
+    "environment": "src.environment.main",
+    "elections": "src.elections.main",
+}
+
+STAGES = ("fetch", "transform", "validate", "publish")
+PREFETCH = "world_bank:prefetch"
+YEARS_NODE = "budget:years"
+
+
+class ValidationFailed(Exception):
+    """Raised by a VALIDATE node whose stage function reported errors."""
+
+
+@dataclass
+class Node:
+    """
+    One stage function call. `args` are fixed arguments; `arg` names the node
+    whose result is appended to them.
+    """
+    name: str
+    module: str
+    stage: str
+    deps: tuple[str, ...] = ()
+    arg: str | None = None
+    args: tuple = ()
+
+
+@dataclass
+class NodeResult:
+    name: str
+    status: str  # "ok" | "failed" | "skipped"
+    seconds: float = 0.0
+    value: Any = field(default=None, repr=False)
+    error: str | None = None
+
+
+def build_graph(domains: list[str], budget_years: list[str] | None = None) -> dict[str, Node]:
+    """
+    Build the FETCH → TRANSFORM → VALIDATE → PUBLISH chain for
+    each domain, with the World Bank bulk prefetch ahead of every domain
+    that uses it. With `budget_years`, budget gets one chain per year plus
+    the years.json node after all of them.
+    """
+    nodes: dict[str, Node] = {}
+    wb_domains = [d for d in domains if d in indicator_registry.SOURCES]
+    if wb_domains:
+        nodes[PREFETCH] = Node(
+            PREFETCH, "src.common.indicator_registry", "prefetch", args=(wb_domains,)
+        )
+
+    for domain in domains:
+        module = DOMAINS[domain]
+        if domain == "budget" and budget_years:
+            chains = [(f"{domain}@{year}", (year,)) for year in budget_years]
+        else:
+            chains = [(domain, ())]
+        for prefix, fetch_args in chains:
+            fetch, transform, validate, publish = (f"{prefix}:{stage}" for stage in STAGES)
+            fetch_deps = (PREFETCH,) if domain in wb_domains else ()
+            nodes[fetch] = Node(fetch, module, "fetch", deps=fetch_deps, args=fetch_args)
+            nodes[transform] = Node(transform, module, "transform", deps=(fetch,), arg=fetch)
+            nodes[validate] = Node(validate, module, "validate", deps=(transform,), arg=transform)
+            # PUBLISH waits for VALIDATE but writes the TRANSFORM outputs
+            nodes[publish] = Node(publish, module, "publish", deps=(validate,), arg=transform)
+        if domain == "budget" and budget_years:
+            publishes = tuple(f"{prefix}:publish" for prefix, _ in chains)
+            nodes[YEARS_NODE] = Node(YEARS_NODE, module, "publish_years_index", deps=publishes)
+    return nodes
+
+
+def _run_stage(module_name: str, stage: str, args: tuple) -> tuple[Any, float]:
+    """Worker entry point: import the domain module and run one stage function."""
+    module = importlib.import_module(module_name)
+    http_before = http_client.stats()
+    start = time.perf_counter()
+    value = getattr(module, stage)(*args)
+    elapsed = time.perf_counter() - start
+    http_client.log_stats(since=http_before)
+    if stage == "validate" and value:
+        raise ValidationFailed(f"{len(value)} validation error(s): " + "; ".join(value))
+    return value, elapsed
+
+
+def run_dag(nodes: dict[str, Node], max_workers: int | None = None) -> dict[str, NodeResult]:
+    """
+    Execute a build graph on a process pool.
+
+    Returns a NodeResult for every node. Nodes are submitted as soon as all of
+    their dependencies succeed; a node with a failed or skipped dependency is
+    skipped without running.
+    """
+    results: dict[str, NodeResult] = {}
+    pending = dict(nodes)
+    running: dict[Any, tuple[str, float]] = {}
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            # Resolve every node whose dependencies are settled. Skips can
+            # cascade, so keep sweeping until nothing changes.
+            changed = True
+            while changed:
+                changed = False
+                for name, node in list(pending.items()):
+                    if not all(dep in results for dep in node.deps):
+                        continue
+                    del pending[name]
+                    changed = True
+                    if any(results[dep].status != "ok" for dep in node.deps):
+                        results[name] = NodeResult(name, "skipped")
+                        continue
+                    args = node.args if node.arg is None else (*node.args, results[node.arg].value)
+                    future = pool.submit(_run_stage, node.module, node.stage, args)
+                    running[future] = (name, time.perf_counter())
+
+            if not running:
+                break
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                name, submitted = running.pop(future)
+                try:
+                    value, seconds = future.result()
+                    results[name] = NodeResult(name, "ok", seconds, value)
+                except BaseException as e:  # SystemExit from a stage counts as a failure too
+                    elapsed = time.perf_counter() - submitted
+                    results[name] = NodeResult(name, "failed", elapsed, error=str(e) or type(e).__name__)
+                    logger.error(f"{name} FAILED: {results[name].error}")
+
+    return results
+
+
+def log_summary(nodes: dict[str, Node], results: dict[str, NodeResult], wall: float) -> None:
+    """Log a per-node timing table in graph order."""
+    node_total = sum(r.seconds for r in results.values())
+    width = max(len(name) for name in nodes)
+    logger.info("=" * 60)
+    logger.info(f"Build summary — wall {wall:.2f}s, sum of nodes {node_total:.2f}s")
+    logger.info(f"  {'node':<{width}}  {'status':<8}  {'seconds':>8}")
+    for name in nodes:
+        r = results[name]
+        logger.info(f"  {name:<{width}}  {r.status:<8}  {r.seconds:>8.2f}")
+    logger.info("=" * 60)
+
+
+def parse_only(value: str | None) -> list[str]:
+    """Parse a comma-separated --only list, preserving DOMAINS order."""
+    if not value:
+        return list(DOMAINS)
+    requested = {d.strip() for d in value.split(",") if d.strip()}
+    unknown = requested - DOMAINS.keys()
+    if unknown:
+        raise ValueError(
+            f"Unknown domain(s): {', '.join(sorted(unknown))} "
+            f"(choose from {', '.join(DOMAINS)})"
+        )
+    return [d for d in DOMAINS if d in requested]
+
+
+def parse_years(value: str | None) -> list[str] | None:
+    """Parse a comma-separated --years list (or "all"), sorted and de-duplicated."""
+    if not value:
+        return None
+    if value.strip() == "all":
+        return csv_parser.input_years()
+    years = sorted({y.strip() for y in value.split(",") if y.strip()})
+    invalid = [y for y in years if not csv_parser.YEAR_PATTERN.fullmatch(y)]
+    if invalid:
+        raise ValueError(f"Invalid fiscal year(s): {', '.join(invalid)} (expected e.g. 2016-17)")
+    return years
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Build all domain pipelines as one DAG.")
+    parser.add_argument("--only", help="Comma-separated domains to build (default: all)")
+    parser.add_argument("--workers", type=int, help="Process pool size (default: one per domain and budget year)")
+    parser.add_argument("--years", help="Comma-separated budget fiscal years, or 'all' (default: the current year)")
+    cache = parser.add_mutually_exclusive_group()
+    cache.add_argument("--refresh", action="store_true", help="Ignore cached API responses and re-download")
+    cache.add_argument("--offline", action="store_true", help="Make no network calls; use cached API responses only")
+    parser.add_argument("--pretty", action="store_true", help="Write indented JSON instead of compact")
+    parser.add_argument("--hashed", action="store_true", help="Also write content-hashed files and manifest.json")
+    parser.add_argument("--shard-indicators", action="store_true",
+                        help="Also write indicators.json as an index plus one shard per indicator")
+    parser.add_argument("--columnar", action="store_true", help="Also write .col columnar encodings")
+    parser.add_argument("--precompress", action="store_true",
+                        help="Also write .gz/.br sidecars of every JSON (deploy builds; not committed)")
+    http = parser.add_mutually_exclusive_group()
+    http.add_argument("--record", type=Path, metavar="DIR", help="Record HTTP exchanges to cassettes in DIR")
+    http.add_argument("--replay", metavar="URL", help="Send HTTP to a cassette stand-in server at URL")
+    args = parser.parse_args(argv)
+
+    # Worker processes inherit cache, output and record/replay settings through the environment
+    if args.pretty:
+        os.environ[writer.JSON_MODE_ENV] = "pretty"
+    if args.hashed:
+        os.environ[writer.HASHED_NAMES_ENV] = "1"
+    if args.shard_indicators:
+        os.environ[shards.SHARD_ENV] = "1"
+    if args.columnar:
+        os.environ[writer.COLUMNAR_ENV] = "1"
+    if args.precompress:
+        os.environ[writer.PRECOMPRESS_ENV] = "1"
+    if args.record:
+        os.environ[cassette.RECORD_ENV] = str(args.record.resolve())
+    elif args.replay:
+        os.environ[cassette.REPLAY_ENV] = args.replay
+    if args.refresh:
+        os.environ[CACHE_MODE_ENV] = "refresh"
+        os.environ[REFRESH_AFTER_ENV] = str(time.time())
+    elif args.offline:
+        os.environ[CACHE_MODE_ENV] = "offline"
+
+    try:
+        domains = parse_only(args.only)
+        years = parse_years(args.years)
+    except ValueError as e:
+        parser.error(str(e))
+    if years and "budget" not in domains:
+        parser.error("--years needs the budget domain")
+
+    nodes = build_graph(domains, years)
+    workers = args.workers or len(domains) + len(years or [None]) - 1
+
+    logger.info("=" * 60)
+    logger.info(f"Pipeline build — {len(domains)} domain(s), {len(nodes)} nodes, {workers} workers")
+    if years:
+        logger.info(f"Budget years: {', '.join(years)}")
+    logger.info("=" * 60)
+
+    start = time.perf_counter()
+    results = run_dag(nodes, max_workers=workers)
+    log_summary(nodes, results, time.perf_counter() - start)
+    if args.record:
+        cassette.compact(args.record)
+
+    failed = [r.name for r in results.values() if r.status != "ok"]
+    if failed:
+        logger.error(f"Build finished with {len(failed)} failed/skipped node(s)")
+        return 1
+    if args.precompress:
+        # Domains compress their own outputs; this catches static JSON (e.g. geo/)
+        writer.precompress_tree()
+    logger.info("Build complete!")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
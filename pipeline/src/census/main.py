@@ -22,7 +22,7 @@ from pathlib import Path
 # Set up path so we can import our modules
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from src.census.sources.world_bank import fetch_multiple
+from src.census.sources.world_bank import PRECISION, fetch_multiple
 from src.census.sources.curated import (
     CENSUS_2011_STATES,
     NPC_2026_PROJECTIONS,
@@ -43,6 +43,7 @@ from src.census.validate.schemas import (
     GlossaryData,
 )
 from src.publish.writer import publish_all
+from src.validate.engine import validate_outputs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -52,13 +53,23 @@ logger = logging.getLogger("census-pipeline")
 
 SURVEY_YEAR = "2025-26"
 
+OUTPUT_DIR = f"census/{SURVEY_YEAR}"
+FLOAT_DECIMALS = PRECISION
 
-def run_census_pipeline():
-    logger.info("=" * 60)
-    logger.info(f"Census & Demographics Data Pipeline \u2014 {SURVEY_YEAR}")
-    logger.info("=" * 60)
+# Output filename → Pydantic model, in validation order
+SCHEMAS = {
+    "summary.json": CensusSummary,
+    "population.json": PopulationData,
+    "demographics.json": DemographicsData,
+    "literacy.json": LiteracyData,
+    "health.json": HealthData,
+    "indicators.json": CensusIndicatorsData,
+    "glossary.json": GlossaryData,
+}
 
-    # \u2500\u2500 Stage 1: FETCH \u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500
+
+def fetch() -> dict:
+    """Stage 1: World Bank indicators + curated Census/NFHS/SRS tables."""
     logger.info("Stage 1: FETCH")
     logger.info("  Fetching 19 indicators from World Bank API...")
 
@@ -70,8 +81,13 @@ def run_census_pipeline():
     logger.info(f"  Curated: {len(NFHS5_STATE_HEALTH)} NFHS-5 states")
     logger.info(f"  Curated: {len(SRS_STATE_IMR)} SRS IMR states")
 
-    # \u2500\u2500 Stage 2: TRANSFORM \u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500
+    return {"wb_data": wb_data}
+
+
+def transform(raw: dict) -> dict[str, dict]:
+    """Stage 2: build every output file, keyed by filename."""
     logger.info("Stage 2: TRANSFORM")
+    wb_data = raw["wb_data"]
 
     population_data = build_population(wb_data, CENSUS_2011_STATES, NPC_2026_PROJECTIONS, SURVEY_YEAR)
     demographics_data = build_demographics(wb_data, CENSUS_2011_STATES, SURVEY_YEAR)
@@ -81,48 +97,48 @@ def run_census_pipeline():
     indicators_data = _build_indicators(CENSUS_2011_STATES, NPC_2026_PROJECTIONS, NFHS5_STATE_HEALTH, SRS_STATE_IMR)
     glossary_data = _build_glossary()
 
-    # \u2500\u2500 Stage 3: VALIDATE \u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500
+    return {
+        "summary.json": summary_data,
+        "population.json": population_data,
+        "demographics.json": demographics_data,
+        "literacy.json": literacy_data,
+        "health.json": health_data,
+        "indicators.json": indicators_data,
+        "glossary.json": glossary_data,
+    }
+
+
+def validate(outputs: dict[str, dict]) -> list[str]:
+    """Stage 3: check each output against its Pydantic model. Returns error strings."""
     logger.info("Stage 3: VALIDATE")
-    errors = []
-
-    validations = [
-        ("summary.json", CensusSummary, summary_data),
-        ("population.json", PopulationData, population_data),
-        ("demographics.json", DemographicsData, demographics_data),
-        ("literacy.json", LiteracyData, literacy_data),
-        ("health.json", HealthData, health_data),
-        ("indicators.json", CensusIndicatorsData, indicators_data),
-        ("glossary.json", GlossaryData, glossary_data),
-    ]
-
-    for name, model, data in validations:
-        try:
-            model(**data)
-            logger.info(f"  {name} \u2713")
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            logger.error(f"  {name} FAILED: {e}")
+    return validate_outputs(outputs, SCHEMAS, decimals=FLOAT_DECIMALS).errors
+
+
+def publish(outputs: dict[str, dict]) -> list[Path]:
+    """Stage 4: write outputs under public/data/census/."""
+    logger.info("Stage 4: PUBLISH")
+    paths = publish_all(
+        {f"{OUTPUT_DIR}/{name}": data for name, data in outputs.items()}, decimals=FLOAT_DECIMALS
+    )
+    logger.info(f"Published {len(paths)} files")
+    return paths
 
+
+def run_census_pipeline():
+    logger.info("=" * 60)
+    logger.info(f"Census & Demographics Data Pipeline \u2014 {SURVEY_YEAR}")
+    logger.info("=" * 60)
+
+    outputs = transform(fetch())
+
+    errors = validate(outputs)
     if errors:
         logger.error(f"Validation failed with {len(errors)} error(s):")
         for err in errors:
             logger.error(f"  - {err}")
         sys.exit(1)
 
-    # \u2500\u2500 Stage 4: PUBLISH \u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500\u2500
-    logger.info("Stage 4: PUBLISH")
-    outputs = {
-        f"census/{SURVEY_YEAR}/summary.json": summary_data,
-        f"census/{SURVEY_YEAR}/population.json": population_data,
-        f"census/{SURVEY_YEAR}/demographics.json": demographics_data,
-        f"census/{SURVEY_YEAR}/literacy.json": literacy_data,
-        f"census/{SURVEY_YEAR}/health.json": health_data,
-        f"census/{SURVEY_YEAR}/indicators.json": indicators_data,
-        f"census/{SURVEY_YEAR}/glossary.json": glossary_data,
-    }
-
-    paths = publish_all(outputs)
-    logger.info(f"Published {len(paths)} files")
+    publish(outputs)
 
     logger.info("=" * 60)
     logger.info("Census & Demographics pipeline complete!")
@@ -0,0 +1,155 @@
+"""
+Persistent on-disk cache for API responses.
+
+Entries live as small JSON files under pipeline/.cache/<namespace>/, named by
+the SHA-256 of the request key, so any request identity (indicator code, year
+range, precision, ...) maps to a stable file. Each entry carries its own TTL
+plus the ETag / Last-Modified validators needed for conditional revalidation.
+
+The cache is size-bounded: after each write, least-recently-used entries (by
+file mtime, bumped on every hit) are evicted until the namespace fits.
+
+The cache mode is read from the PIPELINE_CACHE_MODE environment variable so
+that worker processes inherit it from the build orchestrator:
+  default — serve fresh entries, revalidate stale ones
+  refresh — ignore entries cached before this run started, re-download them
+  offline — never touch the network; serve whatever is cached
+
+"This run" starts at PIPELINE_REFRESH_AFTER (a Unix timestamp the build
+orchestrator sets once for all workers) or at import time, so a refreshed
+entry is downloaded once and then shared by every later caller in the run.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+import time
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+CACHE_ROOT = Path(__file__).resolve().parent.parent.parent / ".cache"
+CACHE_MODE_ENV = "PIPELINE_CACHE_MODE"
+CACHE_MODES = ("default", "refresh", "offline")
+REFRESH_AFTER_ENV = "PIPELINE_REFRESH_AFTER"
+_STARTED = time.time()
+
+DEFAULT_TTL = 30 * 24 * 3600  # 30 days; most sources publish annually
+DEFAULT_MAX_BYTES = 50 * 1024 * 1024
+
+
+def cache_mode() -> str:
+    """Current cache mode from the environment (falls back to 'default')."""
+    mode = os.environ.get(CACHE_MODE_ENV, "default").strip().lower()
+    if mode not in CACHE_MODES:
+        logger.warning(f"Unknown {CACHE_MODE_ENV}={mode!r} — using 'default'")
+        return "default"
+    return mode
+
+
+def refresh_after() -> float:
+    """In refresh mode, entries fetched before this timestamp are ignored."""
+    return float(os.environ.get(REFRESH_AFTER_ENV, _STARTED))
+
+
+@dataclass
+class CacheEntry:
+    data: Any
+    fetched_at: float
+    ttl: float
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self, now: float | None = None) -> bool:
+        return ((now or time.time()) - self.fetched_at) < self.ttl
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers for revalidating this entry."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+class DiskCache:
+    """Size-bounded LRU cache of JSON entries in one directory."""
+
+    def __init__(self, directory: Path, max_bytes: int = DEFAULT_MAX_BYTES):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(*parts: Any) -> str:
+        """Stable content address for a request identity."""
+        raw = "|".join(str(p) for p in parts)
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _path(self, key: str) -> Path:
+        return self.directory / f"{key}.json"
+
+    def get(self, key: str) -> CacheEntry | None:
+        path = self._path(key)
+        try:
+            with open(path) as f:
+                entry = CacheEntry(**json.load(f))
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError, TypeError) as e:
+            logger.warning(f"Discarding unreadable cache entry {path.name}: {e}")
+            path.unlink(missing_ok=True)
+            return None
+        # Bump mtime so LRU eviction sees this as recently used
+        try:
+            os.utime(path)
+        except OSError:
+            pass
+        return entry
+
+    def put(
+        self,
+        key: str,
+        data: Any,
+        ttl: float = DEFAULT_TTL,
+        etag: str | None = None,
+        last_modified: str | None = None,
+    ) -> None:
+        entry = CacheEntry(data, time.time(), ttl, etag, last_modified)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        # Write to a temp file and rename so readers never see a partial entry
+        fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        try:
+            with os.fdopen(fd, "w") as f:
+                json.dump(asdict(entry), f, separators=(",", ":"))
+            os.replace(tmp, self._path(key))
+        except BaseException:
+            Path(tmp).unlink(missing_ok=True)
+            raise
+        self._evict()
+
+    def _evict(self) -> None:
+        with self._lock:
+            files = []
+            for path in self.directory.glob("*.json"):
+                try:
+                    st = path.stat()
+                except FileNotFoundError:
+                    continue
+                files.append((st.st_mtime, st.st_size, path))
+            total = sum(size for _, size, _ in files)
+            if total <= self.max_bytes:
+                return
+            files.sort()  # oldest access first
+            for _, size, path in files:
+                if total <= self.max_bytes:
+                    break
+                path.unlink(missing_ok=True)
+                total -= size
+                logger.debug(f"Evicted cache entry {path.name}")
@@ -0,0 +1,147 @@
+"""
+Record/replay of HTTP exchanges for offline benchmarks and CI.
+
+Two environment switches, read on every request by src/common/http_client.py:
+
+  PIPELINE_HTTP_RECORD=<dir>   append every GET (URL, status, validators, body)
+                               to <dir>/<host>-<pid>.jsonl as it happens
+  PIPELINE_HTTP_REPLAY=<url>   send every GET to a stand-in server instead, as
+                               <url>/<original host><original path>?<query>
+
+Recording appends per process so build workers never share a file; compact()
+then folds the raw logs into one deduplicated <host>.json.gz cassette per host.
+The build and single-domain runs compact on exit when recording. Streamed
+downloads (CKAN files) are not recorded.
+
+The stand-in server lives in src/common/standin_server.py.
+"""
+
+import atexit
+import gzip
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qsl, urlencode, urlsplit
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+RECORD_ENV = "PIPELINE_HTTP_RECORD"
+REPLAY_ENV = "PIPELINE_HTTP_REPLAY"
+
+# Response headers worth replaying (conditional revalidation depends on them)
+KEPT_HEADERS = ("Content-Type", "ETag", "Last-Modified")
+
+_lock = threading.Lock()
+_compact_registered = False
+
+
+def record_dir() -> Path | None:
+    value = os.environ.get(RECORD_ENV)
+    return Path(value) if value else None
+
+
+def replay_base() -> str | None:
+    value = os.environ.get(REPLAY_ENV)
+    return value.rstrip("/") if value else None
+
+
+def request_key(path: str, query: str) -> str:
+    """Normalized request identity: path plus query parameters in sorted order."""
+    params = sorted(parse_qsl(query, keep_blank_values=True))
+    return f"{path}?{urlencode(params)}" if params else path
+
+
+def replay_url(url: str, base: str) -> str:
+    """Rewrite https://host/path?q to <base>/host/path?q."""
+    parts = urlsplit(url)
+    rewritten = f"{base}/{parts.netloc}{parts.path}"
+    return f"{rewritten}?{parts.query}" if parts.query else rewritten
+
+
+def record(resp: requests.Response, directory: Path) -> None:
+    """Append one exchange to this process's raw log for the response's host."""
+    global _compact_registered
+    parts = urlsplit(resp.url)
+    line = json.dumps({
+        "key": request_key(parts.path, parts.query),
+        "status": resp.status_code,
+        "headers": {h: resp.headers[h] for h in KEPT_HEADERS if h in resp.headers},
+        "body": resp.text,
+    }, separators=(",", ":"))
+    with _lock:
+        directory.mkdir(parents=True, exist_ok=True)
+        with open(directory / f"{parts.netloc}-{os.getpid()}.jsonl", "a") as f:
+            f.write(line + "\n")
+        if not _compact_registered:
+            # Only runs in the process that recorded first — pool workers
+            # leave via os._exit, so the parent build compacts for them
+            atexit.register(compact, directory)
+            _compact_registered = True
+
+
+def compact(directory: Path) -> dict[str, int]:
+    """
+    Fold raw .jsonl logs into one <host>.json.gz cassette per host.
+
+    Later recordings of the same request replace earlier ones. Returns
+    {host: number of interactions}.
+    """
+    directory = Path(directory)
+    with _lock:
+        raw: dict[str, list[Path]] = {}
+        for path in sorted(directory.glob("*.jsonl")):
+            host = path.stem.rsplit("-", 1)[0]
+            raw.setdefault(host, []).append(path)
+
+        counts = {}
+        for host, paths in raw.items():
+            interactions = load_host(directory, host, include_raw=False)
+            for path in paths:
+                with open(path) as f:
+                    for line in f:
+                        if line.strip():
+                            item = json.loads(line)
+                            interactions[item.pop("key")] = item
+            _write_cassette(directory / f"{host}.json.gz", host, interactions)
+            for path in paths:
+                path.unlink()
+            counts[host] = len(interactions)
+            logger.info(f"Cassette {host}: {len(interactions)} interactions")
+        return counts
+
+
+def _write_cassette(path: Path, host: str, interactions: dict[str, Any]) -> None:
+    tmp = path.with_suffix(".tmp")
+    with gzip.open(tmp, "wt") as f:
+        json.dump({"host": host, "interactions": interactions}, f, separators=(",", ":"))
+    os.replace(tmp, path)
+
+
+def load_host(directory: Path, host: str, include_raw: bool = True) -> dict[str, dict[str, Any]]:
+    """Interactions recorded for one host, keyed by request_key()."""
+    interactions: dict[str, dict[str, Any]] = {}
+    path = Path(directory) / f"{host}.json.gz"
+    if path.exists():
+        with gzip.open(path, "rt") as f:
+            interactions.update(json.load(f)["interactions"])
+    if include_raw:
+        for raw in sorted(Path(directory).glob(f"{host}-*.jsonl")):
+            with open(raw) as f:
+                for line in f:
+                    if line.strip():
+                        item = json.loads(line)
+                        interactions[item.pop("key")] = item
+    return interactions
+
+
+def load(directory: Path) -> dict[str, dict[str, dict[str, Any]]]:
+    """Every cassette in a directory: {host: {request key: interaction}}."""
+    directory = Path(directory)
+    hosts = {p.name[: -len(".json.gz")] for p in directory.glob("*.json.gz")}
+    hosts |= {p.stem.rsplit("-", 1)[0] for p in directory.glob("*.jsonl")}
+    return {host: load_host(directory, host) for host in sorted(hosts)}
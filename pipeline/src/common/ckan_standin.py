@@ -0,0 +1,216 @@
+"""
+Local stand-in for the Open Budgets India CKAN API and its resource files.
+
+Serves package_search over a fixed list of datasets and the resource files
+themselves, with the parts of HTTP that resumable downloads rely on:
+Content-Length, ETag, Range (206 / 416) and If-Range. Requests are matched on
+the path suffix, so it answers both direct URLs and the
+/<original host><original path> form http_client sends under
+PIPELINE_HTTP_REPLAY:
+
+  .../api/3/action/package_search?q=..&rows=..   datasets whose title, notes
+                                                 or tags contain every query word
+  .../files/<name>                               the resource bytes
+
+Resource URLs given as "/files/<name>" are returned absolute (on this
+server). Fault injection for tests and benchmarks:
+
+  latency     — fixed delay before every response (seconds)
+  drop_after  — send at most this many body bytes per file response, then
+                close the connection, like a download cut off mid-way
+
+Usage:
+  python -m src.common.ckan_standin data-raw/ --port 8766 --drop-after 1000000
+  PIPELINE_HTTP_REPLAY=http://127.0.0.1:8766 python src/main.py
+"""
+
+import argparse
+import hashlib
+import json
+import logging
+import re
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import parse_qs, urlsplit
+
+logger = logging.getLogger(__name__)
+
+SEARCH_PATH = "/api/3/action/package_search"
+FILES_PATH = "/files/"
+_RANGE = re.compile(r"bytes=(\d+)-(\d*)")
+
+
+class CkanStandIn:
+    """Threaded CKAN stand-in. Usable as a context manager."""
+
+    def __init__(
+        self,
+        datasets: list[dict],
+        files: dict[str, bytes],
+        latency: float = 0.0,
+        drop_after: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.datasets = datasets
+        self.files = files
+        self.latency = latency
+        self.drop_after = drop_after
+        self.stats = {"searches": 0, "downloads": 0, "ranged": 0, "dropped": 0, "misses": 0}
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+
+    @classmethod
+    def from_directory(cls, directory: Path, **kwargs: Any) -> "CkanStandIn":
+        """One dataset per file in `directory`, titled "Union Budget <file stem>"."""
+        files = {p.name: p.read_bytes() for p in sorted(Path(directory).iterdir()) if p.is_file()}
+        datasets = [
+            {
+                "title": f"Union Budget {Path(name).stem}",
+                "resources": [{
+                    "name": Path(name).stem,
+                    "format": Path(name).suffix.lstrip(".").upper(),
+                    "url": f"{FILES_PATH}{name}",
+                    "size": len(data),
+                    "hash": "sha256:" + hashlib.sha256(data).hexdigest(),
+                }],
+            }
+            for name, data in files.items()
+        ]
+        return cls(datasets, files, **kwargs)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        threading.Thread(target=self._httpd.serve_forever, daemon=True).start()
+        return self.url
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "CkanStandIn":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _count(self, stat: str) -> None:
+        with self._lock:
+            self.stats[stat] += 1
+
+    def search(self, query: str, rows: int) -> dict:
+        words = query.lower().split()
+        results = []
+        for dataset in self.datasets:
+            text = " ".join([
+                dataset.get("title", ""), dataset.get("notes", ""),
+                *(t.get("name", "") for t in dataset.get("tags", [])),
+            ]).lower()
+            if all(word in text for word in words):
+                resources = [
+                    {**r, "url": self.url + r["url"] if r.get("url", "").startswith("/") else r.get("url")}
+                    for r in dataset.get("resources", [])
+                ]
+                results.append({**dataset, "resources": resources})
+        return {"success": True, "result": {"count": len(results), "results": results[:rows]}}
+
+    @staticmethod
+    def etag(data: bytes) -> str:
+        return f'"{hashlib.sha256(data).hexdigest()[:16]}"'
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def _send(self, status: int, headers: dict[str, str], body: bytes, limit: int | None = None) -> None:
+                self.send_response(status)
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                if limit is not None and limit < len(body):
+                    server._count("dropped")
+                    self.wfile.write(body[:limit])
+                    self.wfile.flush()
+                    self.close_connection = True
+                    return
+                self.wfile.write(body)
+
+            def do_GET(self):
+                if server.latency:
+                    time.sleep(server.latency)
+                parts = urlsplit(self.path)
+                if parts.path.endswith(SEARCH_PATH):
+                    server._count("searches")
+                    params = parse_qs(parts.query)
+                    reply = server.search(params.get("q", [""])[0], int(params.get("rows", ["10"])[0]))
+                    self._send(200, {"Content-Type": "application/json"}, json.dumps(reply).encode())
+                    return
+                name = parts.path.rpartition(FILES_PATH)[2] if FILES_PATH in parts.path else None
+                data = server.files.get(name) if name else None
+                if data is None:
+                    server._count("misses")
+                    self._send(404, {"Content-Type": "application/json"}, b'{"success": false}')
+                    return
+                server._count("downloads")
+                etag = server.etag(data)
+                headers = {"Content-Type": "application/octet-stream", "ETag": etag, "Accept-Ranges": "bytes"}
+                match = _RANGE.fullmatch(self.headers.get("Range", ""))
+                if_range = self.headers.get("If-Range")
+                if match and (if_range is None or if_range == etag):
+                    start = int(match.group(1))
+                    end = min(int(match.group(2) or len(data) - 1), len(data) - 1)
+                    if start >= len(data):
+                        self._send(416, {**headers, "Content-Range": f"bytes */{len(data)}"}, b"")
+                        return
+                    server._count("ranged")
+                    headers["Content-Range"] = f"bytes {start}-{end}/{len(data)}"
+                    self._send(206, headers, data[start:end + 1], server.drop_after)
+                    return
+                self._send(200, headers, data, server.drop_after)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Serve files as a stand-in CKAN API.")
+    parser.add_argument("directory", type=Path, help="Directory of resource files")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8766)
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed delay per response (s)")
+    parser.add_argument("--drop-after", type=int, help="Cut every file response off after N bytes")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    server = CkanStandIn.from_directory(
+        args.directory, latency=args.latency, drop_after=args.drop_after, host=args.host, port=args.port
+    )
+    logger.info(f"Serving {len(server.files)} resource(s) at {server.url}")
+    logger.info(f"  export PIPELINE_HTTP_REPLAY={server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        logger.info(f"Stats: {server.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,166 @@
+"""
+Shared HTTP transport for all source clients (World Bank, MOSPI, CKAN).
+
+One requests.Session per process, mounted with an HTTPAdapter whose urllib3
+pool manager keeps a keep-alive connection pool per host. Every client goes
+through get(), so a full build pays one TCP+TLS handshake per host per
+concurrent connection instead of one per request.
+
+Retry policy is shared too: timeouts and connection errors are retried with
+linear backoff; HTTP error statuses are returned as-is so each client can
+decide what a 404 or 500 means for its source.
+
+Every request can also be recorded to, or replayed from, cassette files
+(PIPELINE_HTTP_RECORD / PIPELINE_HTTP_REPLAY — see src/common/cassette.py).
+
+Pool sizes can be tuned with environment variables (read when the session is
+first created) or by calling configure():
+  PIPELINE_HTTP_POOL_HOSTS    — number of per-host pools kept alive (default 10)
+  PIPELINE_HTTP_POOL_MAXSIZE  — connections per host pool (default 16)
+"""
+
+import atexit
+import logging
+import os
+import threading
+import time
+from typing import Any
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from src.common import cassette
+
+logger = logging.getLogger(__name__)
+
+POOL_HOSTS = int(os.environ.get("PIPELINE_HTTP_POOL_HOSTS", 10))
+POOL_MAXSIZE = int(os.environ.get("PIPELINE_HTTP_POOL_MAXSIZE", 16))
+CONNECT_TIMEOUT = 10
+DEFAULT_TIMEOUT = 30
+MAX_RETRIES = 3
+RETRY_DELAY_BASE = 2  # seconds; actual delay = base * attempt
+
+_lock = threading.Lock()
+_session: requests.Session | None = None
+_session_pid: int | None = None
+_adapter: HTTPAdapter | None = None
+_atexit_registered = False
+
+
+def configure(pool_hosts: int | None = None, pool_maxsize: int | None = None) -> None:
+    """Change pool sizes. Takes effect on the next request (the session is rebuilt)."""
+    global POOL_HOSTS, POOL_MAXSIZE
+    with _lock:
+        if pool_hosts is not None:
+            POOL_HOSTS = pool_hosts
+        if pool_maxsize is not None:
+            POOL_MAXSIZE = pool_maxsize
+        _reset()
+
+
+def _reset() -> None:
+    global _session, _session_pid, _adapter
+    if _session is not None:
+        _session.close()
+    _session = _session_pid = _adapter = None
+
+
+def get_session() -> requests.Session:
+    """The process-wide pooled session, created lazily (and again after a fork)."""
+    global _session, _session_pid, _adapter, _atexit_registered
+    with _lock:
+        # A session inherited across fork would share sockets with the parent
+        if _session is None or _session_pid != os.getpid():
+            if not _atexit_registered:
+                atexit.register(log_stats)
+                _atexit_registered = True
+            _session = requests.Session()
+            _adapter = HTTPAdapter(pool_connections=POOL_HOSTS, pool_maxsize=POOL_MAXSIZE)
+            _session.mount("https://", _adapter)
+            _session.mount("http://", _adapter)
+            _session_pid = os.getpid()
+        return _session
+
+
+def get(
+    url: str,
+    params: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
+    timeout: float = DEFAULT_TIMEOUT,
+    retries: int = MAX_RETRIES,
+    stream: bool = False,
+) -> requests.Response:
+    """
+    GET through the shared session.
+
+    Retries timeouts and connection errors up to `retries` attempts in total,
+    then re-raises the last one. Does not raise for HTTP error statuses.
+
+    Args:
+        url: Request URL.
+        params: Query parameters.
+        headers: Extra request headers (e.g. conditional validators).
+        timeout: Read timeout in seconds (connect timeout is CONNECT_TIMEOUT).
+        retries: Total attempts for transient network errors.
+        stream: Stream the body instead of reading it eagerly.
+    """
+    session = get_session()
+    base = cassette.replay_base()
+    if base:
+        url = cassette.replay_url(url, base)
+    for attempt in range(1, retries + 1):
+        try:
+            resp = session.get(
+                url,
+                params=params,
+                headers=headers,
+                timeout=(CONNECT_TIMEOUT, timeout),
+                stream=stream,
+            )
+            directory = cassette.record_dir()
+            if directory and not stream and not base:
+                cassette.record(resp, directory)
+            return resp
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError):
+            if attempt == retries:
+                raise
+            logger.info(f"  Retry {attempt}/{retries} for {url}...")
+            time.sleep(RETRY_DELAY_BASE * attempt)
+    raise ValueError("retries must be at least 1")
+
+
+def stats() -> dict[str, dict[str, int]]:
+    """
+    Per-host connection reuse counters for this process.
+
+    Returns {host: {"requests": n, "connections": c, "reused": n - c}}, where
+    `connections` counts new TCP(+TLS) connections opened by the pool.
+    """
+    with _lock:
+        if _adapter is None or _session_pid != os.getpid():
+            return {}
+        pools = _adapter.poolmanager.pools
+        result: dict[str, dict[str, int]] = {}
+        for key in pools.keys():
+            pool = pools[key]
+            host = result.setdefault(pool.host, {"requests": 0, "connections": 0})
+            host["requests"] += pool.num_requests
+            host["connections"] += pool.num_connections
+        for host in result.values():
+            host["reused"] = host["requests"] - host["connections"]
+        return result
+
+
+def log_stats(since: dict[str, dict[str, int]] | None = None) -> None:
+    """Log connection reuse per host, optionally as the delta from an earlier stats() snapshot."""
+    since = since or {}
+    for host, counts in sorted(stats().items()):
+        before = since.get(host, {})
+        requests_made = counts["requests"] - before.get("requests", 0)
+        opened = counts["connections"] - before.get("connections", 0)
+        if not requests_made:
+            continue
+        logger.info(
+            f"  HTTP {host}: {requests_made} requests over {opened} connection(s) "
+            f"({requests_made - opened} reused)"
+        )
@@ -0,0 +1,109 @@
+"""
+Cross-domain World Bank indicator registry.
+
+Several domains declare the same World Bank codes (SP.POP.TOTL is in both
+Economy and Census; literacy codes overlap between Census and Education;
+inflation between Economy and RBI). The registry merges every domain's
+INDICATORS dict into one entry per code, spanning the widest requested year
+range. fetch_indicator() resolves registered codes through a single unrounded
+cache entry at that widest range and hands each domain a view sliced to its
+years and rounded to its precision — so each code is downloaded once per
+build, no matter how many domains use it.
+
+prefetch() downloads the whole union up front as one bulk job of batched
+multi-indicator requests; the build orchestrator schedules it ahead of the
+domain FETCH nodes.
+"""
+
+import importlib
+import logging
+from collections import defaultdict
+from dataclasses import dataclass, field
+from functools import lru_cache
+
+logger = logging.getLogger(__name__)
+
+# Domain → World Bank wrapper module (each defines INDICATORS, START_YEAR, END_YEAR,
+# PRECISION and optionally FETCH_KEYS when it only uses a subset of INDICATORS)
+SOURCES = {
+    "economy": "src.economy.sources.world_bank",
+    "rbi": "src.rbi.sources.world_bank",
+    "census": "src.census.sources.world_bank",
+    "education": "src.education.sources.world_bank",
+    "employment": "src.employment.sources.world_bank",
+    "healthcare": "src.healthcare.sources.world_bank",
+    "environment": "src.environment.sources.world_bank",
+}
+
+
+@dataclass
+class SharedIndicator:
+    code: str
+    start_year: int
+    end_year: int
+    users: list[str] = field(default_factory=list)  # "domain.key" entries
+
+    def covers(self, start_year: int, end_year: int) -> bool:
+        return self.start_year <= start_year and end_year <= self.end_year
+
+
+def build_registry(domains: list[str] | None = None) -> dict[str, SharedIndicator]:
+    """Merge the INDICATORS of the given domains (default: all) into one entry per code."""
+    registry: dict[str, SharedIndicator] = {}
+    for domain in domains or list(SOURCES):
+        if domain not in SOURCES:
+            continue
+        module = importlib.import_module(SOURCES[domain])
+        keys = getattr(module, "FETCH_KEYS", None) or list(module.INDICATORS)
+        for key in keys:
+            code = module.INDICATORS[key]
+            shared = registry.get(code)
+            if shared is None:
+                shared = registry[code] = SharedIndicator(code, module.START_YEAR, module.END_YEAR)
+            shared.start_year = min(shared.start_year, module.START_YEAR)
+            shared.end_year = max(shared.end_year, module.END_YEAR)
+            shared.users.append(f"{domain}.{key}")
+    return registry
+
+
+@lru_cache(maxsize=1)
+def _all_domains() -> dict[str, SharedIndicator]:
+    return build_registry()
+
+
+def lookup(code: str) -> SharedIndicator | None:
+    """The registry entry for a World Bank code, or None if no domain declares it."""
+    return _all_domains().get(code)
+
+
+def prefetch(domains: list[str] | None = None, max_in_flight: int | None = None) -> dict[str, int]:
+    """
+    Download the union of the given domains' indicators in batched requests.
+
+    Populates the shared cache entries that domain FETCH stages then slice.
+    Returns {code: number of data points}.
+    """
+    from src.common import world_bank
+
+    # Ranges come from the full registry so the cache entries match what
+    # fetch_indicator() resolves to, whichever domains are being built
+    entries = [lookup(code) for code in sorted(build_registry(domains))]
+    shared = sum(len(entry.users) > 1 for entry in entries)
+    logger.info(f"World Bank prefetch: {len(entries)} unique codes ({shared} shared across domains)")
+
+    by_range: dict[tuple[int, int], dict[str, str]] = defaultdict(dict)
+    for entry in entries:
+        by_range[(entry.start_year, entry.end_year)][entry.code] = entry.code
+
+    counts: dict[str, int] = {}
+    for (start_year, end_year), codes in by_range.items():
+        data = world_bank.fetch_multiple(
+            codes,
+            start_year=start_year,
+            end_year=end_year,
+            max_in_flight=max_in_flight,
+        )
+        counts.update({code: len(points) for code, points in data.items()})
+
+    logger.info(f"World Bank prefetch: {sum(counts.values())} data points")
+    return counts
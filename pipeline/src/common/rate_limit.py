@@ -0,0 +1,37 @@
+"""
+Thread-safe token-bucket rate limiter for polite API clients.
+
+A bucket holds up to `burst` tokens and refills at `rate` tokens per second.
+Each request takes one token, waiting only as long as it must for the next
+one, so a pool of workers sharing a bucket runs at the allowed rate instead
+of sleeping a fixed interval after every call.
+"""
+
+import threading
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, burst: int = 1):
+        if rate <= 0 or burst < 1:
+            raise ValueError("rate must be positive and burst at least 1")
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take one token, blocking until one is available. Returns seconds waited."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return waited
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+            waited += delay
@@ -0,0 +1,171 @@
+"""
+Local stand-in for the World Bank and MOSPI APIs, replaying recorded cassettes.
+
+Requests arrive as /<original host><original path>?<query> (the form
+http_client produces under PIPELINE_HTTP_REPLAY) and are answered from the
+cassette for that host. Unrecorded requests get a 404. Optional fault
+injection makes benchmarks closer to the real thing:
+
+  latency     — fixed delay before every response (seconds)
+  jitter      — extra uniform random delay, 0..jitter seconds
+  error_rate  — fraction of requests answered with a 503
+
+Conditional requests are honoured: a matching If-None-Match gets a 304.
+
+Usage:
+  python -m src.common.standin_server cassettes/ --port 8765 --latency 0.2 --error-rate 0.05
+  PIPELINE_HTTP_REPLAY=http://127.0.0.1:8765 python src/build.py --refresh
+"""
+
+import argparse
+import logging
+import random
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Any
+from urllib.parse import urlsplit
+
+# Set up path so we can import our modules
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+
+from src.common import cassette
+
+logger = logging.getLogger(__name__)
+
+
+class StandInServer:
+    """Threaded HTTP server replaying cassettes. Usable as a context manager."""
+
+    def __init__(
+        self,
+        cassettes: dict[str, dict[str, dict[str, Any]]],
+        latency: float = 0.0,
+        jitter: float = 0.0,
+        error_rate: float = 0.0,
+        seed: int | None = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ):
+        self.cassettes = cassettes
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0, "errors": 0}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer((host, port), self._handler())
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @classmethod
+    def from_directory(cls, directory: Path, **kwargs: Any) -> "StandInServer":
+        return cls(cassette.load(directory), **kwargs)
+
+    @property
+    def url(self) -> str:
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._httpd.serve_forever, daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __enter__(self) -> "StandInServer":
+        self.start()
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _respond(self, path: str, headers: dict[str, str]) -> tuple[int, dict[str, str], str]:
+        """Pick the reply for one request: (status, headers, body)."""
+        parts = urlsplit(path)
+        host, _, rest = parts.path.lstrip("/").partition("/")
+        with self._lock:
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+            failed = self.error_rate > 0 and self._random.random() < self.error_rate
+        if delay:
+            time.sleep(delay)
+
+        interaction = self.cassettes.get(host, {}).get(cassette.request_key(f"/{rest}", parts.query))
+        with self._lock:
+            if failed:
+                self.stats["errors"] += 1
+                return 503, {}, '{"error": "injected failure"}'
+            if interaction is None:
+                self.stats["misses"] += 1
+                return 404, {}, '{"error": "not recorded"}'
+            etag = interaction["headers"].get("ETag")
+            if etag and headers.get("If-None-Match") == etag:
+                self.stats["not_modified"] += 1
+                return 304, {"ETag": etag}, ""
+            self.stats["hits"] += 1
+            return interaction["status"], interaction["headers"], interaction["body"]
+
+    def _handler(self) -> type[BaseHTTPRequestHandler]:
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"  # keep-alive, like the real APIs
+
+            def do_GET(self):
+                status, headers, body = server._respond(self.path, dict(self.headers))
+                data = body.encode()
+                self.send_response(status)
+                headers = {"Content-Type": "application/json", **headers}
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="Replay recorded API cassettes over HTTP.")
+    parser.add_argument("cassettes", type=Path, help="Directory of recorded cassettes")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.0, help="Fixed delay per response (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="Extra random delay, 0..N (s)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Fraction of 503 responses")
+    parser.add_argument("--seed", type=int, help="Seed for jitter and error injection")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(levelname)s] %(name)s: %(message)s")
+    server = StandInServer.from_directory(
+        args.cassettes,
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        seed=args.seed,
+        host=args.host,
+        port=args.port,
+    )
+    total = sum(len(i) for i in server.cassettes.values())
+    logger.info(f"Replaying {total} interactions for {', '.join(server.cassettes) or 'no hosts'}")
+    logger.info(f"  export {cassette.REPLAY_ENV}={server.url}")
+    try:
+        server._httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server._httpd.server_close()
+        logger.info(f"Stats: {server.stats}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
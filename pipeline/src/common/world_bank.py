@@ -7,20 +7,36 @@ keeps its own INDICATORS dict mapping friendly keys to WB indicator codes.
 
 No authentication required. Returns JSON directly.
 API docs: https://datahelpdesk.worldbank.org/knowledgebase/articles/898599
+
+fetch_multiple() batches its indicators: codes from the same source database
+are joined with semicolons into one paginated request (the API accepts up to
+60 per call), and the combined response is split back into per-code cache
+entries. A full build's ~90 indicators come down in a handful of requests.
 """
 
 import logging
-import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 import requests
 
+from src.common import http_client, indicator_registry
+from src.common.cache import CACHE_ROOT, DEFAULT_TTL, DiskCache, cache_mode, refresh_after
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.worldbank.org/v2/country/ind/indicator"
 TIMEOUT = 60
 MAX_RETRIES = 3
-RETRY_DELAY_BASE = 2  # seconds; actual delay = base * attempt (exponential backoff)
+MAX_IN_FLIGHT = 8  # concurrent indicator requests per fetch_multiple call
+
+WDI_SOURCE = 2  # World Development Indicators, home of every code we use
+SOURCE_OVERRIDES: dict[str, int] = {}  # code → WB source id, for codes outside WDI
+BATCH_SIZE = 50  # codes per multi-indicator request (API maximum is 60)
+BATCH_PER_PAGE = 1000
+
+CACHE = DiskCache(CACHE_ROOT / "world_bank")
 
 
 def fetch_indicator(
@@ -28,6 +44,7 @@ def fetch_indicator(
     start_year: int = 2000,
     end_year: int = 2025,
     precision: int = 2,
+    ttl: float = DEFAULT_TTL,
 ) -> list[dict[str, Any]]:
     """
     Fetch a single indicator from the World Bank API.
@@ -35,47 +52,130 @@ def fetch_indicator(
     Returns list of {year: str, value: float} dicts, sorted by year ascending.
     Null values are filtered out. Returns empty list on any error after retrying.
 
+    Responses are cached on disk (see src/common/cache.py). A fresh entry is
+    served without any network call; a stale one is revalidated with
+    If-None-Match / If-Modified-Since and served as-is if the API is down.
+
+    Codes declared by any domain are resolved through the indicator registry:
+    one unrounded entry at the widest registered year range is shared by
+    every caller, and each gets its own slice rounded to `precision`.
+
     Args:
         code: World Bank indicator code (e.g., "NY.GDP.MKTP.KD.ZG").
         start_year: First year to fetch.
         end_year: Last year to fetch.
         precision: Decimal places for rounding values (default 2).
+        ttl: Seconds before the cached entry needs revalidation.
     """
+    stored = _storage_request(code, start_year, end_year, precision)
+    points = _fetch_cached(*stored, ttl)
+    if stored[3] is not None:
+        return points
+    return [
+        {"year": p["year"], "value": round(p["value"], precision)}
+        for p in points
+        if start_year <= int(p["year"][:4]) <= end_year
+    ]
+
+
+def _storage_request(
+    code: str, start_year: int, end_year: int, precision: int
+) -> tuple[str, int, int, int | None]:
+    """The (code, start, end, precision) cache entry a request is served from."""
+    shared = indicator_registry.lookup(code)
+    if shared is not None and shared.covers(start_year, end_year):
+        return code, shared.start_year, shared.end_year, None
+    return code, start_year, end_year, precision
+
+
+def _fetch_cached(
+    code: str,
+    start_year: int,
+    end_year: int,
+    precision: int | None,
+    ttl: float,
+) -> list[dict[str, Any]]:
+    """Cache-backed fetch of one indicator. precision=None keeps values unrounded."""
+    key = CACHE.key(code, start_year, end_year, precision)
+    mode = cache_mode()
+    entry = CACHE.get(key)
+    if mode == "refresh" and entry is not None and entry.fetched_at < refresh_after():
+        entry = None
+
+    if entry is not None and (mode == "offline" or entry.is_fresh()):
+        logger.info(f"Using cached {code} ({len(entry.data)} data points)")
+        return entry.data
+    if mode == "offline":
+        logger.warning(f"No cached data for {code} (offline mode) — returning empty")
+        return []
+
     url = f"{BASE_URL}/{code}"
     params = {
         "date": f"{start_year}:{end_year}",
         "format": "json",
         "per_page": 100,
     }
+    headers = entry.validators() if entry else {}
 
     logger.info(f"Fetching {code} from World Bank API...")
-    for attempt in range(1, MAX_RETRIES + 1):
-        try:
-            resp = requests.get(url, params=params, timeout=TIMEOUT)
-            resp.raise_for_status()
-            break
-        except requests.exceptions.HTTPError as e:
-            # HTTP 4xx/5xx — don't retry (indicator may not exist for India)
-            logger.warning(f"HTTP error for {code}: {e} — returning empty")
-            return []
-        except (
-            requests.exceptions.Timeout,
-            requests.exceptions.ConnectionError,
-        ) as e:
-            if attempt == MAX_RETRIES:
-                logger.warning(
-                    f"Failed to fetch {code} after {MAX_RETRIES} attempts: {e}"
-                )
-                return []
-            logger.info(f"  Retry {attempt}/{MAX_RETRIES} for {code}...")
-            time.sleep(RETRY_DELAY_BASE * attempt)
-
-    data = resp.json()
+    # With a stale copy in hand, one attempt is enough — don't back off on a flaky day
+    resp = _get(code, url, params, headers, retries=1 if entry else MAX_RETRIES)
 
+    if resp is None:
+        if entry is not None:
+            logger.warning(f"  Serving stale cached {code}")
+            return entry.data
+        return []
+
+    if resp.status_code == 304 and entry is not None:
+        logger.info(f"  {code} not modified — refreshed cache entry")
+        CACHE.put(key, entry.data, ttl, entry.etag, entry.last_modified)
+        return entry.data
+
+    result = _parse_records(code, resp.json(), precision)
+    if result is None:
+        return entry.data if entry is not None else []
+
+    CACHE.put(
+        key,
+        result,
+        ttl,
+        etag=resp.headers.get("ETag"),
+        last_modified=resp.headers.get("Last-Modified"),
+    )
+    return result
+
+
+def _get(
+    code: str,
+    url: str,
+    params: dict[str, Any],
+    headers: dict[str, str],
+    retries: int = MAX_RETRIES,
+) -> requests.Response | None:
+    """GET through the shared pooled session. Returns None on failure."""
+    try:
+        resp = http_client.get(url, params=params, headers=headers, timeout=TIMEOUT, retries=retries)
+        resp.raise_for_status()
+        return resp
+    except requests.exceptions.HTTPError as e:
+        # HTTP 4xx/5xx — don't retry (indicator may not exist for India)
+        logger.warning(f"HTTP error for {code}: {e} — returning empty")
+        return None
+    except (
+        requests.exceptions.Timeout,
+        requests.exceptions.ConnectionError,
+    ) as e:
+        logger.warning(f"Failed to fetch {code} after {retries} attempt(s): {e}")
+        return None
+
+
+def _parse_records(code: str, data: Any, precision: int | None) -> list[dict[str, Any]] | None:
+    """Turn a World Bank [metadata, records] payload into sorted {year, value} points."""
     # World Bank returns [metadata, data_array]
     if not isinstance(data, list) or len(data) < 2:
         logger.warning(f"Unexpected response format for {code}")
-        return []
+        return None
 
     records = data[1]
     if records is None:
@@ -87,7 +187,7 @@ def fetch_indicator(
         if item["value"] is not None:
             result.append({
                 "year": item["date"],
-                "value": round(item["value"], precision),
+                "value": item["value"] if precision is None else round(item["value"], precision),
             })
 
     result.sort(key=lambda x: x["year"])
@@ -103,29 +203,219 @@ def fetch_indicator(
     return result
 
 
+def _fetch_batched(
+    wanted: list[tuple[str, int, int, int | None]],
+    max_in_flight: int,
+    ttl: float = DEFAULT_TTL,
+) -> None:
+    """
+    Populate the cache for many indicators with multi-indicator requests.
+
+    Only entries that are missing (or stale, or pre-date a refresh) are
+    requested. Codes sharing a source database and year range go out
+    BATCH_SIZE at a time as one semicolon-joined query; each response is
+    split by indicator id and stored under the same keys fetch_indicator
+    uses. A batch that fails is left alone, and so is any code missing from
+    a batch's response (a truncated page would otherwise cache it as empty
+    for a full TTL); both fall back to fetch_indicator's single-code request
+    (with its own retries).
+
+    Each batch's per-page ETag / Last-Modified validators are kept under a
+    key of their own. When every code in a batch has a stale entry, the
+    pages are first requested conditionally; if all come back 304, the
+    entries are re-stamped without downloading anything.
+    """
+    mode = cache_mode()
+    if mode == "offline":
+        return
+
+    groups: dict[tuple[int, int, int, int | None], list[str]] = defaultdict(list)
+    stale: set[tuple[str, int, int, int | None]] = set()
+    for code, start_year, end_year, precision in dict.fromkeys(wanted):
+        entry = CACHE.get(CACHE.key(code, start_year, end_year, precision))
+        if mode == "refresh" and entry is not None and entry.fetched_at < refresh_after():
+            entry = None
+        if entry is not None and entry.is_fresh():
+            continue
+        if entry is not None:
+            stale.add((code, start_year, end_year, precision))
+        source = SOURCE_OVERRIDES.get(code, WDI_SOURCE)
+        groups[(source, start_year, end_year, precision)].append(code)
+
+    batches = [
+        (codes[i:i + BATCH_SIZE], *group)
+        for group, codes in groups.items()
+        for i in range(0, len(codes), BATCH_SIZE)
+    ]
+    if not batches:
+        return
+
+    logger.info(
+        f"Fetching {sum(len(b[0]) for b in batches)} indicators from World Bank API "
+        f"in {len(batches)} batched request(s)..."
+    )
+
+    def run(batch: tuple) -> tuple:
+        codes, source, start_year, end_year, precision = batch
+        validators = None
+        if all((code, start_year, end_year, precision) in stale for code in codes):
+            entry = CACHE.get(_batch_key(*batch))
+            validators = entry.data if entry is not None else None
+        return (*batch, _get_batch(*batch, validators=validators))
+
+    with ThreadPoolExecutor(max_workers=max(1, min(max_in_flight, len(batches)))) as pool:
+        for codes, source, start_year, end_year, precision, fetched in pool.map(run, batches):
+            if fetched is None:
+                continue
+            records, validators = fetched
+            if records is None:
+                logger.info(f"  batch of {len(codes)} ({codes[0]}…) not modified — refreshed cache entries")
+                for code in codes:
+                    key = CACHE.key(code, start_year, end_year, precision)
+                    entry = CACHE.get(key)
+                    if entry is not None:
+                        CACHE.put(key, entry.data, ttl, entry.etag, entry.last_modified)
+            else:
+                for code in codes:
+                    if code in records:
+                        result = _parse_records(code, [{}, records[code]], precision)
+                        CACHE.put(CACHE.key(code, start_year, end_year, precision), result, ttl)
+                missing = [code for code in codes if code not in records]
+                if missing:
+                    logger.info(f"  {len(missing)} code(s) absent from batch ({missing[0]}…) — fetching singly")
+                    continue  # no batch validators: the batch's entries now come from two sources
+            if validators:
+                CACHE.put(_batch_key(codes, source, start_year, end_year, precision), validators, ttl)
+
+
+def _batch_key(codes: list[str], source: int, start_year: int, end_year: int, precision: int | None) -> str:
+    """Cache key for a batch's per-page validators."""
+    return CACHE.key("batch", source, start_year, end_year, precision, *codes)
+
+
+def _page_validators(resp: requests.Response) -> dict[str, str]:
+    headers = {}
+    if resp.headers.get("ETag"):
+        headers["If-None-Match"] = resp.headers["ETag"]
+    if resp.headers.get("Last-Modified"):
+        headers["If-Modified-Since"] = resp.headers["Last-Modified"]
+    return headers
+
+
+def _get_batch(
+    codes: list[str],
+    source: int,
+    start_year: int,
+    end_year: int,
+    precision: int | None,
+    validators: list[dict[str, str]] | None = None,
+) -> tuple[dict[str, list[dict[str, Any]]] | None, list[dict[str, str]] | None] | None:
+    """
+    One multi-indicator query, following every page.
+
+    Returns (raw records grouped by indicator id, per-page validators), or
+    None if any page fails. With `validators` from an earlier download,
+    every page is first requested conditionally: (None, validators) means
+    none of them changed, otherwise the whole batch is downloaded again.
+    The validators are None unless every page carried one.
+    """
+    label = f"batch of {len(codes)} ({codes[0]}…)"
+    url = f"{BASE_URL}/{';'.join(codes)}"
+    params = {
+        "source": source,
+        "date": f"{start_year}:{end_year}",
+        "format": "json",
+        "per_page": BATCH_PER_PAGE,
+        "page": 1,
+    }
+    if validators:
+        for page, headers in enumerate(validators, start=1):
+            resp = _get(label, url, {**params, "page": page}, headers, retries=1)
+            if resp is None:
+                return None
+            if resp.status_code != 304:
+                logger.info(f"  {label} changed — downloading again")
+                break
+        else:
+            return None, validators
+
+    records: dict[str, list[dict[str, Any]]] = defaultdict(list)
+    page_validators: list[dict[str, str]] = []
+    pages = 1
+    while params["page"] <= pages:
+        resp = _get(label, url, params, {})
+        if resp is None:
+            return None
+        page_validators.append(_page_validators(resp))
+        data = resp.json()
+        # Errors come back as a single-element [{"message": [...]}] list
+        if not isinstance(data, list) or len(data) < 2:
+            logger.warning(f"Unexpected response format for {label}: {data!r:.200}")
+            return None
+        pages = int(data[0].get("pages") or 1)
+        for item in data[1] or []:
+            records[item["indicator"]["id"]].append(item)
+        params = {**params, "page": params["page"] + 1}
+
+    if pages > 1:
+        logger.info(f"  {label}: followed {pages} pages")
+    return records, page_validators if all(page_validators) else None
+
+
 def fetch_multiple(
     indicators: dict[str, str],
     keys: list[str] | None = None,
     start_year: int = 2000,
     end_year: int = 2025,
     precision: int = 2,
+    max_in_flight: int | None = None,
+    batched: bool = True,
 ) -> dict[str, list[dict[str, Any]]]:
     """
     Fetch multiple indicators. Returns dict mapping friendly key to data points.
 
+    With `batched` (the default), indicators not already cached are first
+    downloaded with a few multi-indicator requests (see _fetch_batched).
+    Anything still missing is then requested per code, concurrently on a
+    thread pool with at most `max_in_flight` requests outstanding. Results
+    keep the order of `keys`, and each entry follows fetch_indicator's error
+    semantics (empty list on failure).
+
     Args:
         indicators: Dict mapping friendly key → WB indicator code.
         keys: Which keys to fetch. If None, fetches all.
         start_year: First year to fetch.
         end_year: Last year to fetch.
         precision: Decimal places for rounding values.
+        max_in_flight: Maximum concurrent requests (1 = sequential;
+            default MAX_IN_FLIGHT).
+        batched: Use multi-indicator requests for uncached codes.
     """
     fetch_keys = keys or list(indicators.keys())
-    results = {}
+    codes: dict[str, str] = {}
     for key in fetch_keys:
         code = indicators.get(key)
         if not code:
             logger.warning(f"Unknown indicator key: {key}")
             continue
-        results[key] = fetch_indicator(code, start_year, end_year, precision)
-    return results
+        codes[key] = code
+
+    max_in_flight = max_in_flight or MAX_IN_FLIGHT
+    if batched:
+        _fetch_batched(
+            [_storage_request(code, start_year, end_year, precision) for code in codes.values()],
+            max_in_flight,
+        )
+
+    if max_in_flight <= 1 or len(codes) <= 1:
+        return {
+            key: fetch_indicator(code, start_year, end_year, precision)
+            for key, code in codes.items()
+        }
+
+    with ThreadPoolExecutor(max_workers=min(max_in_flight, len(codes))) as pool:
+        futures = {
+            key: pool.submit(fetch_indicator, code, start_year, end_year, precision)
+            for key, code in codes.items()
+        }
+        return {key: future.result() for key, future in futures.items()}
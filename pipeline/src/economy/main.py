@@ -16,10 +16,10 @@ from pathlib import Path
 # Set up path so we can import our modules
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from src.economy.sources.mospi import fetch_cpi_by_category
-from src.economy.sources.world_bank import fetch_multiple
+from src.economy.sources.mospi import cpi_by_category, fetch_cpi_monthly
+from src.economy.sources.world_bank import FETCH_KEYS, PRECISION, fetch_multiple
 from src.economy.transform.gdp import build_gdp_growth
-from src.economy.transform.inflation import build_inflation
+from src.economy.transform.inflation import build_inflation, build_monthly_inflation
 from src.economy.transform.fiscal import build_fiscal
 from src.economy.transform.external import build_external
 from src.economy.transform.sectors import build_sectors
@@ -31,10 +31,12 @@ from src.economy.validate.schemas import (
     GDPGrowthData,
     IndicatorsData,
     InflationData,
+    MonthlyInflationData,
     SectorsData,
     TimeSeriesPoint,
 )
 from src.publish.writer import publish_all
+from src.validate.engine import validate_outputs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -46,52 +48,64 @@ SURVEY_YEAR = "2025-26"
 SOURCE_URL = "https://www.indiabudget.gov.in/economicsurvey/"
 POPULATION = 1_460_000_000  # 2025 estimate (UN WPP 2024 revision: ~146 crore)
 
-
-def run_economy_pipeline():
-    logger.info("=" * 60)
-    logger.info(f"Economic Survey Pipeline — {SURVEY_YEAR}")
-    logger.info("=" * 60)
-
-    # ── Stage 1: FETCH ──────────────────────────────────────────
+OUTPUT_DIR = f"economy/{SURVEY_YEAR}"
+FLOAT_DECIMALS = PRECISION
+
+# Output filename → Pydantic model, in validation order
+SCHEMAS = {
+    "summary.json": EconomySummary,
+    "gdp-growth.json": GDPGrowthData,
+    "inflation.json": InflationData,
+    "inflation-monthly.json": MonthlyInflationData,
+    "fiscal.json": FiscalData,
+    "external.json": ExternalData,
+    "sectors.json": SectorsData,
+    "indicators.json": IndicatorsData,
+}
+# Outputs left out when their source is unavailable, keeping the last published file
+OPTIONAL_OUTPUTS = frozenset({"inflation-monthly.json"})
+
+
+def fetch() -> dict:
+    """Stage 1: World Bank indicators + MOSPI group-wise CPI."""
     logger.info("Stage 1: FETCH from World Bank API")
-    wb_data = fetch_multiple(
-        [
-            "gdp_growth",
-            "inflation_cpi",
-            "exports_pct_gdp",
-            "imports_pct_gdp",
-            "agri_va_pct_gdp",
-            "industry_va_pct_gdp",
-            "services_va_pct_gdp",
-            "current_account_pct_gdp",
-            "population",
-            "gdp_current_usd",
-        ],
-        start_year=2000,
-        end_year=2025,
-    )
+    wb_data = fetch_multiple(FETCH_KEYS, start_year=2000, end_year=2025)
 
     for key, data in wb_data.items():
         logger.info(f"  {key}: {len(data)} data points")
 
-    # ── Stage 2: TRANSFORM ──────────────────────────────────────
+    # MOSPI group-wise monthly CPI for the cost-of-living calculator
+    logger.info("  Fetching MOSPI eSankhyiki CPI by category...")
+    mospi_monthly = fetch_cpi_monthly(start_fy="2019-20")
+    if mospi_monthly is not None:
+        logger.info(f"  MOSPI: {mospi_monthly['index'].shape[1]} COICOP divisions fetched from API")
+    else:
+        logger.info("  MOSPI: API unavailable, using curated fallback")
+
+    return {"wb_data": wb_data, "mospi_monthly": mospi_monthly}
+
+
+def transform(raw: dict) -> dict[str, dict]:
+    """Stage 2: build every output file, keyed by filename."""
     logger.info("Stage 2: TRANSFORM")
+    wb_data = raw["wb_data"]
 
     # 2a. GDP Growth
     gdp_growth_data = build_gdp_growth(wb_data.get("gdp_growth", []), SURVEY_YEAR)
     logger.info(f"  gdp-growth.json: {len(gdp_growth_data['series'])} data points")
 
     # 2b. Inflation (+ MOSPI group-wise CPI for cost-of-living calculator)
-    logger.info("  Fetching MOSPI eSankhyiki CPI by category...")
-    mospi_cpi = fetch_cpi_by_category(start_fy="2019-20")
-    if mospi_cpi:
-        logger.info(f"  MOSPI: {len(mospi_cpi)} COICOP divisions fetched from API")
-    else:
-        logger.info("  MOSPI: API unavailable, using curated fallback")
+    mospi_monthly = raw["mospi_monthly"]
+    mospi_cpi = cpi_by_category(mospi_monthly) if mospi_monthly is not None else None
     inflation_data = build_inflation(
         wb_data.get("inflation_cpi", []), SURVEY_YEAR, mospi_cpi
     )
     logger.info(f"  inflation.json: {len(inflation_data['series'])} data points")
+    monthly_inflation_data = build_monthly_inflation(mospi_monthly, SURVEY_YEAR)
+    if monthly_inflation_data is None:
+        logger.warning("  inflation-monthly.json: no MOSPI data — keeping the published file")
+    else:
+        logger.info(f"  inflation-monthly.json: {len(monthly_inflation_data['divisions'])} divisions")
 
     # 2c. Fiscal (curated from Survey/Budget documents)
     fiscal_data = build_fiscal(SURVEY_YEAR)
@@ -151,48 +165,51 @@ def run_economy_pipeline():
     }
     logger.info(f"  indicators.json: {len(indicators)} indicators")
 
-    # ── Stage 3: VALIDATE ──────────────────────────────────────
+    outputs = {
+        "summary.json": summary_data,
+        "gdp-growth.json": gdp_growth_data,
+        "inflation.json": inflation_data,
+        "inflation-monthly.json": monthly_inflation_data,
+        "fiscal.json": fiscal_data,
+        "external.json": external_data,
+        "sectors.json": sectors_data,
+        "indicators.json": indicators_data,
+    }
+    return {name: data for name, data in outputs.items() if data is not None}
+
+
+def validate(outputs: dict[str, dict]) -> list[str]:
+    """Stage 3: check each output against its Pydantic model. Returns error strings."""
     logger.info("Stage 3: VALIDATE")
-    errors = []
-
-    validations = [
-        ("summary.json", EconomySummary, summary_data),
-        ("gdp-growth.json", GDPGrowthData, gdp_growth_data),
-        ("inflation.json", InflationData, inflation_data),
-        ("fiscal.json", FiscalData, fiscal_data),
-        ("external.json", ExternalData, external_data),
-        ("sectors.json", SectorsData, sectors_data),
-        ("indicators.json", IndicatorsData, indicators_data),
-    ]
+    schemas = {name: model for name, model in SCHEMAS.items() if name in outputs or name not in OPTIONAL_OUTPUTS}
+    return validate_outputs(outputs, schemas, decimals=FLOAT_DECIMALS).errors
+
+
+def publish(outputs: dict[str, dict]) -> list[Path]:
+    """Stage 4: write outputs under public/data/economy/."""
+    logger.info("Stage 4: PUBLISH")
+    paths = publish_all(
+        {f"{OUTPUT_DIR}/{name}": data for name, data in outputs.items()}, decimals=FLOAT_DECIMALS
+    )
+    logger.info(f"Published {len(paths)} files")
+    return paths
 
-    for name, model, data in validations:
-        try:
-            model(**data)
-            logger.info(f"  {name} ✓")
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            logger.error(f"  {name} FAILED: {e}")
 
+def run_economy_pipeline():
+    logger.info("=" * 60)
+    logger.info(f"Economic Survey Pipeline — {SURVEY_YEAR}")
+    logger.info("=" * 60)
+
+    outputs = transform(fetch())
+
+    errors = validate(outputs)
     if errors:
         logger.error(f"Validation failed with {len(errors)} error(s):")
         for err in errors:
             logger.error(f"  - {err}")
         sys.exit(1)
 
-    # ── Stage 4: PUBLISH ──────────────────────────────────────
-    logger.info("Stage 4: PUBLISH")
-    outputs = {
-        f"economy/{SURVEY_YEAR}/summary.json": summary_data,
-        f"economy/{SURVEY_YEAR}/gdp-growth.json": gdp_growth_data,
-        f"economy/{SURVEY_YEAR}/inflation.json": inflation_data,
-        f"economy/{SURVEY_YEAR}/fiscal.json": fiscal_data,
-        f"economy/{SURVEY_YEAR}/external.json": external_data,
-        f"economy/{SURVEY_YEAR}/sectors.json": sectors_data,
-        f"economy/{SURVEY_YEAR}/indicators.json": indicators_data,
-    }
-
-    paths = publish_all(outputs)
-    logger.info(f"Published {len(paths)} files")
+    publish(outputs)
 
     logger.info("=" * 60)
     logger.info("Economy pipeline complete!")
@@ -9,24 +9,56 @@ Key: NO authentication required. The API returns up to 10 records per page.
 Paginating 3 pages per month-year gives us all group-level data for Combined
 sector, All India.
 
-We fetch monthly data and compute fiscal year annual averages for each COICOP
-group, producing the cpiByCategory array used by the cost-of-living calculator.
+We fetch monthly data into a month × (measure, division) matrix and derive
+everything from it in vectorized pandas passes: fiscal year annual averages
+for each COICOP group (the cpiByCategory array used by the cost-of-living
+calculator), plus 3- and 12-month rolling means and month-on-month momentum
+for the monthly inflation output.
+
+Each month's group-level result is kept in a persistent store (the shared
+on-disk cache, keyed by year, month, base year and sector). Months of a
+completed fiscal year are immutable and never refetched. Months of the
+current FY are revalidated once their entry is PROVISIONAL_TTL old, because
+MOSPI revises the provisional figure when the next month is released. Empty
+results, such as a month that has not been released yet, are never stored.
+A routine run therefore fetches only the newest month or two.
+
+Months that do need fetching go to a small worker pool. Every page request first takes a
+token from one shared token bucket, so the pool as a whole never exceeds
+REQUESTS_PER_SECOND however many workers are running.
 
 Source: https://api.mospi.gov.in (eSankhyiki CPI API)
 """
 
 import logging
-import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 from typing import Any
 
+import numpy as np
+import pandas as pd
 import requests
 
+from src.common import http_client
+from src.common.cache import CACHE_ROOT, DiskCache, cache_mode, refresh_after
+from src.common.rate_limit import TokenBucket
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://api.mospi.gov.in/api/cpi/getCPIIndex"
 TIMEOUT = 30
 PAGES_PER_QUERY = 3  # 10 records/page × 3 = 30 records, enough for all groups
+BASE_YEAR = "2012"
+SECTOR_CODE = "3"  # Combined
+MIN_FY_MONTHS = 6  # Need at least 6 months for a reliable FY average
+REQUESTS_PER_SECOND = 3.0  # shared by all workers; the old fixed sleeps averaged ~1.5
+BURST = 3
+MAX_WORKERS = 4
+
+_LIMITER = TokenBucket(REQUESTS_PER_SECOND, BURST)
+
+MONTH_CACHE = DiskCache(CACHE_ROOT / "mospi")
+PROVISIONAL_TTL = 30 * 24 * 3600  # current-FY months; closed FYs never expire
 
 # Mapping from MOSPI API group/subgroup names to our COICOP division codes.
 # The Base 2012 CPI uses 6 groups, with divisions under "Miscellaneous".
@@ -42,16 +74,17 @@ TARGET_GROUPS: dict[tuple[str, str], tuple[str, str]] = {
 def _fetch_page(year: int, month: int, page: int = 1) -> list[dict]:
     """Fetch one page of CPI data for a given month, Combined sector, All India."""
     params = {
-        "base_year": "2012",
+        "base_year": BASE_YEAR,
         "series": "Current",
         "year": str(year),
         "month_code": str(month),
-        "sector_code": "3",  # Combined
+        "sector_code": SECTOR_CODE,
         "page": str(page),
         "Format": "JSON",
     }
+    _LIMITER.acquire()
     try:
-        resp = requests.get(BASE_URL, params=params, timeout=TIMEOUT)
+        resp = http_client.get(BASE_URL, params=params, timeout=TIMEOUT)
         resp.raise_for_status()
         data = resp.json()
         return data.get("data", [])
@@ -77,23 +110,41 @@ def _fetch_month(year: int, month: int) -> dict[tuple[str, str], dict[str, Any]]
                         "index": float(idx),
                         "inflation": float(inf) if inf and inf != "None" else None,
                     }
-        time.sleep(0.3)
     return results
 
 
-def _compute_fy_averages(
-    monthly_data: dict[str, dict[tuple[str, str], dict[str, Any]]],
-) -> dict[tuple[str, str], float]:
-    """Compute fiscal year average inflation from monthly YoY inflation rates."""
-    averages: dict[tuple[str, str], float] = {}
-    for key in TARGET_GROUPS:
-        values = []
-        for _month_key, data in monthly_data.items():
-            if key in data and data[key].get("inflation") is not None:
-                values.append(data[key]["inflation"])
-        if len(values) >= 6:  # Need at least 6 months for a reliable average
-            averages[key] = round(sum(values) / len(values), 1)
-    return averages
+def _load_month(
+    year: int, month: int, closed: bool
+) -> tuple[dict[tuple[str, str], dict[str, Any]], bool]:
+    """
+    _fetch_month through the persistent month store. `closed`: the month's FY
+    is complete. Returns (results, whether the API was called).
+    """
+    key = MONTH_CACHE.key(year, month, BASE_YEAR, SECTOR_CODE)
+    mode = cache_mode()
+    entry = MONTH_CACHE.get(key)
+    if mode == "refresh" and entry is not None and entry.fetched_at < refresh_after():
+        entry = None
+    # Closed months are stored with an infinite TTL, so they are always fresh. A
+    # provisional entry whose FY has since closed gets one last revalidation.
+    if entry is not None and (mode == "offline" or entry.is_fresh()):
+        return _decode_month(entry.data), False
+    if mode == "offline":
+        return {}, False
+
+    results = _fetch_month(year, month)
+    if results:
+        rows = [[g, s, v["index"], v["inflation"]] for (g, s), v in results.items()]
+        MONTH_CACHE.put(key, rows, float("inf") if closed else PROVISIONAL_TTL)
+    elif entry is not None:
+        # API down or month withdrawn — keep serving what we had
+        return _decode_month(entry.data), True
+    return results, True
+
+
+def _decode_month(rows: list[list]) -> dict[tuple[str, str], dict[str, Any]]:
+    """Stored [group, subgroup, index, inflation] rows → _fetch_month's shape."""
+    return {(g, s): {"index": i, "inflation": f} for g, s, i, f in rows}
 
 
 def _fiscal_year_months(fy: str) -> list[tuple[int, int]]:
@@ -104,13 +155,14 @@ def _fiscal_year_months(fy: str) -> list[tuple[int, int]]:
     return months
 
 
-def fetch_cpi_by_category(start_fy: str = "2019-20") -> list[dict] | None:
+def fetch_cpi_monthly(start_fy: str = "2019-20") -> pd.DataFrame | None:
     """
-    Fetch group-wise CPI inflation from the eSankhyiki API and compute
-    fiscal year annual averages.
+    Fetch group-wise monthly CPI from the eSankhyiki API as one matrix.
 
-    Returns list of COICOP division entries with annual inflation series,
-    or None if the API is unreachable.
+    Returns a DataFrame indexed by month (PeriodIndex, every month from the
+    start of `start_fy` to last month, gaps as NaN) with (measure, division)
+    columns: measure is "index" or "inflation", division the COICOP code.
+    Returns None if the API is unreachable and nothing is stored.
 
     Args:
         start_fy: First fiscal year to fetch (default: 2019-20, where our
@@ -127,52 +179,124 @@ def fetch_cpi_by_category(start_fy: str = "2019-20") -> list[dict] | None:
 
     logger.info(f"MOSPI eSankhyiki: fetching CPI by group for FY {fiscal_years[0]} to {fiscal_years[-1]}")
 
-    # Collect all fiscal year averages
-    all_fy_averages: dict[str, dict[tuple[str, str], float]] = {}
-    api_reachable = False
-
+    # Months to fetch per FY. For the current (incomplete) FY, only months that have passed.
+    fy_months: dict[str, list[tuple[int, int]]] = {}
     for fy in fiscal_years:
         months = _fiscal_year_months(fy)
-
-        # For the current (incomplete) FY, only fetch months that have passed
         if fy == fiscal_years[-1]:
             months = [(y, m) for y, m in months if (y, m) <= (now.year, now.month - 1)]
+        fy_months[fy] = months
+
+    current_fy = fiscal_years[-1]
+    all_months = [(y, m, fy != current_fy) for fy, months in fy_months.items() for y, m in months]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        loaded = list(pool.map(lambda m: _load_month(*m), all_months))
+    n_fetched = sum(called for _, called in loaded)
+    logger.info(f"  {len(all_months) - n_fetched} months from store, {n_fetched} fetched "
+                f"({MAX_WORKERS} workers, ≤{REQUESTS_PER_SECOND:g} requests/s)")
+
+    # Monthly Period ordinals count months since 1970-01
+    rows = [
+        (_month_ordinal(year, month), TARGET_GROUPS[key][0], v["index"], v["inflation"])
+        for (year, month, _), (data, _) in zip(all_months, loaded)
+        for key, v in data.items()
+    ]
+    if not rows:
+        logger.warning("MOSPI eSankhyiki API unreachable — will use curated fallback")
+        return None
 
-        logger.info(f"  FY {fy}: fetching {len(months)} months...")
-        monthly_data: dict[str, dict[tuple[str, str], dict[str, Any]]] = {}
+    frame = pd.DataFrame(rows, columns=["ordinal", "division", "index", "inflation"])
+    matrix = frame.pivot(index="ordinal", columns="division", values=["index", "inflation"])
+    ordinals = np.arange(_month_ordinal(*all_months[0][:2]), _month_ordinal(*all_months[-1][:2]) + 1)
+    matrix = matrix.reindex(ordinals).astype(float)
+    matrix.index = pd.PeriodIndex.from_ordinals(ordinals, freq="M")
+    matrix.index.name = "month"
+    matrix.columns.names = ["measure", "division"]
+    logger.info(f"  CPI matrix: {matrix.shape[0]} months × {matrix['index'].shape[1]} divisions")
+    return matrix
 
-        for year, month in months:
-            month_key = f"{year}-{month:02d}"
-            data = _fetch_month(year, month)
-            if data:
-                api_reachable = True
-            monthly_data[month_key] = data
-            time.sleep(1)  # Conservative rate limiting
 
-        fy_avg = _compute_fy_averages(monthly_data)
-        if fy_avg:
-            all_fy_averages[fy] = fy_avg
-            logger.info(f"  FY {fy}: {len(fy_avg)} divisions averaged")
+def _month_ordinal(year: int, month: int) -> int:
+    return (year - 1970) * 12 + month - 1
 
-    if not api_reachable:
-        logger.warning("MOSPI eSankhyiki API unreachable — will use curated fallback")
-        return None
 
-    # Build the cpiByCategory list
+def _fy_labels(months: pd.PeriodIndex) -> pd.Index:
+    """Fiscal year label ('2023-24') for each month; FY runs April to March."""
+    start = months.year - (months.month < 4)
+    return pd.Index(start.astype(str) + "-" + (start + 1).astype(str).str[-2:], name="fy")
+
+
+def fy_averages(matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    Fiscal year mean of monthly YoY inflation per division (FY × division).
+
+    A cell is NaN unless the FY has at least MIN_FY_MONTHS months of data.
+    """
+    inflation = matrix["inflation"]
+    grouped = inflation.groupby(_fy_labels(inflation.index))
+    return grouped.mean().where(grouped.count() >= MIN_FY_MONTHS).round(1)
+
+
+def monthly_aggregates(matrix: pd.DataFrame) -> pd.DataFrame:
+    """
+    Rolling and momentum series alongside the raw matrix, in one vectorized pass.
+
+    Adds measures per division:
+      rolling3 / rolling12 — trailing 3- and 12-month mean of YoY inflation
+                             (NaN until the window is full or across gaps)
+      momentum             — month-on-month % change in the index
+    """
+    inflation = matrix["inflation"]
+    index = matrix["index"]
+    return pd.concat(
+        {
+            "index": index,
+            "inflation": inflation,
+            "rolling3": inflation.rolling(3, min_periods=3).mean().round(2),
+            "rolling12": inflation.rolling(12, min_periods=12).mean().round(2),
+            "momentum": (index.pct_change(fill_method=None) * 100).round(2),
+        },
+        axis=1,
+        names=["measure"],
+    )
+
+
+def cpi_by_category(matrix: pd.DataFrame) -> list[dict] | None:
+    """COICOP division entries with fiscal year average inflation series."""
+    averages = fy_averages(matrix)
     source = "MOSPI eSankhyiki API (api.mospi.gov.in/api/cpi/getCPIIndex, Base 2012=100)"
     divisions: list[dict] = []
-    for key, (code, name) in TARGET_GROUPS.items():
-        series = []
-        for fy in fiscal_years:
-            if fy in all_fy_averages and key in all_fy_averages[fy]:
-                series.append({"period": fy, "value": all_fy_averages[fy][key]})
-        if series:
-            divisions.append({
-                "division": code,
-                "name": name,
-                "source": source,
-                "series": series,
-            })
-
+    for code, name in TARGET_GROUPS.values():
+        if code not in averages:
+            continue
+        column = averages[code].dropna()
+        if column.empty:
+            continue
+        divisions.append({
+            "division": code,
+            "name": name,
+            "source": source,
+            "series": [{"period": fy, "value": float(v)} for fy, v in column.items()],
+        })
+
+    for fy, count in averages.notna().sum(axis=1).items():
+        if count:
+            logger.info(f"  FY {fy}: {count} divisions averaged")
     logger.info(f"MOSPI eSankhyiki: {len(divisions)} divisions with data")
     return divisions if divisions else None
+
+
+def fetch_cpi_by_category(start_fy: str = "2019-20") -> list[dict] | None:
+    """
+    Fetch group-wise CPI inflation from the eSankhyiki API and compute
+    fiscal year annual averages.
+
+    Returns list of COICOP division entries with annual inflation series,
+    or None if the API is unreachable.
+
+    Args:
+        start_fy: First fiscal year to fetch (default: 2019-20, where our
+                  IMF/DBnomics data ends).
+    """
+    matrix = fetch_cpi_monthly(start_fy)
+    return None if matrix is None else cpi_by_category(matrix)
@@ -13,6 +13,10 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
 
 from src.common.world_bank import fetch_indicator as _fetch_indicator, fetch_multiple as _fetch_multiple
 
+START_YEAR = 2000
+END_YEAR = 2025
+PRECISION = 4  # decimal places for rounded values
+
 # Key indicator codes for India
 INDICATORS = {
     "gdp_growth": "NY.GDP.MKTP.KD.ZG",       # GDP growth (annual %)
@@ -33,14 +37,28 @@ INDICATORS = {
     "gni_per_capita": "NY.GNP.PCAP.CD",        # GNI per capita, Atlas method (current US$)
 }
 
+# Subset the economy pipeline fetches on every run
+FETCH_KEYS = [
+    "gdp_growth",
+    "inflation_cpi",
+    "exports_pct_gdp",
+    "imports_pct_gdp",
+    "agri_va_pct_gdp",
+    "industry_va_pct_gdp",
+    "services_va_pct_gdp",
+    "current_account_pct_gdp",
+    "population",
+    "gdp_current_usd",
+]
+
 
-def fetch_indicator(code: str, start_year: int = 2000, end_year: int = 2025):
-    return _fetch_indicator(code, start_year, end_year, precision=4)
+def fetch_indicator(code: str, start_year: int = START_YEAR, end_year: int = END_YEAR):
+    return _fetch_indicator(code, start_year, end_year, precision=PRECISION)
 
 
 def fetch_multiple(
     indicator_keys: list[str],
-    start_year: int = 2000,
-    end_year: int = 2025,
+    start_year: int = START_YEAR,
+    end_year: int = END_YEAR,
 ):
-    return _fetch_multiple(INDICATORS, indicator_keys, start_year, end_year, precision=4)
+    return _fetch_multiple(INDICATORS, indicator_keys, start_year, end_year, precision=PRECISION)
@@ -12,11 +12,19 @@ CPI-by-category (COICOP division) data is sourced from:
   baseline before MOSPI monthly series begins.
 - Curated fallback (hardcoded) if MOSPI API is unreachable.
 
+inflation-monthly.json carries the MOSPI monthly matrix itself: per division,
+each month's index and YoY inflation plus 3-/12-month rolling means and
+month-on-month momentum. It is empty when MOSPI is unreachable.
+
 Source: Economic Survey 2025-26 Chapter 5
 """
 
 import logging
 
+import pandas as pd
+
+from src.economy.sources.mospi import BASE_YEAR, monthly_aggregates
+
 logger = logging.getLogger(__name__)
 
 
@@ -115,6 +123,46 @@ def build_inflation(
     }
 
 
+def build_monthly_inflation(matrix: pd.DataFrame | None, survey_year: str) -> dict | None:
+    """
+    Build inflation-monthly.json from the MOSPI month × (measure, division) matrix.
+
+    Returns None when there is nothing to publish (MOSPI unreachable, or no
+    division with data), so the last good file is kept instead of being
+    overwritten with an empty one.
+
+    Args:
+        matrix: Output of fetch_cpi_monthly(), or None if MOSPI was unreachable.
+        survey_year: Economic Survey year label.
+    """
+    divisions = []
+    if matrix is not None:
+        aggregates = monthly_aggregates(matrix)
+        for code, name in _DIVISION_NAMES.items():
+            if code not in aggregates.columns.get_level_values("division"):
+                continue
+            frame = aggregates.xs(code, axis=1, level="division")
+            frame = frame.dropna(subset=["index", "inflation"], how="all")
+            if frame.empty:
+                continue
+            frame = frame.astype(object).where(frame.notna(), None)
+            frame.index = frame.index.astype(str).rename("month")
+            divisions.append({
+                "division": code,
+                "name": name,
+                "series": frame.reset_index().to_dict("records"),
+            })
+    if not divisions:
+        return None
+
+    return {
+        "year": survey_year,
+        "baseYear": BASE_YEAR,
+        "divisions": divisions,
+        "source": "MOSPI eSankhyiki API (api.mospi.gov.in/api/cpi/getCPIIndex)",
+    }
+
+
 # ── IMF historical baseline (2014-15 to 2018-19) ──────────────────────
 # Source: IMF CPI dataset via DBnomics (db.nomics.world/IMF/CPI).
 # Calendar year → fiscal year approximation (9 of 12 months overlap).
@@ -67,6 +67,28 @@ class InflationData(BaseModel):
     source: str
 
 
+class MonthlyCPIPoint(BaseModel):
+    month: str  # 'YYYY-MM'
+    index: float | None = None
+    inflation: float | None = None  # YoY %
+    rolling3: float | None = None  # trailing 3-month mean of YoY %
+    rolling12: float | None = None  # trailing 12-month mean of YoY %
+    momentum: float | None = None  # month-on-month % change in the index
+
+
+class MonthlyCPIDivision(BaseModel):
+    division: str
+    name: str
+    series: list[MonthlyCPIPoint]
+
+
+class MonthlyInflationData(BaseModel):
+    year: str
+    baseYear: str
+    divisions: list[MonthlyCPIDivision] = []
+    source: str
+
+
 # ─── Fiscal ──────────────────────────────────────────────────────
 class FiscalYearData(BaseModel):
     year: str
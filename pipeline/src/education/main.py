@@ -20,7 +20,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from src.education.sources.world_bank import fetch_multiple
+from src.education.sources.world_bank import PRECISION, fetch_multiple
 from src.education.sources.curated import (
     UDISE_2023_24_STATES,
     ASER_2024_STATES,
@@ -38,6 +38,7 @@ from src.education.validate.schemas import (
     GlossaryData,
 )
 from src.publish.writer import publish_all
+from src.validate.engine import validate_outputs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -47,13 +48,22 @@ logger = logging.getLogger("education-pipeline")
 
 SURVEY_YEAR = "2025-26"
 
+OUTPUT_DIR = f"education/{SURVEY_YEAR}"
+FLOAT_DECIMALS = PRECISION
 
-def run_education_pipeline():
-    logger.info("=" * 60)
-    logger.info(f"Education Data Pipeline — {SURVEY_YEAR}")
-    logger.info("=" * 60)
+# Output filename → Pydantic model, in validation order
+SCHEMAS = {
+    "summary.json": EducationSummary,
+    "enrollment.json": EnrollmentData,
+    "quality.json": QualityData,
+    "spending.json": SpendingData,
+    "indicators.json": EducationIndicatorsData,
+    "glossary.json": GlossaryData,
+}
 
-    # ── Stage 1: FETCH ──────────────────────────────────────────────
+
+def fetch() -> dict:
+    """Stage 1: World Bank indicators + curated UDISE+/ASER tables."""
     logger.info("Stage 1: FETCH")
     logger.info("  Fetching 14 indicators from World Bank API...")
 
@@ -63,8 +73,13 @@ def run_education_pipeline():
     logger.info(f"  Curated: {len(UDISE_2023_24_STATES)} UDISE+ states")
     logger.info(f"  Curated: {len(ASER_2024_STATES)} ASER states")
 
-    # ── Stage 2: TRANSFORM ──────────────────────────────────────────
+    return {"wb_data": wb_data}
+
+
+def transform(raw: dict) -> dict[str, dict]:
+    """Stage 2: build every output file, keyed by filename."""
     logger.info("Stage 2: TRANSFORM")
+    wb_data = raw["wb_data"]
 
     enrollment_data = build_enrollment(wb_data, UDISE_2023_24_STATES, SURVEY_YEAR)
     quality_data = build_quality(wb_data, UDISE_2023_24_STATES, ASER_2024_STATES, SURVEY_YEAR)
@@ -73,46 +88,47 @@ def run_education_pipeline():
     indicators_data = _build_indicators(UDISE_2023_24_STATES, ASER_2024_STATES)
     glossary_data = _build_glossary()
 
-    # ── Stage 3: VALIDATE ───────────────────────────────────────────
+    return {
+        "summary.json": summary_data,
+        "enrollment.json": enrollment_data,
+        "quality.json": quality_data,
+        "spending.json": spending_data,
+        "indicators.json": indicators_data,
+        "glossary.json": glossary_data,
+    }
+
+
+def validate(outputs: dict[str, dict]) -> list[str]:
+    """Stage 3: check each output against its Pydantic model. Returns error strings."""
     logger.info("Stage 3: VALIDATE")
-    errors = []
-
-    validations = [
-        ("summary.json", EducationSummary, summary_data),
-        ("enrollment.json", EnrollmentData, enrollment_data),
-        ("quality.json", QualityData, quality_data),
-        ("spending.json", SpendingData, spending_data),
-        ("indicators.json", EducationIndicatorsData, indicators_data),
-        ("glossary.json", GlossaryData, glossary_data),
-    ]
-
-    for name, model, data in validations:
-        try:
-            model(**data)
-            logger.info(f"  {name} ✓")
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            logger.error(f"  {name} FAILED: {e}")
+    return validate_outputs(outputs, SCHEMAS, decimals=FLOAT_DECIMALS).errors
+
+
+def publish(outputs: dict[str, dict]) -> list[Path]:
+    """Stage 4: write outputs under public/data/education/."""
+    logger.info("Stage 4: PUBLISH")
+    paths = publish_all(
+        {f"{OUTPUT_DIR}/{name}": data for name, data in outputs.items()}, decimals=FLOAT_DECIMALS
+    )
+    logger.info(f"Published {len(paths)} files")
+    return paths
 
+
+def run_education_pipeline():
+    logger.info("=" * 60)
+    logger.info(f"Education Data Pipeline — {SURVEY_YEAR}")
+    logger.info("=" * 60)
+
+    outputs = transform(fetch())
+
+    errors = validate(outputs)
     if errors:
         logger.error(f"Validation failed with {len(errors)} error(s):")
         for err in errors:
             logger.error(f"  - {err}")
         sys.exit(1)
 
-    # ── Stage 4: PUBLISH ────────────────────────────────────────────
-    logger.info("Stage 4: PUBLISH")
-    outputs = {
-        f"education/{SURVEY_YEAR}/summary.json": summary_data,
-        f"education/{SURVEY_YEAR}/enrollment.json": enrollment_data,
-        f"education/{SURVEY_YEAR}/quality.json": quality_data,
-        f"education/{SURVEY_YEAR}/spending.json": spending_data,
-        f"education/{SURVEY_YEAR}/indicators.json": indicators_data,
-        f"education/{SURVEY_YEAR}/glossary.json": glossary_data,
-    }
-
-    paths = publish_all(outputs)
-    logger.info(f"Published {len(paths)} files")
+    publish(outputs)
 
     logger.info("=" * 60)
     logger.info("Education pipeline complete!")
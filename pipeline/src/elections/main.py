@@ -49,6 +49,7 @@ from src.elections.validate.schemas import (
     GlossaryData,
 )
 from src.publish.writer import publish_all
+from src.validate.engine import validate_outputs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -58,13 +59,23 @@ logger = logging.getLogger("elections-pipeline")
 
 SURVEY_YEAR = "2025-26"
 
+OUTPUT_DIR = f"elections/{SURVEY_YEAR}"
+FLOAT_DECIMALS = 2  # published float precision; curated values carry at most 2 places
 
-def run_elections_pipeline():
-    logger.info("=" * 60)
-    logger.info(f"Elections Data Pipeline — {SURVEY_YEAR}")
-    logger.info("=" * 60)
+# Output filename → Pydantic model, in validation order
+SCHEMAS = {
+    "summary.json": ElectionsSummary,
+    "turnout.json": TurnoutData,
+    "results.json": ResultsData,
+    "candidates.json": CandidatesData,
+    "representation.json": RepresentationData,
+    "indicators.json": ElectionsIndicatorsData,
+    "glossary.json": GlossaryData,
+}
 
-    # ── Stage 1: FETCH (all curated — no API calls) ─────────────────
+
+def fetch() -> dict:
+    """Stage 1: curated ECI/TCPD/ADR tables (no API calls)."""
     logger.info("Stage 1: FETCH (curated data — no API calls)")
     logger.info(f"  Turnout trend: {len(TURNOUT_TREND)} elections")
     logger.info(f"  Seat evolution: {len(SEAT_EVOLUTION)} elections × 8 party groups")
@@ -74,7 +85,11 @@ def run_elections_pipeline():
     logger.info(f"  ADR top wealthiest: {len(ADR_TOP_WEALTHIEST)} MPs")
     logger.info(f"  ADR top criminal: {len(ADR_TOP_CRIMINAL)} MPs")
 
-    # ── Stage 2: TRANSFORM ───────────────────────────────────────────
+    return {}
+
+
+def transform(raw: dict) -> dict[str, dict]:
+    """Stage 2: build every output file, keyed by filename."""
     logger.info("Stage 2: TRANSFORM")
 
     turnout_data = build_turnout(TURNOUT_TREND, ELECTION_EVENTS,
@@ -87,48 +102,48 @@ def run_elections_pipeline():
     indicators_data = _build_indicators()
     glossary_data = _build_glossary()
 
-    # ── Stage 3: VALIDATE ────────────────────────────────────────────
+    return {
+        "summary.json": summary_data,
+        "turnout.json": turnout_data,
+        "results.json": results_data,
+        "candidates.json": candidates_data,
+        "representation.json": representation_data,
+        "indicators.json": indicators_data,
+        "glossary.json": glossary_data,
+    }
+
+
+def validate(outputs: dict[str, dict]) -> list[str]:
+    """Stage 3: check each output against its Pydantic model. Returns error strings."""
     logger.info("Stage 3: VALIDATE")
-    errors = []
-
-    validations = [
-        ("summary.json", ElectionsSummary, summary_data),
-        ("turnout.json", TurnoutData, turnout_data),
-        ("results.json", ResultsData, results_data),
-        ("candidates.json", CandidatesData, candidates_data),
-        ("representation.json", RepresentationData, representation_data),
-        ("indicators.json", ElectionsIndicatorsData, indicators_data),
-        ("glossary.json", GlossaryData, glossary_data),
-    ]
-
-    for name, model, data in validations:
-        try:
-            model(**data)
-            logger.info(f"  {name} ✓")
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            logger.error(f"  {name} FAILED: {e}")
+    return validate_outputs(outputs, SCHEMAS, decimals=FLOAT_DECIMALS).errors
+
+
+def publish(outputs: dict[str, dict]) -> list[Path]:
+    """Stage 4: write outputs under public/data/elections/."""
+    logger.info("Stage 4: PUBLISH")
+    paths = publish_all(
+        {f"{OUTPUT_DIR}/{name}": data for name, data in outputs.items()}, decimals=FLOAT_DECIMALS
+    )
+    logger.info(f"Published {len(paths)} files")
+    return paths
 
+
+def run_elections_pipeline():
+    logger.info("=" * 60)
+    logger.info(f"Elections Data Pipeline — {SURVEY_YEAR}")
+    logger.info("=" * 60)
+
+    outputs = transform(fetch())
+
+    errors = validate(outputs)
     if errors:
         logger.error(f"Validation failed with {len(errors)} error(s):")
         for err in errors:
             logger.error(f"  - {err}")
         sys.exit(1)
 
-    # ── Stage 4: PUBLISH ─────────────────────────────────────────────
-    logger.info("Stage 4: PUBLISH")
-    outputs = {
-        f"elections/{SURVEY_YEAR}/summary.json": summary_data,
-        f"elections/{SURVEY_YEAR}/turnout.json": turnout_data,
-        f"elections/{SURVEY_YEAR}/results.json": results_data,
-        f"elections/{SURVEY_YEAR}/candidates.json": candidates_data,
-        f"elections/{SURVEY_YEAR}/representation.json": representation_data,
-        f"elections/{SURVEY_YEAR}/indicators.json": indicators_data,
-        f"elections/{SURVEY_YEAR}/glossary.json": glossary_data,
-    }
-
-    paths = publish_all(outputs)
-    logger.info(f"Published {len(paths)} files")
+    publish(outputs)
 
     logger.info("=" * 60)
     logger.info("Elections pipeline complete!")
@@ -21,7 +21,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from src.employment.sources.world_bank import fetch_multiple
+from src.employment.sources.world_bank import PRECISION, fetch_multiple
 from src.employment.sources.curated import (
     PLFS_STATE_DATA,
     SECTORAL_EMPLOYMENT,
@@ -39,6 +39,7 @@ from src.employment.validate.schemas import (
     GlossaryData,
 )
 from src.publish.writer import publish_all
+from src.validate.engine import validate_outputs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -48,13 +49,22 @@ logger = logging.getLogger("employment-pipeline")
 
 SURVEY_YEAR = "2025-26"
 
+OUTPUT_DIR = f"employment/{SURVEY_YEAR}"
+FLOAT_DECIMALS = PRECISION
 
-def run_employment_pipeline():
-    logger.info("=" * 60)
-    logger.info(f"Employment Data Pipeline — {SURVEY_YEAR}")
-    logger.info("=" * 60)
+# Output filename → Pydantic model, in validation order
+SCHEMAS = {
+    "summary.json": EmploymentSummary,
+    "unemployment.json": UnemploymentData,
+    "participation.json": ParticipationData,
+    "sectoral.json": SectoralData,
+    "indicators.json": EmploymentIndicatorsData,
+    "glossary.json": GlossaryData,
+}
 
-    # ── Stage 1: FETCH ──────────────────────────────────────────────
+
+def fetch() -> dict:
+    """Stage 1: World Bank indicators + curated PLFS/KLEMS tables."""
     logger.info("Stage 1: FETCH")
     logger.info("  Fetching 17 indicators from World Bank API...")
 
@@ -64,8 +74,13 @@ def run_employment_pipeline():
     logger.info(f"  Curated: {len(PLFS_STATE_DATA)} PLFS states")
     logger.info(f"  Curated: {len(SECTORAL_EMPLOYMENT)} KLEMS sectors")
 
-    # ── Stage 2: TRANSFORM ──────────────────────────────────────────
+    return {"wb_data": wb_data}
+
+
+def transform(raw: dict) -> dict[str, dict]:
+    """Stage 2: build every output file, keyed by filename."""
     logger.info("Stage 2: TRANSFORM")
+    wb_data = raw["wb_data"]
 
     unemployment_data = build_unemployment(wb_data, PLFS_STATE_DATA, SURVEY_YEAR)
     participation_data = build_participation(wb_data, PLFS_STATE_DATA, SURVEY_YEAR)
@@ -74,46 +89,47 @@ def run_employment_pipeline():
     indicators_data = _build_indicators(PLFS_STATE_DATA)
     glossary_data = _build_glossary()
 
-    # ── Stage 3: VALIDATE ───────────────────────────────────────────
+    return {
+        "summary.json": summary_data,
+        "unemployment.json": unemployment_data,
+        "participation.json": participation_data,
+        "sectoral.json": sectoral_data,
+        "indicators.json": indicators_data,
+        "glossary.json": glossary_data,
+    }
+
+
+def validate(outputs: dict[str, dict]) -> list[str]:
+    """Stage 3: check each output against its Pydantic model. Returns error strings."""
     logger.info("Stage 3: VALIDATE")
-    errors = []
-
-    validations = [
-        ("summary.json", EmploymentSummary, summary_data),
-        ("unemployment.json", UnemploymentData, unemployment_data),
-        ("participation.json", ParticipationData, participation_data),
-        ("sectoral.json", SectoralData, sectoral_data),
-        ("indicators.json", EmploymentIndicatorsData, indicators_data),
-        ("glossary.json", GlossaryData, glossary_data),
-    ]
-
-    for name, model, data in validations:
-        try:
-            model(**data)
-            logger.info(f"  {name} ✓")
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            logger.error(f"  {name} FAILED: {e}")
+    return validate_outputs(outputs, SCHEMAS, decimals=FLOAT_DECIMALS).errors
+
+
+def publish(outputs: dict[str, dict]) -> list[Path]:
+    """Stage 4: write outputs under public/data/employment/."""
+    logger.info("Stage 4: PUBLISH")
+    paths = publish_all(
+        {f"{OUTPUT_DIR}/{name}": data for name, data in outputs.items()}, decimals=FLOAT_DECIMALS
+    )
+    logger.info(f"Published {len(paths)} files")
+    return paths
 
+
+def run_employment_pipeline():
+    logger.info("=" * 60)
+    logger.info(f"Employment Data Pipeline — {SURVEY_YEAR}")
+    logger.info("=" * 60)
+
+    outputs = transform(fetch())
+
+    errors = validate(outputs)
     if errors:
         logger.error(f"Validation failed with {len(errors)} error(s):")
         for err in errors:
             logger.error(f"  - {err}")
         sys.exit(1)
 
-    # ── Stage 4: PUBLISH ────────────────────────────────────────────
-    logger.info("Stage 4: PUBLISH")
-    outputs = {
-        f"employment/{SURVEY_YEAR}/summary.json": summary_data,
-        f"employment/{SURVEY_YEAR}/unemployment.json": unemployment_data,
-        f"employment/{SURVEY_YEAR}/participation.json": participation_data,
-        f"employment/{SURVEY_YEAR}/sectoral.json": sectoral_data,
-        f"employment/{SURVEY_YEAR}/indicators.json": indicators_data,
-        f"employment/{SURVEY_YEAR}/glossary.json": glossary_data,
-    }
-
-    paths = publish_all(outputs)
-    logger.info(f"Published {len(paths)} files")
+    publish(outputs)
 
     logger.info("=" * 60)
     logger.info("Employment pipeline complete!")
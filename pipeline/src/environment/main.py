@@ -23,7 +23,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from src.environment.sources.world_bank import fetch_multiple
+from src.environment.sources.world_bank import PRECISION, fetch_multiple
 from src.environment.sources.curated import (
     CPCB_AQI_STATES,
     CPCB_AQI_CITIES,
@@ -47,6 +47,7 @@ from src.environment.validate.schemas import (
     GlossaryData,
 )
 from src.publish.writer import publish_all
+from src.validate.engine import validate_outputs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -56,13 +57,23 @@ logger = logging.getLogger("environment-pipeline")
 
 SURVEY_YEAR = "2025-26"
 
+OUTPUT_DIR = f"environment/{SURVEY_YEAR}"
+FLOAT_DECIMALS = PRECISION
 
-def run_environment_pipeline():
-    logger.info("=" * 60)
-    logger.info(f"Environment Data Pipeline — {SURVEY_YEAR}")
-    logger.info("=" * 60)
+# Output filename → Pydantic model, in validation order
+SCHEMAS = {
+    "summary.json": EnvironmentSummary,
+    "air-quality.json": AirQualityData,
+    "forest.json": ForestData,
+    "energy.json": EnergyData,
+    "water.json": WaterData,
+    "indicators.json": EnvironmentIndicatorsData,
+    "glossary.json": GlossaryData,
+}
 
-    # ── Stage 1: FETCH ──────────────────────────────────────────────
+
+def fetch() -> dict:
+    """Stage 1: World Bank indicators + curated CPCB/FSI/CEA/CWC/CGWB tables."""
     logger.info("Stage 1: FETCH")
     logger.info("  Fetching 11 indicators from World Bank API...")
 
@@ -76,8 +87,13 @@ def run_environment_pipeline():
     logger.info(f"  Curated: {len(CWC_RESERVOIR_STORAGE)} CWC reservoir regions")
     logger.info(f"  Curated: {len(CGWB_GROUNDWATER_STATES)} CGWB groundwater states")
 
-    # ── Stage 2: TRANSFORM ──────────────────────────────────────────
+    return {"wb_data": wb_data}
+
+
+def transform(raw: dict) -> dict[str, dict]:
+    """Stage 2: build every output file, keyed by filename."""
     logger.info("Stage 2: TRANSFORM")
+    wb_data = raw["wb_data"]
 
     air_quality_data = build_air_quality(wb_data, CPCB_AQI_STATES, CPCB_AQI_CITIES, SURVEY_YEAR)
     forest_data = build_forest(wb_data, FSI_FOREST_STATES, SURVEY_YEAR)
@@ -87,48 +103,48 @@ def run_environment_pipeline():
     indicators_data = _build_indicators()
     glossary_data = _build_glossary()
 
-    # ── Stage 3: VALIDATE ───────────────────────────────────────────
+    return {
+        "summary.json": summary_data,
+        "air-quality.json": air_quality_data,
+        "forest.json": forest_data,
+        "energy.json": energy_data,
+        "water.json": water_data,
+        "indicators.json": indicators_data,
+        "glossary.json": glossary_data,
+    }
+
+
+def validate(outputs: dict[str, dict]) -> list[str]:
+    """Stage 3: check each output against its Pydantic model. Returns error strings."""
     logger.info("Stage 3: VALIDATE")
-    errors = []
-
-    validations = [
-        ("summary.json", EnvironmentSummary, summary_data),
-        ("air-quality.json", AirQualityData, air_quality_data),
-        ("forest.json", ForestData, forest_data),
-        ("energy.json", EnergyData, energy_data),
-        ("water.json", WaterData, water_data),
-        ("indicators.json", EnvironmentIndicatorsData, indicators_data),
-        ("glossary.json", GlossaryData, glossary_data),
-    ]
-
-    for name, model, data in validations:
-        try:
-            model(**data)
-            logger.info(f"  {name} ✓")
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            logger.error(f"  {name} FAILED: {e}")
+    return validate_outputs(outputs, SCHEMAS, decimals=FLOAT_DECIMALS).errors
+
+
+def publish(outputs: dict[str, dict]) -> list[Path]:
+    """Stage 4: write outputs under public/data/environment/."""
+    logger.info("Stage 4: PUBLISH")
+    paths = publish_all(
+        {f"{OUTPUT_DIR}/{name}": data for name, data in outputs.items()}, decimals=FLOAT_DECIMALS
+    )
+    logger.info(f"Published {len(paths)} files")
+    return paths
 
+
+def run_environment_pipeline():
+    logger.info("=" * 60)
+    logger.info(f"Environment Data Pipeline — {SURVEY_YEAR}")
+    logger.info("=" * 60)
+
+    outputs = transform(fetch())
+
+    errors = validate(outputs)
     if errors:
         logger.error(f"Validation failed with {len(errors)} error(s):")
         for err in errors:
             logger.error(f"  - {err}")
         sys.exit(1)
 
-    # ── Stage 4: PUBLISH ────────────────────────────────────────────
-    logger.info("Stage 4: PUBLISH")
-    outputs = {
-        f"environment/{SURVEY_YEAR}/summary.json": summary_data,
-        f"environment/{SURVEY_YEAR}/air-quality.json": air_quality_data,
-        f"environment/{SURVEY_YEAR}/forest.json": forest_data,
-        f"environment/{SURVEY_YEAR}/energy.json": energy_data,
-        f"environment/{SURVEY_YEAR}/water.json": water_data,
-        f"environment/{SURVEY_YEAR}/indicators.json": indicators_data,
-        f"environment/{SURVEY_YEAR}/glossary.json": glossary_data,
-    }
-
-    paths = publish_all(outputs)
-    logger.info(f"Published {len(paths)} files")
+    publish(outputs)
 
     logger.info("=" * 60)
     logger.info("Environment pipeline complete!")
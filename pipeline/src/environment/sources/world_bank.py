@@ -10,6 +10,10 @@ sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent.parent))
 
 from src.common.world_bank import fetch_indicator as _fetch_indicator, fetch_multiple as _fetch_multiple
 
+START_YEAR = 2000
+END_YEAR = 2025
+PRECISION = 2  # decimal places for rounded values
+
 INDICATORS = {
     "co2_per_capita": "EN.ATM.CO2E.PC",
     "co2_total": "EN.ATM.CO2E.KT",
@@ -25,14 +29,14 @@ INDICATORS = {
 }
 
 
-def fetch_indicator(code: str, start_year: int = 2000, end_year: int = 2025):
-    return _fetch_indicator(code, start_year, end_year, precision=2)
+def fetch_indicator(code: str, start_year: int = START_YEAR, end_year: int = END_YEAR):
+    return _fetch_indicator(code, start_year, end_year, precision=PRECISION)
 
 
 def fetch_multiple(
     indicator_keys: list[str] | None = None,
-    start_year: int = 2000,
-    end_year: int = 2025,
+    start_year: int = START_YEAR,
+    end_year: int = END_YEAR,
 ):
     keys = indicator_keys or list(INDICATORS.keys())
-    return _fetch_multiple(INDICATORS, keys, start_year, end_year, precision=2)
+    return _fetch_multiple(INDICATORS, keys, start_year, end_year, precision=PRECISION)
@@ -2,25 +2,139 @@
 Parse CSV/Excel budget data into pandas DataFrames.
 If no downloaded files are available, returns curated budget data
 based on the Union Budget 2025-26 documents.
+
+Other fiscal years are loaded from prepared inputs under
+pipeline/data-raw/budget/<year>/: summary.json plus expenditure, receipts,
+statewise and schemes tables (.csv or .xlsx) with the same columns as the
+curated DataFrames below. Files are read through src/extract/stream.py, so
+large downloads are streamed in chunks with their columns narrowed.
+Ministry rows in those inputs are mapped onto the canonical ids and names of
+published data through src/transform/normalize.py MinistryIndex, so a year
+whose documents say "D/o Agriculture, Cooperation & FW" lines up with the
+others.
 """
 
+import json
 import logging
+import re
 from pathlib import Path
 
 import pandas as pd
 
+from src.extract import stream
+from src.transform.normalize import MinistryIndex, normalize_ministry_names
+
 logger = logging.getLogger(__name__)
 
+CURATED_YEAR = "2025-26"
+INPUTS_DIR = Path(__file__).resolve().parent.parent.parent / "data-raw" / "budget"
+YEAR_PATTERN = re.compile(r"\d{4}-\d{2}")
+MINISTRY_INDEX = MinistryIndex()
+
+# Table name → column → dtype (see stream.narrow) for every per-year input
+YEAR_TABLES = {
+    "expenditure": {
+        "id": "str", "name": "category", "budget_estimate": "int64", "previous_year": "int64",
+        "schemes_json": "str",
+    },
+    "receipts": {"id": "str", "name": "str", "amount": "int64", "previous_year": "int64"},
+    "statewise": {"id": "str", "name": "str", "transfer": "int64", "population": "int64"},
+    "schemes": {
+        "id": "str", "name": "str", "ministry": "category", "ministryName": "category",
+        "allocation": "int64", "previous_year": "int64", "humanContext": "str",
+    },
+}
+
+
+def parse_budget_file(
+    file_path: str, fmt: str = "csv", dtypes: dict[str, str] | None = None
+) -> pd.DataFrame:
+    """
+    Parse a downloaded CSV or Excel file into a DataFrame, streaming it in
+    chunks. With `dtypes`, only those columns are kept (in that order) and
+    narrowed; use stream.iter_batches() to process batches as they arrive.
+    """
+    return stream.read(file_path, fmt, columns=list(dtypes) if dtypes else None, dtypes=dtypes)
+
+
+def input_years() -> list[str]:
+    """Fiscal years that have inputs: every prepared year directory plus the curated year."""
+    years = {CURATED_YEAR}
+    if INPUTS_DIR.is_dir():
+        years.update(p.name for p in INPUTS_DIR.iterdir() if p.is_dir() and YEAR_PATTERN.fullmatch(p.name))
+    return sorted(years)
+
+
+def _read_table(directory: Path, name: str) -> pd.DataFrame:
+    for fmt in ("csv", "xlsx"):
+        path = directory / f"{name}.{fmt}"
+        if path.exists():
+            df = parse_budget_file(str(path), fmt, dtypes=YEAR_TABLES[name])
+            break
+    else:
+        raise FileNotFoundError(f"Budget file not found: {directory / name}.csv")
+    missing = [c for c in YEAR_TABLES[name] if c not in df.columns]
+    if missing:
+        raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+    if df.empty:
+        raise ValueError(f"{path}: no rows")
+    return df
+
+
+def _canonical_ministries(expenditure: pd.DataFrame, schemes: pd.DataFrame) -> None:
+    """
+    Give prepared ministry rows the canonical ids and names, in place.
+
+    Names are normalized (abbreviations expanded) and resolved through
+    MinistryIndex. A row keeps its own id and name when the name does not
+    resolve, or when several rows resolve to one ministry (departments
+    listed separately). Schemes follow their ministry's new id, and a scheme
+    without a ministry id gets the one its ministryName resolves to.
+    """
+    names = normalize_ministry_names(expenditure["name"].astype(object))
+    matches = MINISTRY_INDEX.resolve_many(names)
+    canonical = matches["id"].notna() & ~matches["id"].duplicated(keep=False)
+    ids = expenditure["id"].astype(object)
+    new_ids = matches["id"].where(canonical, ids)
+    missing = names[new_ids.isna()].tolist()
+    if missing:
+        raise ValueError(f"expenditure: no id for unrecognized ministry name(s) {', '.join(missing)}")
+    logger.info(f"  Ministries: {int(canonical.sum())} of {len(names)} matched to canonical ids")
 
-def parse_budget_file(file_path: str, fmt: str = "csv") -> pd.DataFrame:
-    """Parse a downloaded CSV or Excel file into a DataFrame."""
-    path = Path(file_path)
-    if not path.exists():
-        raise FileNotFoundError(f"Budget file not found: {file_path}")
+    expenditure["id"] = new_ids
+    expenditure["name"] = matches["name"].where(canonical, names).astype("category")
+    renamed = {old: new for old, new in zip(ids, new_ids) if isinstance(old, str) and old != new}
+    ministry = schemes["ministry"].astype(object).replace(renamed)
+    blank = ministry.isna()
+    if blank.any():
+        ministry[blank] = MINISTRY_INDEX.resolve_many(schemes.loc[blank, "ministryName"].astype(object))["id"]
+    missing = schemes.loc[ministry.isna(), "name"].tolist()
+    if missing:
+        raise ValueError(f"schemes: no ministry id for {', '.join(missing)}")
+    schemes["ministry"] = ministry.astype("category")
 
-    if fmt in ("xlsx", "xls"):
-        return pd.read_excel(path)
-    return pd.read_csv(path)
+
+def load_year_inputs(year: str) -> dict:
+    """
+    Summary and tables for one fiscal year: prepared inputs when the year has
+    a directory under data-raw/budget/, else the curated data for 2025-26.
+    """
+    directory = INPUTS_DIR / year
+    if directory.is_dir():
+        logger.info(f"  Loading {year} inputs from {directory}")
+        summary = json.loads((directory / "summary.json").read_text())
+        tables = {name: _read_table(directory, name) for name in YEAR_TABLES}
+        _canonical_ministries(tables["expenditure"], tables["schemes"])
+        return {"summary": summary, **tables}
+    if year != CURATED_YEAR:
+        raise FileNotFoundError(f"No budget inputs for {year} (expected {directory})")
+    return {
+        "summary": get_curated_summary(),
+        "expenditure": get_curated_expenditure_data(),
+        "receipts": get_curated_receipts_data(),
+        "statewise": get_curated_statewise_data(),
+        "schemes": get_curated_schemes_data(),
+    }
 
 
 def get_curated_expenditure_data() -> pd.DataFrame:
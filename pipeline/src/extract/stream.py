@@ -0,0 +1,245 @@
+"""
+Streaming reader for large CSV and Excel budget files.
+
+CKAN resources (Demand for Grants, Expenditure Budget statements) can be
+multi-sheet workbooks with tens of thousands of rows. iter_batches() never
+loads a whole file: CSVs are read with pandas in fixed-size chunks and
+.xlsx workbooks through openpyxl's read-only mode, which streams rows from
+the sheet XML. At most `chunk_rows` rows are held at a time, so peak memory
+depends on the chunk size, not the file size, and the first batch is
+available as soon as its rows have been read.
+
+Each batch is normalized the same way:
+
+  - header names have their whitespace collapsed ("Budget  Estimate\\n" →
+    "Budget Estimate"), and only the requested columns are kept
+  - `dtypes` narrows columns: "int64" amounts (thousands separators removed,
+    rounded; the nullable Int64 dtype when a batch has gaps, so amounts
+    never turn into floats), "float64", "category" for repetitive labels
+    such as ministry names, "str" for stripped text
+
+In workbooks, the header is the first row within the first HEADER_SCAN rows
+that holds every requested column, so title rows above a table are skipped,
+and sheets without such a row (cover pages, notes) are skipped entirely; a
+workbook where no sheet has one is an error, like a CSV missing a column.
+Each batch's sheet name is in batch.attrs["sheet"]. Legacy .xls files have no
+streaming reader; each sheet is read whole with pandas, without a header, and
+its rows go through the same header scan and batching as an .xlsx sheet.
+"""
+
+import logging
+from collections.abc import Iterator
+from pathlib import Path
+
+import pandas as pd
+
+logger = logging.getLogger(__name__)
+
+CHUNK_ROWS = 50_000
+HEADER_SCAN = 20
+DTYPES = ("int64", "float64", "category", "str")
+
+
+def _clean(name) -> str:
+    return " ".join(str(name).split()) if name is not None else ""
+
+
+def _to_number(column: pd.Series) -> pd.Series:
+    if pd.api.types.is_numeric_dtype(column):
+        return column
+    try:
+        return pd.to_numeric(column)  # numbers and blanks, as openpyxl returns them
+    except (TypeError, ValueError):
+        pass
+    text = column.astype(str).str.replace(",", "", regex=False).str.strip()
+    return pd.to_numeric(text.mask(text.isin(("", "-", "None", "nan", "NaN"))))
+
+
+def _to_category(column: pd.Series) -> pd.Series:
+    column = column if isinstance(column.dtype, pd.CategoricalDtype) else column.astype("category")
+    # Strip the distinct labels rather than every row
+    stripped = column.cat.categories.str.strip()
+    if stripped.is_unique:
+        return column.cat.rename_categories(stripped)
+    return column.astype(object).where(column.isna(), column.astype(str).str.strip()).astype("category")
+
+
+def narrow(frame: pd.DataFrame, dtypes: dict[str, str]) -> pd.DataFrame:
+    """Convert the columns named in `dtypes` in place of the inferred ones."""
+    for column, dtype in dtypes.items():
+        if column not in frame.columns:
+            continue
+        if dtype == "int64":
+            values = _to_number(frame[column])
+            if values.dtype != "int64":
+                values = values.round().astype("int64" if values.notna().all() else "Int64")
+            frame[column] = values
+        elif dtype == "float64":
+            frame[column] = _to_number(frame[column]).astype("float64")
+        elif dtype == "category":
+            frame[column] = _to_category(frame[column])
+        elif dtype == "str":
+            frame[column] = frame[column].where(frame[column].isna(), frame[column].astype(str).str.strip())
+        else:
+            raise ValueError(f"unknown dtype {dtype!r} for {column} (choose from {', '.join(DTYPES)})")
+    return frame
+
+
+def _batch(rows: list, header: list[str], sheet: str | None, dtypes: dict[str, str]) -> pd.DataFrame:
+    frame = narrow(pd.DataFrame(rows, columns=header), dtypes)
+    frame.attrs["sheet"] = sheet
+    return frame
+
+
+def _iter_csv(path: Path, columns: list[str] | None, dtypes: dict[str, str], chunk_rows: int) -> Iterator[pd.DataFrame]:
+    # Map cleaned header names to the file's own so pandas parses only the
+    # requested columns, numbers with thousands separators included
+    raw_names = {_clean(name): name for name in pd.read_csv(path, nrows=0).columns}
+    if columns:
+        missing = [c for c in columns if c not in raw_names]
+        if missing:
+            raise ValueError(f"{path}: missing column(s) {', '.join(missing)}")
+    text = {
+        raw_names[c]: "category" if dtype == "category" else str
+        for c, dtype in dtypes.items() if dtype in ("category", "str") and c in raw_names
+    }
+    reader = pd.read_csv(
+        path,
+        usecols=[raw_names[c] for c in columns] if columns else None,
+        dtype=text,
+        thousands=",",
+        skipinitialspace=True,
+        chunksize=chunk_rows,
+    )
+    with reader:
+        for chunk in reader:
+            chunk.columns = [_clean(name) for name in chunk.columns]
+            if columns:
+                chunk = chunk[columns]
+            chunk = narrow(chunk, dtypes)
+            chunk.attrs["sheet"] = None
+            yield chunk
+
+
+def _find_header(rows: Iterator[tuple], columns: list[str] | None) -> list[str] | None:
+    for _, row in zip(range(HEADER_SCAN), rows):
+        names = [_clean(cell) for cell in row]
+        if columns is None and any(names):
+            return names
+        if columns is not None and set(columns) <= set(names):
+            return names
+    return None
+
+
+def _no_sheet(path: Path, columns: list[str] | None) -> ValueError:
+    wanted = f"column(s) {', '.join(columns)}" if columns else "a header row"
+    return ValueError(f"{path}: no sheet has {wanted}")
+
+
+def _iter_sheet(
+    path: Path,
+    name: str | None,
+    rows: Iterator[tuple],
+    columns: list[str] | None,
+    dtypes: dict[str, str],
+    chunk_rows: int,
+) -> Iterator[pd.DataFrame]:
+    """Batches of one sheet's rows below its header row; returns False when it has none."""
+    header = _find_header(rows, columns)
+    if header is None:
+        logger.info(f"  {path.name} [{name}]: no header row with the requested columns, skipped")
+        return False
+    keep = [header.index(c) for c in columns] if columns else [i for i, h in enumerate(header) if h]
+    selected = [header[i] for i in keep]
+    batch = []
+    for row in rows:
+        values = [row[i] if i < len(row) else None for i in keep]
+        if all(v is None for v in values):
+            continue
+        batch.append(values)
+        if len(batch) == chunk_rows:
+            yield _batch(batch, selected, name, dtypes)
+            batch = []
+    if batch:
+        yield _batch(batch, selected, name, dtypes)
+    return True
+
+
+def _iter_xlsx(
+    path: Path, columns: list[str] | None, dtypes: dict[str, str], chunk_rows: int, sheet: str | None
+) -> Iterator[pd.DataFrame]:
+    from openpyxl import load_workbook
+
+    workbook = load_workbook(path, read_only=True, data_only=True)
+    try:
+        names = [sheet] if sheet is not None else workbook.sheetnames
+        matched = False
+        for name in names:
+            rows = workbook[name].iter_rows(values_only=True)
+            matched |= yield from _iter_sheet(path, name, rows, columns, dtypes, chunk_rows)
+        if not matched:
+            raise _no_sheet(path, columns)
+    finally:
+        workbook.close()  # read-only workbooks keep the file open until closed
+
+
+def _iter_xls(
+    path: Path, columns: list[str] | None, dtypes: dict[str, str], chunk_rows: int, sheet: str | None
+) -> Iterator[pd.DataFrame]:
+    sheets = pd.read_excel(path, sheet_name=sheet if sheet is not None else None, header=None, dtype=object)
+    if isinstance(sheets, pd.DataFrame):
+        sheets = {sheet: sheets}
+    matched = False
+    for name, frame in sheets.items():
+        # Blank cells as None, the way openpyxl returns them
+        rows = iter(frame.astype(object).where(frame.notna(), None).itertuples(index=False, name=None))
+        matched |= yield from _iter_sheet(path, name, rows, columns, dtypes, chunk_rows)
+    if not matched:
+        raise _no_sheet(path, columns)
+
+
+def iter_batches(
+    file_path: str | Path,
+    fmt: str = "csv",
+    columns: list[str] | None = None,
+    dtypes: dict[str, str] | None = None,
+    chunk_rows: int = CHUNK_ROWS,
+    sheet: str | None = None,
+) -> Iterator[pd.DataFrame]:
+    """
+    Yield a CSV or Excel file as normalized DataFrames of at most `chunk_rows` rows.
+
+    Args:
+        fmt: "csv", "xlsx" or "xls".
+        columns: Columns to keep, in this order (default: all). Missing
+            columns are an error for CSVs; workbook sheets without them are
+            skipped, and it is an error if no sheet has them.
+        dtypes: Column → "int64" | "float64" | "category" | "str".
+        sheet: Workbook sheet to read (default: every sheet).
+    """
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Budget file not found: {file_path}")
+    dtypes = dtypes or {}
+    if fmt == "csv":
+        return _iter_csv(path, columns, dtypes, chunk_rows)
+    if fmt == "xlsx":
+        return _iter_xlsx(path, columns, dtypes, chunk_rows, sheet)
+    if fmt == "xls":
+        return _iter_xls(path, columns, dtypes, chunk_rows, sheet)
+    raise ValueError(f"Unsupported budget file format: {fmt}")
+
+
+def read(file_path: str | Path, fmt: str = "csv", **kwargs) -> pd.DataFrame:
+    """iter_batches() collected into one DataFrame; categorical columns stay categorical."""
+    batches = list(iter_batches(file_path, fmt, **kwargs))
+    if not batches:
+        columns = kwargs.get("columns")
+        return pd.DataFrame(columns=columns) if columns else pd.DataFrame()
+    frame = pd.concat(batches, ignore_index=True) if len(batches) > 1 else batches[0]
+    for column, dtype in (kwargs.get("dtypes") or {}).items():
+        # Batches with different categories concatenate to plain strings
+        if dtype == "category" and column in frame.columns and frame[column].dtype != "category":
+            frame[column] = frame[column].astype("category")
+    frame.attrs = {}
+    return frame
@@ -23,7 +23,7 @@ from pathlib import Path
 
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from src.healthcare.sources.world_bank import fetch_multiple
+from src.healthcare.sources.world_bank import PRECISION, fetch_multiple
 from src.healthcare.sources.curated import (
     NHP_2022_STATES,
     IMMUNIZATION_STATES,
@@ -41,6 +41,7 @@ from src.healthcare.validate.schemas import (
     GlossaryData,
 )
 from src.publish.writer import publish_all
+from src.validate.engine import validate_outputs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -50,13 +51,22 @@ logger = logging.getLogger("healthcare-pipeline")
 
 SURVEY_YEAR = "2025-26"
 
+OUTPUT_DIR = f"healthcare/{SURVEY_YEAR}"
+FLOAT_DECIMALS = PRECISION
 
-def run_healthcare_pipeline():
-    logger.info("=" * 60)
-    logger.info(f"Healthcare Data Pipeline — {SURVEY_YEAR}")
-    logger.info("=" * 60)
+# Output filename → Pydantic model, in validation order
+SCHEMAS = {
+    "summary.json": HealthcareSummary,
+    "infrastructure.json": InfrastructureData,
+    "spending.json": HealthSpendingData,
+    "disease.json": DiseaseData,
+    "indicators.json": HealthcareIndicatorsData,
+    "glossary.json": GlossaryData,
+}
 
-    # ── Stage 1: FETCH ──────────────────────────────────────────────
+
+def fetch() -> dict:
+    """Stage 1: World Bank indicators + curated NHP/immunization tables."""
     logger.info("Stage 1: FETCH")
     logger.info("  Fetching 12 indicators from World Bank API...")
 
@@ -66,8 +76,13 @@ def run_healthcare_pipeline():
     logger.info(f"  Curated: {len(NHP_2022_STATES)} NHP states")
     logger.info(f"  Curated: {len(IMMUNIZATION_STATES)} immunization states")
 
-    # ── Stage 2: TRANSFORM ──────────────────────────────────────────
+    return {"wb_data": wb_data}
+
+
+def transform(raw: dict) -> dict[str, dict]:
+    """Stage 2: build every output file, keyed by filename."""
     logger.info("Stage 2: TRANSFORM")
+    wb_data = raw["wb_data"]
 
     infrastructure_data = build_infrastructure(wb_data, NHP_2022_STATES, SURVEY_YEAR)
     spending_data = build_health_spending(wb_data, SURVEY_YEAR)
@@ -76,46 +91,47 @@ def run_healthcare_pipeline():
     indicators_data = _build_indicators(NHP_2022_STATES, IMMUNIZATION_STATES)
     glossary_data = _build_glossary()
 
-    # ── Stage 3: VALIDATE ───────────────────────────────────────────
+    return {
+        "summary.json": summary_data,
+        "infrastructure.json": infrastructure_data,
+        "spending.json": spending_data,
+        "disease.json": disease_data,
+        "indicators.json": indicators_data,
+        "glossary.json": glossary_data,
+    }
+
+
+def validate(outputs: dict[str, dict]) -> list[str]:
+    """Stage 3: check each output against its Pydantic model. Returns error strings."""
     logger.info("Stage 3: VALIDATE")
-    errors = []
-
-    validations = [
-        ("summary.json", HealthcareSummary, summary_data),
-        ("infrastructure.json", InfrastructureData, infrastructure_data),
-        ("spending.json", HealthSpendingData, spending_data),
-        ("disease.json", DiseaseData, disease_data),
-        ("indicators.json", HealthcareIndicatorsData, indicators_data),
-        ("glossary.json", GlossaryData, glossary_data),
-    ]
-
-    for name, model, data in validations:
-        try:
-            model(**data)
-            logger.info(f"  {name} ✓")
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            logger.error(f"  {name} FAILED: {e}")
+    return validate_outputs(outputs, SCHEMAS, decimals=FLOAT_DECIMALS).errors
+
+
+def publish(outputs: dict[str, dict]) -> list[Path]:
+    """Stage 4: write outputs under public/data/healthcare/."""
+    logger.info("Stage 4: PUBLISH")
+    paths = publish_all(
+        {f"{OUTPUT_DIR}/{name}": data for name, data in outputs.items()}, decimals=FLOAT_DECIMALS
+    )
+    logger.info(f"Published {len(paths)} files")
+    return paths
 
+
+def run_healthcare_pipeline():
+    logger.info("=" * 60)
+    logger.info(f"Healthcare Data Pipeline — {SURVEY_YEAR}")
+    logger.info("=" * 60)
+
+    outputs = transform(fetch())
+
+    errors = validate(outputs)
     if errors:
         logger.error(f"Validation failed with {len(errors)} error(s):")
         for err in errors:
             logger.error(f"  - {err}")
         sys.exit(1)
 
-    # ── Stage 4: PUBLISH ────────────────────────────────────────────
-    logger.info("Stage 4: PUBLISH")
-    outputs = {
-        f"healthcare/{SURVEY_YEAR}/summary.json": summary_data,
-        f"healthcare/{SURVEY_YEAR}/infrastructure.json": infrastructure_data,
-        f"healthcare/{SURVEY_YEAR}/spending.json": spending_data,
-        f"healthcare/{SURVEY_YEAR}/disease.json": disease_data,
-        f"healthcare/{SURVEY_YEAR}/indicators.json": indicators_data,
-        f"healthcare/{SURVEY_YEAR}/glossary.json": glossary_data,
-    }
-
-    paths = publish_all(outputs)
-    logger.info(f"Published {len(paths)} files")
+    publish(outputs)
 
     logger.info("=" * 60)
     logger.info("Healthcare pipeline complete!")
@@ -7,36 +7,45 @@ Stages:
   3. TRANSFORM — Normalize, derive metrics, build viz structures
   4. VALIDATE — Pydantic model checks
   5. PUBLISH — Write JSON to public/data/
+
+Every stage works on one fiscal year: fetch(year) defaults to the curated
+2025-26 budget, and archive years are read from prepared inputs (see
+src/extract/csv_parser.py load_year_inputs). The shared outputs — the tax
+calculator files and years.json — are written only by the current year.
+`python src/build.py --years 2016-17,...` (or `--years all`) runs one
+FETCH → PUBLISH chain per year on the build's process pool and then writes
+a consolidated years.json listing every year published under budget/.
 """
 
 import json
 import logging
 import sys
 from datetime import date
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
 
 # Set up path so we can import our modules
 sys.path.insert(0, str(__file__).rsplit("/src/", 1)[0])
 
 from src.sources.open_budgets import fetch_budget_data
-from src.extract.csv_parser import (
-    get_curated_expenditure_data,
-    get_curated_receipts_data,
-    get_curated_schemes_data,
-    get_curated_statewise_data,
-    get_curated_summary,
-)
+from src.extract.csv_parser import load_year_inputs
 from src.transform.derive import (
     POPULATION,
     human_context,
     per_capita,
+    per_capita_array,
     per_capita_daily,
-    percent_of_total,
-    yoy_change,
+    percent_of_total_array,
+    round_like_python,
+    to_records,
+    yoy_change_array,
 )
 from src.transform.sankey import build_sankey
 from src.transform.treemap import build_treemap
 from src.transform.budget_trends import build_budget_trends
-from src.transform.budget_vs_actual import build_budget_vs_actual
+from src.transform.budget_vs_actual import build_budget_vs_actual, covers_year
 from src.validate.schemas import (
     BudgetSummary,
     BudgetTrendsData,
@@ -58,7 +67,9 @@ from src.validate.schemas import (
     YearIndex,
 )
 from src.validate.invariants import run_all_invariants
+from src.publish import writer
 from src.publish.writer import publish_all
+from src.validate.engine import validate_outputs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -69,27 +80,73 @@ logger = logging.getLogger("pipeline")
 YEAR = "2025-26"
 SOURCE_URL = "https://openbudgetsindia.org/"
 
+YEARS_INDEX = "years.json"
+FLOAT_DECIMALS = 2  # published float precision; amounts and shares are rounded to 2 places
+
+
+def schemas_for(year: str) -> dict[str, type]:
+    """
+    Output path → Pydantic model for one year's budget/<year>/ files, in
+    validation order. budget-vs-actual.json is left out for years the
+    curated BE/RE/Actual data does not reach.
+    """
+    schemas = {
+        f"budget/{year}/summary.json": BudgetSummary,
+        f"budget/{year}/receipts.json": ReceiptsData,
+        f"budget/{year}/expenditure.json": ExpenditureData,
+        f"budget/{year}/sankey.json": SankeyData,
+        f"budget/{year}/treemap.json": TreemapData,
+        f"budget/{year}/statewise.json": StatewiseData,
+        f"budget/{year}/schemes.json": SchemesData,
+        f"budget/{year}/trends.json": BudgetTrendsData,
+        f"budget/{year}/budget-vs-actual.json": BudgetVsActualData,
+    }
+    if not covers_year(year):
+        del schemas[f"budget/{year}/budget-vs-actual.json"]
+    return schemas
 
-def run_pipeline():
-    logger.info("=" * 60)
-    logger.info(f"India Budget Pipeline — {YEAR}")
-    logger.info("=" * 60)
 
-    # ── Stage 1: FETCH ──────────────────────────────────────────
-    logger.info("Stage 1: FETCH")
-    api_result = fetch_budget_data()
+# Output path → Pydantic model for the current year, shared outputs included
+SCHEMAS = {**schemas_for(YEAR), YEARS_INDEX: YearIndex}
+
+
+def published_years() -> list[str]:
+    """Fiscal years with a budget/<year>/summary.json under public/data/."""
+    root = writer.DATA_DIR / "budget"
+    if not root.is_dir():
+        return []
+    return sorted(p.name for p in root.iterdir() if (p / "summary.json").is_file())
+
+
+def years_index(years: list[str]) -> dict:
+    """years.json for a set of fiscal years: sorted, the latest last."""
+    years = sorted(set(years))
+    return {"years": years, "latest": years[-1]}
+
+
+def fetch(year: str = YEAR) -> dict:
+    """Stage 1: look for a downloadable dataset on Open Budgets India."""
+    logger.info(f"Stage 1: FETCH ({year})")
+    api_result = fetch_budget_data(year)
     if api_result:
         logger.info(f"Got data from API: {api_result['dataset']}")
     else:
         logger.info("Using curated budget data (API unavailable or limited)")
+    return {"year": year, "api_result": api_result}
+
+
+def transform(raw: dict) -> dict[str, dict]:
+    """Stages 2-3: extract one year's tables and build every output, keyed by relative path."""
+    year = raw.get("year", YEAR)
 
     # ── Stage 2: EXTRACT ────────────────────────────────────────
-    logger.info("Stage 2: EXTRACT")
-    summary_raw = get_curated_summary()
-    expenditure_df = get_curated_expenditure_data()
-    receipts_df = get_curated_receipts_data()
-    statewise_df = get_curated_statewise_data()
-    schemes_df = get_curated_schemes_data()
+    logger.info(f"Stage 2: EXTRACT ({year})")
+    inputs = load_year_inputs(year)
+    summary_raw = inputs["summary"]
+    expenditure_df = inputs["expenditure"]
+    receipts_df = inputs["receipts"]
+    statewise_df = inputs["statewise"]
+    schemes_df = inputs["schemes"]
 
     total_expenditure = summary_raw["totalExpenditure"]
     total_receipts = receipts_df["amount"].sum()
@@ -112,43 +169,43 @@ def run_pipeline():
         "source": SOURCE_URL,
     }
 
+    # Derived columns are computed over whole columns (see transform/derive.py)
+
     # 3b. Receipts
-    receipts_categories = []
-    for _, row in receipts_df.iterrows():
-        receipts_categories.append({
-            "id": row["id"],
-            "name": row["name"],
-            "amount": row["amount"],
-            "percentOfTotal": percent_of_total(row["amount"], total_receipts),
-            "previousYear": row["previous_year"],
-            "yoyChange": yoy_change(row["amount"], row["previous_year"]),
-        })
+    receipts_categories = to_records(pd.DataFrame({
+        "id": receipts_df["id"],
+        "name": receipts_df["name"],
+        "amount": receipts_df["amount"],
+        "percentOfTotal": percent_of_total_array(receipts_df["amount"], total_receipts),
+        "previousYear": receipts_df["previous_year"],
+        "yoyChange": yoy_change_array(receipts_df["amount"], receipts_df["previous_year"]),
+    }))
     receipts_data = {
-        "year": YEAR,
+        "year": year,
         "total": round(total_receipts),
         "categories": receipts_categories,
     }
 
     # 3c. Expenditure (ministry-wise)
-    ministries = []
-    for _, row in expenditure_df.iterrows():
-        schemes = json.loads(row["schemes_json"])
-        ministry = {
-            "id": row["id"],
-            "name": row["name"],
-            "budgetEstimate": row["budget_estimate"],
-            "revisedEstimate": None,
-            "actualExpenditure": None,
-            "percentOfTotal": percent_of_total(row["budget_estimate"], total_expenditure),
-            "yoyChange": yoy_change(row["budget_estimate"], row["previous_year"]),
-            "perCapita": per_capita(row["budget_estimate"]),
-            "humanContext": human_context(row["id"], row["budget_estimate"]),
-            "schemes": schemes,
-        }
-        ministries.append(ministry)
+    estimates = expenditure_df["budget_estimate"]
+    ministries = to_records(pd.DataFrame({
+        "id": expenditure_df["id"],
+        "name": expenditure_df["name"],
+        "budgetEstimate": estimates,
+        "revisedEstimate": None,
+        "actualExpenditure": None,
+        "percentOfTotal": percent_of_total_array(estimates, total_expenditure),
+        "yoyChange": yoy_change_array(estimates, expenditure_df["previous_year"]),
+        "perCapita": per_capita_array(estimates),
+        "humanContext": [human_context(i, a) for i, a in zip(expenditure_df["id"], estimates.tolist())],
+    }))
+    # One parse for the whole column instead of json.loads per row
+    all_schemes = json.loads("[" + ",".join(expenditure_df["schemes_json"]) + "]")
+    for ministry, schemes in zip(ministries, all_schemes):
+        ministry["schemes"] = schemes
 
     expenditure_data = {
-        "year": YEAR,
+        "year": year,
         "total": total_expenditure,
         "ministries": ministries,
     }
@@ -158,48 +215,46 @@ def run_pipeline():
         receipts=receipts_categories,
         expenditures=ministries,
         total_expenditure=total_expenditure,
-        year=YEAR,
+        year=year,
     )
 
     # 3e. Treemap
     treemap_data = build_treemap(
         expenditures=ministries,
         total=total_expenditure,
-        year=YEAR,
+        year=year,
     )
 
     # 3f. State-wise transfers
     total_transfers = statewise_df["transfer"].sum()
-    states = []
-    for _, row in statewise_df.iterrows():
-        states.append({
-            "id": row["id"],
-            "name": row["name"],
-            "transfer": row["transfer"],
-            "perCapita": round(row["transfer"] * 1e7 / row["population"]),
-            "percentOfTotal": percent_of_total(row["transfer"], total_transfers),
-            "population": row["population"],
-        })
+    states = to_records(pd.DataFrame({
+        "id": statewise_df["id"],
+        "name": statewise_df["name"],
+        "transfer": statewise_df["transfer"],
+        "perCapita": round_like_python(
+            statewise_df["transfer"].to_numpy(np.float64) * 1e7 / statewise_df["population"].to_numpy(np.float64)
+        ).astype(np.int64),
+        "percentOfTotal": percent_of_total_array(statewise_df["transfer"], total_transfers),
+        "population": statewise_df["population"],
+    }))
     statewise_data = {
-        "year": YEAR,
+        "year": year,
         "totalTransfers": round(total_transfers),
         "states": states,
     }
 
     # 3g. Schemes
-    schemes_list = []
-    for _, row in schemes_df.iterrows():
-        schemes_list.append({
-            "id": row["id"],
-            "name": row["name"],
-            "ministry": row["ministry"],
-            "ministryName": row["ministryName"],
-            "allocation": row["allocation"],
-            "previousYear": row["previous_year"],
-            "yoyChange": yoy_change(row["allocation"], row["previous_year"]),
-            "humanContext": row["humanContext"],
-        })
-    schemes_data = {"year": YEAR, "schemes": schemes_list}
+    schemes_list = to_records(pd.DataFrame({
+        "id": schemes_df["id"],
+        "name": schemes_df["name"],
+        "ministry": schemes_df["ministry"],
+        "ministryName": schemes_df["ministryName"],
+        "allocation": schemes_df["allocation"],
+        "previousYear": schemes_df["previous_year"],
+        "yoyChange": yoy_change_array(schemes_df["allocation"], schemes_df["previous_year"]),
+        "humanContext": schemes_df["humanContext"],
+    }))
+    schemes_data = {"year": year, "schemes": schemes_list}
 
     # 3h. Tax slabs
     tax_slabs_data = {
@@ -241,7 +296,7 @@ def run_pipeline():
 
     # 3i. Expenditure shares (for tax calculator)
     expenditure_shares_data = {
-        "year": YEAR,
+        "year": year,
         "shares": [
             {"id": "transfers-to-states", "name": "State Transfers", "percentOfExpenditure": 23.9, "humanContext": "Funding your state's roads, schools, and hospitals", "humanContextMultiplier": 0},
             {"id": "interest-payments", "name": "Interest Payments", "percentOfExpenditure": 21.5, "humanContext": "Servicing past government debt", "humanContextMultiplier": 0},
@@ -259,89 +314,57 @@ def run_pipeline():
     }
 
     # 3j. Budget Trends (20-year historical)
-    trends_data = build_budget_trends(YEAR)
+    trends_data = build_budget_trends(year)
     logger.info(f"  trends.json: {len(trends_data['series'])} years")
 
-    # 3k. Budget vs Actual (ministry-level)
-    bva_data = build_budget_vs_actual(YEAR)
-    logger.info(f"  budget-vs-actual.json: {len(bva_data['ministries'])} ministries")
-
-    # Years index
-    years_data = {"years": ["2025-26"], "latest": "2025-26"}
-
-    # ── Stage 4: VALIDATE ──────────────────────────────────────
-    logger.info("Stage 4: VALIDATE")
-    errors = []
-
-    try:
-        BudgetSummary(**summary_data)
-        logger.info("  summary.json ✓")
-    except Exception as e:
-        errors.append(f"summary: {e}")
-        logger.error(f"  summary.json FAILED: {e}")
-
-    try:
-        ReceiptsData(**receipts_data)
-        logger.info("  receipts.json ✓")
-    except Exception as e:
-        errors.append(f"receipts: {e}")
-        logger.error(f"  receipts.json FAILED: {e}")
-
-    try:
-        ExpenditureData(**expenditure_data)
-        logger.info("  expenditure.json ✓")
-    except Exception as e:
-        errors.append(f"expenditure: {e}")
-        logger.error(f"  expenditure.json FAILED: {e}")
-
-    try:
-        SankeyData(**sankey_data)
-        logger.info("  sankey.json ✓")
-    except Exception as e:
-        errors.append(f"sankey: {e}")
-        logger.error(f"  sankey.json FAILED: {e}")
-
-    try:
-        TreemapData(**treemap_data)
-        logger.info("  treemap.json ✓")
-    except Exception as e:
-        errors.append(f"treemap: {e}")
-        logger.error(f"  treemap.json FAILED: {e}")
-
-    try:
-        StatewiseData(**statewise_data)
-        logger.info("  statewise.json ✓")
-    except Exception as e:
-        errors.append(f"statewise: {e}")
-        logger.error(f"  statewise.json FAILED: {e}")
-
-    try:
-        SchemesData(**schemes_data)
-        logger.info("  schemes.json ✓")
-    except Exception as e:
-        errors.append(f"schemes: {e}")
-        logger.error(f"  schemes.json FAILED: {e}")
-
-    try:
-        YearIndex(**years_data)
-        logger.info("  years.json ✓")
-    except Exception as e:
-        errors.append(f"years: {e}")
-        logger.error(f"  years.json FAILED: {e}")
-
-    try:
-        BudgetTrendsData(**trends_data)
-        logger.info("  trends.json ✓")
-    except Exception as e:
-        errors.append(f"trends: {e}")
-        logger.error(f"  trends.json FAILED: {e}")
-
-    try:
-        BudgetVsActualData(**bva_data)
-        logger.info("  budget-vs-actual.json ✓")
-    except Exception as e:
-        errors.append(f"budget-vs-actual: {e}")
-        logger.error(f"  budget-vs-actual.json FAILED: {e}")
+    # 3k. Budget vs Actual (ministry-level), for years the curated data covers
+    bva_data = build_budget_vs_actual(year) if covers_year(year) else None
+    if bva_data is None:
+        logger.info(f"  budget-vs-actual.json: no BE/RE/Actual figures for {year}, skipped")
+
+    outputs = {
+        f"budget/{year}/summary.json": summary_data,
+        f"budget/{year}/receipts.json": receipts_data,
+        f"budget/{year}/expenditure.json": expenditure_data,
+        f"budget/{year}/sankey.json": sankey_data,
+        f"budget/{year}/treemap.json": treemap_data,
+        f"budget/{year}/statewise.json": statewise_data,
+        f"budget/{year}/schemes.json": schemes_data,
+        f"budget/{year}/trends.json": trends_data,
+    }
+    if bva_data is not None:
+        outputs[f"budget/{year}/budget-vs-actual.json"] = bva_data
+    if year != YEAR:
+        return outputs
+
+    # Shared outputs, current year only. The years index keeps archive
+    # years already published; a multi-year build rewrites it at the end.
+    return {
+        **outputs,
+        "tax-calculator/slabs.json": tax_slabs_data,
+        "tax-calculator/expenditure-shares.json": expenditure_shares_data,
+        YEARS_INDEX: years_index([*published_years(), year]),
+    }
+
+
+def _year_of(outputs: dict[str, dict]) -> str:
+    """The fiscal year of a transform() result, from its budget/<year>/ paths."""
+    return next(path.split("/")[1] for path in outputs if path.startswith("budget/"))
+
+
+def validate(outputs: dict[str, dict]) -> list[str]:
+    """Stage 4: Pydantic checks, integrity logging and cross-file invariants."""
+    year = _year_of(outputs)
+    logger.info(f"Stage 4: VALIDATE ({year})")
+    schemas = SCHEMAS if year == YEAR else schemas_for(year)
+    errors = validate_outputs(
+        outputs, schemas, label=lambda rel_path: rel_path.rsplit("/", 1)[-1], decimals=FLOAT_DECIMALS
+    ).errors
+
+    expenditure_data = outputs[f"budget/{year}/expenditure.json"]
+    receipts_data = outputs[f"budget/{year}/receipts.json"]
+    ministries = expenditure_data["ministries"]
+    total_expenditure = expenditure_data["total"]
 
     # Integrity checks
     ministry_sum = sum(m["budgetEstimate"] for m in ministries)
@@ -351,49 +374,64 @@ def run_pipeline():
     pct_sum = sum(m["percentOfTotal"] for m in ministries)
     logger.info(f"  percentOfTotal sum: {pct_sum:.1f}%")
 
-    receipt_pct_sum = sum(c["percentOfTotal"] for c in receipts_categories)
+    receipt_pct_sum = sum(c["percentOfTotal"] for c in receipts_data["categories"])
     logger.info(f"  Receipt percentOfTotal sum: {receipt_pct_sum:.1f}%")
 
     if errors:
-        logger.error(f"Validation failed with {len(errors)} error(s):")
-        for err in errors:
-            logger.error(f"  - {err}")
-        sys.exit(1)
+        return errors
 
     # Cross-file invariants
     invariant_errors = run_all_invariants(
-        treemap=treemap_data,
+        treemap=outputs[f"budget/{year}/treemap.json"],
         expenditure=expenditure_data,
-        schemes=schemes_data,
+        schemes=outputs[f"budget/{year}/schemes.json"],
         receipts=receipts_data,
-        statewise=statewise_data,
+        statewise=outputs[f"budget/{year}/statewise.json"],
     )
     if invariant_errors:
-        logger.error(f"Cross-file invariants failed with {len(invariant_errors)} error(s):")
-        for err in invariant_errors:
-            logger.error(f"  - {err}")
-        sys.exit(1)
+        logger.error(f"Cross-file invariants failed with {len(invariant_errors)} error(s)")
+        return invariant_errors
     logger.info("  All cross-file invariants passed ✓")
 
-    # ── Stage 5: PUBLISH ────────────────────────────────────────
-    logger.info("Stage 5: PUBLISH")
-    outputs = {
-        f"budget/{YEAR}/summary.json": summary_data,
-        f"budget/{YEAR}/receipts.json": receipts_data,
-        f"budget/{YEAR}/expenditure.json": expenditure_data,
-        f"budget/{YEAR}/sankey.json": sankey_data,
-        f"budget/{YEAR}/treemap.json": treemap_data,
-        f"budget/{YEAR}/statewise.json": statewise_data,
-        f"budget/{YEAR}/schemes.json": schemes_data,
-        f"budget/{YEAR}/trends.json": trends_data,
-        f"budget/{YEAR}/budget-vs-actual.json": bva_data,
-        "tax-calculator/slabs.json": tax_slabs_data,
-        "tax-calculator/expenditure-shares.json": expenditure_shares_data,
-        "years.json": years_data,
-    }
+    return []
 
-    paths = publish_all(outputs)
+
+def publish(outputs: dict[str, dict]) -> list[Path]:
+    """Stage 5: write outputs under public/data/."""
+    logger.info("Stage 5: PUBLISH")
+    paths = publish_all(outputs, decimals=FLOAT_DECIMALS)
     logger.info(f"Published {len(paths)} files")
+    return paths
+
+
+def publish_years_index() -> list[Path]:
+    """
+    Final stage of a multi-year build: write years.json listing every year
+    published under budget/, once all per-year PUBLISH stages are done.
+    """
+    years_data = years_index(published_years())
+    errors = validate_outputs({YEARS_INDEX: years_data}, {YEARS_INDEX: YearIndex}, decimals=FLOAT_DECIMALS).errors
+    if errors:
+        raise ValueError("; ".join(errors))
+    logger.info(f"years.json: {len(years_data['years'])} year(s), latest {years_data['latest']}")
+    return publish_all({YEARS_INDEX: years_data}, decimals=FLOAT_DECIMALS)
+
+
+def run_pipeline():
+    logger.info("=" * 60)
+    logger.info(f"India Budget Pipeline — {YEAR}")
+    logger.info("=" * 60)
+
+    outputs = transform(fetch())
+
+    errors = validate(outputs)
+    if errors:
+        logger.error(f"Validation failed with {len(errors)} error(s):")
+        for err in errors:
+            logger.error(f"  - {err}")
+        sys.exit(1)
+
+    publish(outputs)
 
     logger.info("=" * 60)
     logger.info("Pipeline complete!")
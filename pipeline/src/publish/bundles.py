@@ -0,0 +1,119 @@
+"""
+Per-page data bundles: one file per topic page instead of one per chart.
+
+Each topic page loads 5–9 JSONs from the same <domain>/<year>/ directory.
+Whenever writer.publish_outputs() writes into such a directory — from the
+build DAG or a domain script run on its own — bundle() concatenates the
+files listed for that page in PAGES into <domain>/<year>/bundle.json:
+
+  {"economy/2025-26/summary.json": {...}, "economy/2025-26/gdp-growth.json": {...}, ...}
+
+The members are spliced in as the bytes already on disk, so a bundle costs
+no re-serialization and always matches the individual files. Bundles get
+the same treatment as any other output (skip-if-unchanged, .gz/.br
+sidecars with --precompress, hashed names with --hashed), and
+public/data/manifest.json lists which logical paths each bundle contains.
+The frontend loader fetches a page's bundle on first use and serves every
+member from it, so a page view costs one round trip instead of eight.
+
+To change what a page bundles, edit PAGES; domains missing from it are not
+bundled.
+"""
+
+import json
+import logging
+from pathlib import Path
+
+from src.publish import writer
+
+logger = logging.getLogger(__name__)
+
+BUNDLE_NAME = "bundle.json"
+
+# Domain → files (within <domain>/<year>/) that its topic page loads together.
+# Keep in step with the Promise.all lists in src/hooks/use*Data.ts.
+PAGES: dict[str, tuple[str, ...]] = {
+    "budget": (
+        "summary.json", "receipts.json", "expenditure.json", "sankey.json", "treemap.json",
+        "statewise.json", "schemes.json", "trends.json", "budget-vs-actual.json",
+    ),
+    "economy": (
+        "summary.json", "gdp-growth.json", "inflation.json", "fiscal.json",
+        "external.json", "sectors.json", "indicators.json",
+    ),
+    "rbi": (
+        "summary.json", "monetary-policy.json", "liquidity.json", "credit.json",
+        "forex.json", "indicators.json",
+    ),
+    "states": ("summary.json", "gsdp.json", "revenue.json", "fiscal-health.json", "indicators.json"),
+    "census": (
+        "summary.json", "population.json", "demographics.json", "literacy.json",
+        "health.json", "indicators.json",
+    ),
+    "education": ("summary.json", "enrollment.json", "quality.json", "spending.json", "indicators.json"),
+    "employment": (
+        "summary.json", "unemployment.json", "participation.json", "sectoral.json", "indicators.json",
+    ),
+    "healthcare": (
+        "summary.json", "infrastructure.json", "spending.json", "disease.json", "indicators.json",
+    ),
+    "environment": (
+        "summary.json", "air-quality.json", "forest.json", "energy.json", "water.json",
+        "indicators.json",
+    ),
+    "elections": (
+        "summary.json", "turnout.json", "results.json", "candidates.json", "representation.json",
+    ),
+}
+
+
+def build_bundle(directory: Path, members: tuple[str, ...]) -> tuple[bytes, list[str]]:
+    """
+    Splice the published members of one <domain>/<year>/ directory into a
+    bundle. Returns (payload, logical paths included); missing members are
+    left out with a warning.
+    """
+    parts, included = [], []
+    for name in members:
+        path = directory / name
+        if not path.exists():
+            logger.warning(f"Bundle {directory.name}: {name} not published, leaving it out")
+            continue
+        rel_path = path.relative_to(writer.DATA_DIR).as_posix()
+        parts.append(json.dumps(rel_path).encode() + b":" + path.read_bytes())
+        included.append(rel_path)
+    return b"{" + b",".join(parts) + b"}", included
+
+
+def bundle(domain: str, published: list[Path] | None = None, hashed: bool | None = None) -> list[Path]:
+    """
+    Write bundle.json for each year the domain just published (every year
+    directory on disk when `published` is None). writer.publish_outputs()
+    calls this after every publish; `hashed` is passed on to
+    writer.publish_payloads().
+    """
+    members = PAGES.get(domain)
+    if not members:
+        return []
+    root = writer.DATA_DIR / domain
+    if published is None:
+        directories = sorted(p for p in root.iterdir() if p.is_dir()) if root.exists() else []
+    else:
+        directories = sorted({Path(p).parent for p in published if Path(p).parent.parent == root})
+
+    payloads: dict[str, bytes] = {}
+    contents: dict[str, list[str]] = {}
+    for directory in directories:
+        payload, included = build_bundle(directory, members)
+        if included:
+            rel_path = f"{domain}/{directory.name}/{BUNDLE_NAME}"
+            payloads[rel_path] = payload
+            contents[rel_path] = included
+    if not payloads:
+        return []
+
+    report = writer.publish_payloads(payloads, hashed=hashed, bundles=contents)
+    for rel_path, result in zip(payloads, report.results):
+        state = "written" if result.written else "unchanged"
+        logger.info(f"Bundle {rel_path}: {len(contents[rel_path])} files, {result.size:,} bytes ({state})")
+    return report.paths
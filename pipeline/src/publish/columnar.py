@@ -0,0 +1,238 @@
+"""
+Columnar binary encoding for the tables inside published JSON.
+
+Most of the bytes in public/data are arrays of small records with the same
+keys — time series ([{"year": "2019-20", "value": 6.5}, ...]) and state
+tables ([{"id": "KA", "name": "Karnataka", "value": 75.4}, ...]) — which
+repeat every key for every row. encode() lifts each such array into columns:
+
+  - string columns (year axes, state ids/names) are stored once in a shared
+    string pool, so every series on the same year axis references one list
+  - numeric columns are packed little-endian as int32, float32 (when every
+    value survives the round trip at its published precision) or float64,
+    with a presence bitmap for nulls
+
+Container (.col, next to the .json):
+
+  b"IBXC" | version: u8 | header length: u32 LE | header JSON | pad | blob
+
+The header holds the document with every lifted array replaced by
+{"$table": i}, the string pool and, per table, each column's key, dtype,
+decimals and blob offsets. Column data is 8-byte aligned so browsers can
+view it as typed arrays without copying. decode() rebuilds the original
+document exactly; read_tables() returns the columns as numpy arrays (nulls
+as NaN) without materializing any rows.
+
+Published with PIPELINE_COLUMNAR=1 (build.py --columnar). Measure sizes and
+decode times with src/bench_columnar.py.
+"""
+
+import json
+import struct
+from typing import Any
+
+import numpy as np
+
+MAGIC = b"IBXC"
+VERSION = 1
+COLUMNAR_SUFFIX = ".col"
+MIN_ROWS = 2  # shorter arrays stay inline in the header
+MAX_DECIMALS = 6
+
+_PREFIX = struct.Struct("<4sBI")
+_DTYPES = {"i4": np.dtype("<i4"), "f4": np.dtype("<f4"), "f8": np.dtype("<f8")}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _table_keys(value: Any) -> tuple[str, ...] | None:
+    """Keys of a liftable array: same-keyed records, each column all strings or all numbers/nulls."""
+    if not isinstance(value, list) or len(value) < MIN_ROWS:
+        return None
+    if not all(isinstance(row, dict) for row in value):
+        return None
+    keys = tuple(value[0])
+    if not keys or any(tuple(row) != keys for row in value):
+        return None
+    numeric = 0
+    for key in keys:
+        column = [row[key] for row in value]
+        if all(isinstance(v, str) for v in column):
+            continue
+        if all(v is None or _is_number(v) for v in column) and any(v is not None for v in column):
+            numeric += 1
+            continue
+        return None
+    return keys if numeric else None
+
+
+def _decimals(value: float) -> int:
+    text = repr(value)
+    if "e" in text or "E" in text:
+        return MAX_DECIMALS + 1
+    return len(text.partition(".")[2])
+
+
+def _pack_numeric(column: list) -> tuple[dict, bytes, bytes | None]:
+    """Choose a dtype for one numeric column and pack it: (descriptor, values, bitmap)."""
+    present = [v for v in column if v is not None]
+    filled = [0 if v is None else v for v in column]
+    descriptor: dict[str, Any]
+    if all(isinstance(v, int) for v in present) and all(-(2**31) <= v < 2**31 for v in present):
+        descriptor = {"dtype": "i4"}
+    else:
+        decimals = max(_decimals(float(v)) for v in present)
+        as_f4 = np.asarray(filled, dtype=np.float32)
+        if decimals <= MAX_DECIMALS and all(
+            round(float(f), decimals) == v for f, v in zip(as_f4, filled)
+        ):
+            descriptor = {"dtype": "f4", "decimals": decimals}
+        else:
+            descriptor = {"dtype": "f8"}
+        # Ints in a float column must come back as ints
+        if any(isinstance(v, int) for v in present):
+            descriptor["ints"] = [i for i, v in enumerate(column) if isinstance(v, int)]
+    values = np.asarray(filled, dtype=_DTYPES[descriptor["dtype"]]).tobytes()
+    bitmap = None
+    if len(present) < len(column):
+        bitmap = np.packbits([v is not None for v in column], bitorder="little").tobytes()
+    return descriptor, values, bitmap
+
+
+class _Encoder:
+    def __init__(self):
+        self.strings: list[list[str]] = []
+        self.string_ids: dict[tuple[str, ...], int] = {}
+        self.tables: list[dict] = []
+        self.blob = bytearray()
+
+    def _append(self, data: bytes) -> int:
+        self.blob.extend(b"\0" * (-len(self.blob) % 8))
+        offset = len(self.blob)
+        self.blob.extend(data)
+        return offset
+
+    def _lift(self, rows: list[dict], keys: tuple[str, ...]) -> dict:
+        columns = []
+        for key in keys:
+            column = [row[key] for row in rows]
+            if all(isinstance(v, str) for v in column):
+                pool = self.string_ids.setdefault(tuple(column), len(self.strings))
+                if pool == len(self.strings):
+                    self.strings.append(column)
+                columns.append({"key": key, "strings": pool})
+                continue
+            descriptor, values, bitmap = _pack_numeric(column)
+            descriptor = {"key": key, **descriptor, "offset": self._append(values)}
+            descriptor["nulls"] = self._append(bitmap) if bitmap is not None else None
+            columns.append(descriptor)
+        self.tables.append({"rows": len(rows), "columns": columns})
+        return {"$table": len(self.tables) - 1}
+
+    def walk(self, value: Any) -> Any:
+        keys = _table_keys(value)
+        if keys is not None:
+            return self._lift(value, keys)
+        if isinstance(value, dict):
+            return {k: self.walk(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [self.walk(v) for v in value]
+        return value
+
+
+def encode(data: Any) -> bytes | None:
+    """Columnar container for `data`, or None when it has no liftable tables."""
+    encoder = _Encoder()
+    doc = encoder.walk(data)
+    if not encoder.tables:
+        return None
+    header = json.dumps(
+        {"doc": doc, "strings": encoder.strings, "tables": encoder.tables},
+        ensure_ascii=False, separators=(",", ":"),
+    ).encode()
+    prefix = _PREFIX.pack(MAGIC, VERSION, len(header)) + header
+    prefix += b"\0" * (-len(prefix) % 8)
+    return prefix + bytes(encoder.blob)
+
+
+def _parse(payload: bytes) -> tuple[dict, memoryview]:
+    magic, version, header_len = _PREFIX.unpack_from(payload)
+    if magic != MAGIC:
+        raise ValueError("not a columnar container")
+    if version != VERSION:
+        raise ValueError(f"unsupported columnar version {version}")
+    start = _PREFIX.size
+    header = json.loads(payload[start:start + header_len])
+    blob_start = start + header_len + (-(start + header_len) % 8)
+    return header, memoryview(payload)[blob_start:]
+
+
+def _column_array(column: dict, rows: int, blob: memoryview) -> np.ndarray:
+    """One numeric column as float64 with NaN for nulls."""
+    values = np.frombuffer(blob, _DTYPES[column["dtype"]], rows, column["offset"]).astype(np.float64)
+    if column.get("decimals") is not None:
+        values = values.round(column["decimals"])
+    if column["nulls"] is not None:
+        bitmap = np.frombuffer(blob, np.uint8, (rows + 7) // 8, column["nulls"])
+        values[~np.unpackbits(bitmap, count=rows, bitorder="little").astype(bool)] = np.nan
+    return values
+
+
+def read_tables(payload: bytes) -> tuple[Any, list[dict[str, np.ndarray | list[str]]]]:
+    """
+    The document skeleton ({"$table": i} placeholders) and every table as
+    {key: numpy array or list of strings}.
+    """
+    header, blob = _parse(payload)
+    tables = []
+    for table in header["tables"]:
+        tables.append({
+            column["key"]: header["strings"][column["strings"]] if "strings" in column
+            else _column_array(column, table["rows"], blob)
+            for column in table["columns"]
+        })
+    return header["doc"], tables
+
+
+def _rows(table: dict, strings: list[list[str]], blob: memoryview) -> list[dict]:
+    rows = table["rows"]
+    columns = []
+    for column in table["columns"]:
+        if "strings" in column:
+            columns.append(strings[column["strings"]])
+            continue
+        values = np.frombuffer(blob, _DTYPES[column["dtype"]], rows, column["offset"])
+        if column["dtype"] == "i4":
+            out = values.tolist()
+        elif column.get("decimals") is not None:
+            out = [round(v, column["decimals"]) for v in values.tolist()]
+        else:
+            out = values.tolist()
+        for i in column.get("ints", ()):
+            out[i] = int(out[i])
+        if column["nulls"] is not None:
+            bitmap = np.frombuffer(blob, np.uint8, (rows + 7) // 8, column["nulls"])
+            present = np.unpackbits(bitmap, count=rows, bitorder="little")
+            out = [v if p else None for v, p in zip(out, present.tolist())]
+        columns.append(out)
+    keys = [column["key"] for column in table["columns"]]
+    return [dict(zip(keys, values)) for values in zip(*columns)]
+
+
+def decode(payload: bytes) -> Any:
+    """Rebuild the original document from a columnar container."""
+    header, blob = _parse(payload)
+    tables = [_rows(table, header["strings"], blob) for table in header["tables"]]
+
+    def restore(value: Any) -> Any:
+        if isinstance(value, dict):
+            if len(value) == 1 and "$table" in value:
+                return tables[value["$table"]]
+            return {k: restore(v) for k, v in value.items()}
+        if isinstance(value, list):
+            return [restore(v) for v in value]
+        return value
+
+    return restore(header["doc"])
@@ -0,0 +1,128 @@
+"""
+JSON Patch (RFC 6902) deltas between two generations of a published file.
+
+With hashed names on, the writer keeps the previous generation of every
+output. When an output changes it also publishes
+<stem>.<old hash>-<new hash>.patch.json — a plain RFC 6902 operation array —
+and lists it in manifest.json under the file's "delta", so a client or
+mirror holding the previous version can patch it instead of downloading
+the whole file. A delta is only published when it is smaller than the new
+file. Patching yields a document equal to the new one as JSON; object
+members added by the patch land at the end, so re-serialized bytes (and
+their hash) can differ from the published file's.
+
+diff() is structural: objects are compared key by key, arrays by trimming
+the common prefix and suffix and patching the middle, so an appended MPC
+decision or a new year in a series becomes a single "add". apply() is a
+minimal applier for the operations diff() emits (add, remove, replace).
+"""
+
+import copy
+from typing import Any
+
+PATCH_SUFFIX = ".patch.json"
+
+
+def _escape(token: str) -> str:
+    return token.replace("~", "~0").replace("/", "~1")
+
+
+def _unescape(token: str) -> str:
+    return token.replace("~1", "/").replace("~0", "~")
+
+
+def _same(a: Any, b: Any) -> bool:
+    # Strict equality: 1 == 1.0 == True in Python, but they serialize differently
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, dict):
+        return a.keys() == b.keys() and all(_same(v, b[k]) for k, v in a.items())
+    if isinstance(a, list):
+        return len(a) == len(b) and all(_same(x, y) for x, y in zip(a, b))
+    return a == b
+
+
+def diff(old: Any, new: Any, path: str = "") -> list[dict]:
+    """Operations that turn `old` into `new`."""
+    if _same(old, new):
+        return []
+    if isinstance(old, dict) and isinstance(new, dict):
+        ops = []
+        for key in old:
+            if key not in new:
+                ops.append({"op": "remove", "path": f"{path}/{_escape(key)}"})
+        for key, value in new.items():
+            child = f"{path}/{_escape(key)}"
+            if key not in old:
+                ops.append({"op": "add", "path": child, "value": value})
+            else:
+                ops.extend(diff(old[key], value, child))
+        return ops
+    if isinstance(old, list) and isinstance(new, list):
+        return _diff_list(old, new, path)
+    return [{"op": "replace", "path": path, "value": new}]
+
+
+def _diff_list(old: list, new: list, path: str) -> list[dict]:
+    prefix = 0
+    while prefix < min(len(old), len(new)) and _same(old[prefix], new[prefix]):
+        prefix += 1
+    suffix = 0
+    while (
+        suffix < min(len(old), len(new)) - prefix
+        and _same(old[len(old) - 1 - suffix], new[len(new) - 1 - suffix])
+    ):
+        suffix += 1
+    old_mid = old[prefix:len(old) - suffix]
+    new_mid = new[prefix:len(new) - suffix]
+    common = min(len(old_mid), len(new_mid))
+
+    ops = []
+    for i in range(common):
+        ops.extend(diff(old_mid[i], new_mid[i], f"{path}/{prefix + i}"))
+    for i in range(common, len(new_mid)):
+        ops.append({"op": "add", "path": f"{path}/{prefix + i}", "value": new_mid[i]})
+    for _ in range(common, len(old_mid)):
+        ops.append({"op": "remove", "path": f"{path}/{prefix + common}"})
+    return ops
+
+
+def _resolve(doc: Any, path: str) -> tuple[Any, str]:
+    """Parent container and final token for a JSON pointer."""
+    tokens = [_unescape(t) for t in path.split("/")[1:]]
+    parent = doc
+    for token in tokens[:-1]:
+        parent = parent[int(token)] if isinstance(parent, list) else parent[token]
+    return parent, tokens[-1]
+
+
+def apply(doc: Any, ops: list[dict]) -> Any:
+    """Apply add/remove/replace operations to a copy of `doc`."""
+    doc = copy.deepcopy(doc)
+    for op in ops:
+        if op["path"] == "":
+            if op["op"] == "remove":
+                raise ValueError("cannot remove the document root")
+            doc = copy.deepcopy(op["value"])
+            continue
+        parent, token = _resolve(doc, op["path"])
+        if isinstance(parent, list):
+            index = len(parent) if token == "-" else int(token)
+            if op["op"] == "add":
+                parent.insert(index, copy.deepcopy(op["value"]))
+            elif op["op"] == "remove":
+                del parent[index]
+            elif op["op"] == "replace":
+                parent[index] = copy.deepcopy(op["value"])
+            else:
+                raise ValueError(f"unsupported operation {op['op']!r}")
+        else:
+            if op["op"] in ("add", "replace"):
+                if op["op"] == "replace" and token not in parent:
+                    raise ValueError(f"replace of missing member {op['path']}")
+                parent[token] = copy.deepcopy(op["value"])
+            elif op["op"] == "remove":
+                del parent[token]
+            else:
+                raise ValueError(f"unsupported operation {op['op']!r}")
+    return doc
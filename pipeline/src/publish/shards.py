@@ -0,0 +1,82 @@
+"""
+Optional sharding of indicators.json for lazy loading on the explorer pages.
+
+Every domain publishes one <domain>/<year>/indicators.json holding all of its
+explorer series (up to ~45 KB), though the explorer shows one indicator at a
+time. With PIPELINE_SHARD_INDICATORS=1 (build.py --shard-indicators) the
+writer also publishes, next to it:
+
+  indicators-index.json       {"year", "indicators": [{id, name, category,
+                               unit, source, shard}, ...]}
+  indicators/<id>.json        {"year", "indicator": {...full indicator...}}
+
+`shard` is the shard's path relative to public/data. The full
+indicators.json is still written, so existing pages and bundles keep
+working. Shards for indicators that no longer exist are deleted.
+"""
+
+import os
+import re
+from pathlib import Path, PurePosixPath
+
+SHARD_ENV = "PIPELINE_SHARD_INDICATORS"
+INDICATORS = "indicators.json"
+INDEX_NAME = "indicators-index.json"
+SHARD_DIR = "indicators"
+INDEX_FIELDS = ("id", "name", "category", "unit", "source")
+
+_SAFE_ID = re.compile(r"[A-Za-z0-9_-]+")
+# Content-hash, delta and sidecar suffixes (writer.HASH_LENGTH) on a shard's filename
+_VARIANT = re.compile(r"(\.[0-9a-f]{8}(-[0-9a-f]{8}\.patch)?)?(\.json)(\.gz|\.br)?$")
+
+
+def sharding_enabled() -> bool:
+    return os.environ.get(SHARD_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def shard_outputs(relative_path: str, data: dict) -> dict[str, dict]:
+    """
+    Index + per-indicator shards for one indicators.json output.
+
+    Returns {} for any other output.
+    """
+    path = PurePosixPath(relative_path)
+    if path.name != INDICATORS or not isinstance(data.get("indicators"), list):
+        return {}
+
+    year = data.get("year")
+    outputs: dict[str, dict] = {}
+    index = []
+    for indicator in data["indicators"]:
+        if not _SAFE_ID.fullmatch(str(indicator.get("id", ""))):
+            raise ValueError(f"{relative_path}: indicator id {indicator.get('id')!r} is not filename-safe")
+        shard = str(path.parent / SHARD_DIR / f"{indicator['id']}.json")
+        outputs[shard] = {"year": year, "indicator": indicator}
+        index.append({**{k: indicator[k] for k in INDEX_FIELDS if k in indicator}, "shard": shard})
+    outputs[str(path.parent / INDEX_NAME)] = {"year": year, "indicators": index}
+    return outputs
+
+
+def expand(outputs: dict[str, dict]) -> dict[str, dict]:
+    """outputs plus the index and shards for every indicators.json in it."""
+    expanded = dict(outputs)
+    for rel_path, data in outputs.items():
+        expanded.update(shard_outputs(rel_path, data))
+    return expanded
+
+
+def stale_shards(data_dir: Path, outputs: dict[str, dict]) -> list[Path]:
+    """Shard files (and their sidecars) on disk that `outputs` no longer produces."""
+    stale = []
+    for rel_path in outputs:
+        path = PurePosixPath(rel_path)
+        if path.name != INDEX_NAME:
+            continue
+        directory = data_dir / str(path.parent / SHARD_DIR)
+        if not directory.is_dir():
+            continue
+        for candidate in directory.iterdir():
+            base = _VARIANT.sub(r"\3", candidate.name)
+            if str(path.parent / SHARD_DIR / base) not in outputs:
+                stale.append(candidate)
+    return stale
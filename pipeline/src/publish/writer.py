@@ -1,41 +1,591 @@
 """
 Write validated JSON data to the public/data/ directory.
+
+Outputs are serialized to bytes first and compared with what is already on
+disk (size, then SHA-256). Unchanged files are left alone, so their mtimes
+and any CDN/browser cache entries survive a rebuild. Changed files are
+written atomically (temp file in the same directory, fsync, rename), so a
+crash never leaves a half-written JSON behind. Summaries stamp
+"lastUpdated" with the build date; publish_outputs() keeps the published
+stamp when nothing else in the file changed, so the date alone never
+rewrites a file (or mints a new hashed generation and delta) every day.
+
+Serialization has two modes, chosen by PIPELINE_JSON_MODE (or build.py --pretty):
+  compact — production default: no whitespace, floats trimmed to the
+            precision the domain declares (`decimals`, FLOAT_DECIMALS when
+            none is given, or a per-field override),
+            integral floats written as integers; encoded with orjson when
+            installed, stdlib json otherwise
+  pretty  — indent=2, for reviewing data diffs
+Every publish logs before/after byte sizes per domain.
+
+Precision is declared once per domain (FLOAT_DECIMALS in its main.py,
+passed to validate_outputs and publish_all) rather than per field. A World
+Bank-backed domain uses the PRECISION its fetch already rounds to, and its
+curated tables carry no more places than that, so the domain-wide trim only
+guards against float noise from derived values and changes nothing today.
+A field that ever needs different precision goes in `field_decimals`.
+
+With PIPELINE_HASHED_NAMES=1 (build.py --hashed), every output is also
+published under a content-hashed name (summary.json → summary.3f9a1c2b.json,
+hard-linked to the same bytes) that can be cached forever, and
+public/data/manifest.json maps each logical path to its current hashed file
+with size, hash and the time that content was generated. Concurrent domain
+publishes merge into the manifest under a file lock. Each logical path keeps
+its current and previous hashed file, so clients holding the previous
+manifest can still load data; older generations are pruned. When a file
+changes, a JSON Patch from the previous generation is published too and
+listed as the entry's "delta" (see src/publish/delta.py).
+
+Publishing a topic page's files also rebuilds that page's bundle.json
+(see src/publish/bundles.py), so the bundle never lags behind its members
+whichever script published them.
+
+With PIPELINE_COLUMNAR=1 (build.py --columnar), outputs containing time
+series or state tables also get a <name>.col columnar encoding alongside
+(see src/publish/columnar.py).
+
+With PIPELINE_PRECOMPRESS=1 (build.py --precompress), each JSON also gets
+precompressed .gz and .br sidecars at maximum compression, for a deploy step
+whose host serves them with no per-request CPU. They are off by default and
+gitignored: the committed public/data/ holds plain JSON only, and hosts that
+compress on the fly (Vercel) gain nothing from them. Sidecars are built on a
+thread pool (zlib and brotli release the GIL) and only when their JSON
+changed or they are missing. Brotli is optional (pip install brotli);
+without it only .gz sidecars are written.
 """
 
+import fcntl
+import gzip
+import hashlib
 import json
 import logging
-from pathlib import Path
+import os
+import re
+import shutil
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path, PurePosixPath
+from typing import Any
+
+from src.publish import columnar as columnar_format
+from src.publish import delta
+from src.publish import shards
+
+try:
+    import brotli
+except ImportError:  # optional dependency
+    brotli = None
+
+try:
+    import orjson
+except ImportError:  # optional dependency; stdlib json is the fallback
+    orjson = None
 
 logger = logging.getLogger(__name__)
 
 # Project root is 3 levels up from this file
 PROJECT_ROOT = Path(__file__).parent.parent.parent.parent
+DATA_DIR = PROJECT_ROOT / "public" / "data"
+COMPRESS_WORKERS = 4
+
+JSON_MODE_ENV = "PIPELINE_JSON_MODE"
+JSON_MODES = ("compact", "pretty")
+FLOAT_DECIMALS = 4  # default: the widest precision any domain declares (economy/rbi World Bank data)
+
+COLUMNAR_ENV = "PIPELINE_COLUMNAR"
+PRECOMPRESS_ENV = "PIPELINE_PRECOMPRESS"
+HASHED_NAMES_ENV = "PIPELINE_HASHED_NAMES"
+HASH_LENGTH = 8  # hex digits of SHA-256 in hashed filenames
+LAST_UPDATED = "lastUpdated"
+MANIFEST = "manifest.json"
+
+_warned_no_brotli = False
+
+
+@dataclass
+class WriteResult:
+    path: Path
+    written: bool  # False when the file already had these exact bytes
+    size: int
+    sha256: str
+    previous_size: int = 0  # size on disk before this write (0 for a new file)
+
+
+@dataclass
+class PublishReport:
+    results: list[WriteResult] = field(default_factory=list)
+    sidecars: list[Path] = field(default_factory=list)  # sidecars (re)generated this run
+    hashed: list[Path] = field(default_factory=list)  # content-hashed copies created this run
+
+    @property
+    def paths(self) -> list[Path]:
+        return [r.path for r in self.results]
+
+    @property
+    def written(self) -> int:
+        return sum(r.written for r in self.results)
+
+    @property
+    def skipped(self) -> int:
+        return len(self.results) - self.written
+
+    @property
+    def bytes_written(self) -> int:
+        return sum(r.size for r in self.results if r.written)
+
+    @property
+    def bytes_saved(self) -> int:
+        """Bytes not rewritten because the file was unchanged."""
+        return sum(r.size for r in self.results if not r.written)
+
+    def sizes_by_domain(self) -> dict[str, tuple[int, int, int]]:
+        """{domain: (files, bytes before, bytes after)}, domain = first path part under public/data."""
+        totals: dict[str, tuple[int, int, int]] = {}
+        for r in self.results:
+            domain = r.path.relative_to(DATA_DIR).parts[0] if r.path.is_relative_to(DATA_DIR) else "."
+            files, before, after = totals.get(domain, (0, 0, 0))
+            totals[domain] = (files + 1, before + r.previous_size, after + r.size)
+        return totals
+
+
+def json_mode() -> str:
+    mode = os.environ.get(JSON_MODE_ENV, "compact").strip().lower()
+    if mode not in JSON_MODES:
+        logger.warning(f"Unknown {JSON_MODE_ENV}={mode!r} — using 'compact'")
+        return "compact"
+    return mode
+
+
+def trim_floats(
+    value: Any,
+    decimals: int = FLOAT_DECIMALS,
+    field_decimals: dict[str, int] | None = None,
+    _field: str | None = None,
+) -> Any:
+    """
+    Round every float to its field's precision (field_decimals[name], else
+    `decimals`); floats that end up integral become ints.
+    """
+    if isinstance(value, float):
+        places = field_decimals.get(_field, decimals) if field_decimals and _field else decimals
+        rounded = round(value, places)
+        return int(rounded) if rounded.is_integer() else rounded
+    if isinstance(value, dict):
+        return {k: trim_floats(v, decimals, field_decimals, k) for k, v in value.items()}
+    if isinstance(value, list):
+        return [trim_floats(v, decimals, field_decimals, _field) for v in value]
+    return value
+
+
+def serialize(
+    data: dict,
+    mode: str | None = None,
+    field_decimals: dict[str, int] | None = None,
+    decimals: int = FLOAT_DECIMALS,
+) -> bytes:
+    """Encode an output in the given mode (default: json_mode())."""
+    if (mode or json_mode()) == "pretty":
+        return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+    trimmed = trim_floats(data, decimals, field_decimals)
+    if orjson is not None:
+        return orjson.dumps(trimmed, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(trimmed, separators=(",", ":"), ensure_ascii=False).encode("utf-8")
+
+
+def _serialize_output(
+    relative_path: str,
+    data: dict,
+    mode: str,
+    field_decimals: dict[str, int] | None,
+    decimals: int,
+) -> bytes:
+    """serialize(), keeping the published "lastUpdated" when nothing else differs."""
+    payload = serialize(data, mode, field_decimals, decimals)
+    if not isinstance(data, dict) or LAST_UPDATED not in data:
+        return payload
+    try:
+        published = (DATA_DIR / relative_path).read_bytes()
+        previous = json.loads(published).get(LAST_UPDATED)
+    except (FileNotFoundError, ValueError, AttributeError):
+        return payload
+    if previous is None or previous == data[LAST_UPDATED]:
+        return payload
+    carried = serialize({**data, LAST_UPDATED: previous}, mode, field_decimals, decimals)
+    return carried if carried == published else payload
+
+
+def _file_sha256(path: Path) -> str | None:
+    try:
+        with open(path, "rb") as f:
+            return hashlib.file_digest(f, "sha256").hexdigest()
+    except FileNotFoundError:
+        return None
+
+
+def _atomic_write(path: Path, payload: bytes) -> None:
+    """Write via a temp file in the same directory, fsync, then rename over `path`."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, prefix=f".{path.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+            f.flush()
+            os.fsync(f.fileno())
+        os.chmod(tmp, 0o644)
+        os.replace(tmp, path)
+    except BaseException:
+        Path(tmp).unlink(missing_ok=True)
+        raise
+    # Persist the rename itself
+    dir_fd = os.open(path.parent, os.O_RDONLY)
+    try:
+        os.fsync(dir_fd)
+    finally:
+        os.close(dir_fd)
+
+
+def write_bytes(payload: bytes, relative_path: str) -> WriteResult:
+    """Write bytes to public/data/{relative_path} unless the file already holds them."""
+    out_path = DATA_DIR / relative_path
+    digest = hashlib.sha256(payload).hexdigest()
+
+    try:
+        previous_size = out_path.stat().st_size
+    except FileNotFoundError:
+        previous_size = 0
+    unchanged = previous_size == len(payload) and _file_sha256(out_path) == digest
+
+    if unchanged:
+        logger.debug(f"Unchanged: {out_path}")
+        return WriteResult(out_path, False, len(payload), digest, previous_size)
+
+    _atomic_write(out_path, payload)
+    logger.info(f"Wrote: {out_path} ({previous_size:,} → {len(payload):,} bytes)")
+    return WriteResult(out_path, True, len(payload), digest, previous_size)
+
+
+def precompress_enabled() -> bool:
+    return os.environ.get(PRECOMPRESS_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def sidecar_suffixes() -> tuple[str, ...]:
+    return (".gz", ".br") if brotli is not None else (".gz",)
+
+
+def _compress(payload: bytes, suffix: str) -> bytes:
+    if suffix == ".gz":
+        return gzip.compress(payload, compresslevel=9, mtime=0)  # mtime=0: reproducible bytes
+    return brotli.compress(payload, quality=11)
+
+
+def _sidecar_stale(path: Path, sidecar: Path) -> bool:
+    try:
+        return sidecar.stat().st_mtime < path.stat().st_mtime
+    except FileNotFoundError:
+        return True
+
+
+def write_sidecars(paths: list[Path], changed: set[Path] = frozenset()) -> list[Path]:
+    """
+    (Re)generate compressed sidecars next to each path, in a thread pool.
+
+    A sidecar is rebuilt when its path is in `changed`, or when it is missing
+    or older than its source. Returns the sidecars written.
+    """
+    global _warned_no_brotli
+    if brotli is None and not _warned_no_brotli:
+        logger.warning("brotli not installed — writing .gz sidecars only")
+        _warned_no_brotli = True
+    jobs = [
+        (path, path.with_name(path.name + suffix), suffix)
+        for path in paths
+        for suffix in sidecar_suffixes()
+        if path in changed or _sidecar_stale(path, path.with_name(path.name + suffix))
+    ]
+    if not jobs:
+        return []
+
+    def build(job: tuple[Path, Path, str]) -> Path:
+        path, sidecar, suffix = job
+        _atomic_write(sidecar, _compress(path.read_bytes(), suffix))
+        return sidecar
+
+    with ThreadPoolExecutor(max_workers=COMPRESS_WORKERS) as pool:
+        written = list(pool.map(build, jobs))
+    logger.info(f"Sidecars: {len(written)} compressed file(s) regenerated")
+    return written
+
+
+def precompress_tree(root: Path | None = None) -> list[Path]:
+    """Bring sidecars up to date for every JSON under root (default public/data)."""
+    return write_sidecars(sorted((root or DATA_DIR).rglob("*.json")))
+
+
+def hashed_names_enabled() -> bool:
+    return os.environ.get(HASHED_NAMES_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def hashed_name(relative_path: str, sha256: str) -> str:
+    """budget/2025-26/summary.json → budget/2025-26/summary.<hash>.json"""
+    path = PurePosixPath(relative_path)
+    return str(path.with_name(f"{path.stem}.{sha256[:HASH_LENGTH]}{path.suffix}"))
+
+
+def _link_or_copy(source: Path, target: Path) -> None:
+    """Give `target` the bytes of `source`, sharing the inode where possible."""
+    tmp = target.with_name(f".{target.name}.tmp")
+    tmp.unlink(missing_ok=True)
+    try:
+        os.link(source, tmp)
+    except OSError:
+        shutil.copyfile(source, tmp)
+    os.replace(tmp, target)
+
+
+def _publish_hashed(results: dict[str, WriteResult], compress: bool) -> list[Path]:
+    """Materialize hashed copies (and their sidecars); return the paths created."""
+    created = []
+    for rel_path, result in results.items():
+        target = DATA_DIR / hashed_name(rel_path, result.sha256)
+        suffixes = sidecar_suffixes() if compress else ()
+        for suffix in ("", *suffixes):
+            source = result.path.with_name(result.path.name + suffix)
+            dest = target.with_name(target.name + suffix)
+            if not dest.exists() and source.exists():
+                _link_or_copy(source, dest)
+                created.append(dest)
+    return created
+
+
+def update_manifest(
+    results: dict[str, WriteResult],
+    mode: str | None = None,
+    bundles: dict[str, list[str]] | None = None,
+    compress: bool = True,
+    unhashed: dict[str, WriteResult] | None = None,
+) -> WriteResult:
+    """
+    Merge entries into public/data/manifest.json.
+
+    `results` adds hashed-file entries: those whose hash is unchanged keep
+    their original `generated` time, and hashed files two or more
+    generations old are deleted. `bundles` maps bundle paths to the logical
+    paths they contain (see src/publish/bundles.py). `unhashed` are files
+    just published under their plain name only: an entry whose hash no
+    longer matches is dropped, so clients load the plain file instead of a
+    stale hashed copy.
+    """
+    DATA_DIR.mkdir(parents=True, exist_ok=True)
+    with open(DATA_DIR / f".{MANIFEST}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        manifest_path = DATA_DIR / MANIFEST
+        try:
+            manifest = json.loads(manifest_path.read_bytes())
+        except FileNotFoundError:
+            manifest = {"generated": None, "files": {}}
+
+        now = datetime.now(timezone.utc).isoformat(timespec="seconds")
+        files = manifest["files"]
+        changed = False
+        for rel_path, result in results.items():
+            old = files.get(rel_path)
+            if old is not None and old["sha256"] == result.sha256:
+                continue
+            entry = files[rel_path] = {
+                "file": hashed_name(rel_path, result.sha256),
+                "size": result.size,
+                "sha256": result.sha256,
+                "generated": now,
+                "previous": old["file"] if old else None,
+                "delta": _write_delta(rel_path, old, result, mode, compress) if old else None,
+            }
+            delta_file = entry["delta"]["file"] if entry["delta"] else None
+            _prune_hashed(rel_path, keep={entry["file"], entry["previous"], delta_file})
+            changed = True
+        for rel_path, result in (unhashed or {}).items():
+            old = files.get(rel_path)
+            if old is not None and old["sha256"] != result.sha256:
+                del files[rel_path]
+                # Keep the last hashed copy for clients still on the old manifest
+                _prune_hashed(rel_path, keep={old["file"]})
+                changed = True
+        if bundles:
+            known = manifest.setdefault("bundles", {})
+            changed |= any(known.get(path) != members for path, members in bundles.items())
+            manifest["bundles"] = dict(sorted({**known, **bundles}.items()))
+
+        if changed or manifest["generated"] is None:
+            manifest["generated"] = now
+            manifest["files"] = dict(sorted(files.items()))
+        result = write_bytes(serialize(manifest, mode), MANIFEST)
+        if compress:
+            write_sidecars([result.path], changed={result.path} if result.written else set())
+        return result
+
+
+def delta_name(relative_path: str, old_sha256: str, new_sha256: str) -> str:
+    """summary.json → summary.<old hash>-<new hash>.patch.json"""
+    path = PurePosixPath(relative_path)
+    return str(path.with_name(
+        f"{path.stem}.{old_sha256[:HASH_LENGTH]}-{new_sha256[:HASH_LENGTH]}{delta.PATCH_SUFFIX}"
+    ))
+
+
+def _write_delta(
+    relative_path: str, old: dict, result: WriteResult, mode: str | None, compress: bool
+) -> dict | None:
+    """Publish a JSON Patch from the previous generation; None when not worth it."""
+    try:
+        previous = json.loads((DATA_DIR / old["file"]).read_bytes())
+    except (FileNotFoundError, ValueError):
+        return None
+    ops = delta.diff(previous, json.loads(result.path.read_bytes()))
+    payload = serialize(ops, mode)
+    if len(payload) >= result.size:
+        return None
+    written = write_bytes(payload, delta_name(relative_path, old["sha256"], result.sha256))
+    if compress:
+        write_sidecars([written.path], changed={written.path} if written.written else set())
+    return {
+        "from": old["sha256"],
+        "file": delta_name(relative_path, old["sha256"], result.sha256),
+        "size": written.size,
+    }
+
+
+def _prune_hashed(relative_path: str, keep: set[str | None]) -> None:
+    path = PurePosixPath(relative_path)
+    digest = rf"[0-9a-f]{{{HASH_LENGTH}}}"
+    pattern = re.compile(
+        rf"{re.escape(path.stem)}\.{digest}(-{digest}\.patch)?{re.escape(path.suffix)}(\.gz|\.br)?"
+    )
+    directory = DATA_DIR / path.parent
+    keep_names = {PurePosixPath(k).name for k in keep if k}
+    for candidate in directory.glob(f"{path.stem}.*"):
+        base = candidate.name.removesuffix(".gz").removesuffix(".br")
+        if pattern.fullmatch(candidate.name) and base not in keep_names:
+            candidate.unlink(missing_ok=True)
 
 
 def write_json(data: dict, relative_path: str) -> Path:
     """
     Write a dict as JSON to public/data/{relative_path}.
-    Creates parent directories as needed.
+    Creates parent directories as needed; skips the write if nothing changed.
+    """
+    return write_bytes(serialize(data), relative_path).path
+
+
+def columnar_enabled() -> bool:
+    return os.environ.get(COLUMNAR_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+def _columnar_payloads(payloads: dict[str, bytes]) -> dict[str, bytes]:
+    """
+    .col encodings of the JSON payloads, built from the published (trimmed)
+    values. Skipped where the container would not be smaller.
+    """
+    encoded = {}
+    for rel_path, payload in payloads.items():
+        container = columnar_format.encode(json.loads(payload))
+        if container is not None and len(container) < len(payload):
+            encoded[str(PurePosixPath(rel_path).with_suffix(columnar_format.COLUMNAR_SUFFIX))] = container
+    return encoded
+
+
+def publish_payloads(
+    payloads: dict[str, bytes],
+    compress: bool | None = None,
+    hashed: bool | None = None,
+    bundles: dict[str, list[str]] | None = None,
+) -> PublishReport:
+    """
+    Write already-serialized outputs: skip-if-unchanged, sidecars, and
+    hashed copies plus manifest entries. `bundles` is recorded in the
+    manifest whether or not hashed names are on; without hashed names,
+    manifest entries these outputs have made stale are dropped.
     """
-    out_path = PROJECT_ROOT / "public" / "data" / relative_path
-    out_path.parent.mkdir(parents=True, exist_ok=True)
+    report = PublishReport()
+    compress = compress if compress is not None else precompress_enabled()
+    by_path = {rel_path: write_bytes(payload, rel_path) for rel_path, payload in payloads.items()}
+    report.results = list(by_path.values())
+    if compress:
+        report.sidecars = write_sidecars(
+            report.paths, changed={r.path for r in report.results if r.written}
+        )
+    if hashed if hashed is not None else hashed_names_enabled():
+        report.hashed = _publish_hashed(by_path, compress)
+        update_manifest(by_path, json_mode(), bundles, compress=compress)
+        logger.info(f"Manifest: {len(report.hashed)} hashed file(s) added")
+    elif bundles or (DATA_DIR / MANIFEST).exists():
+        update_manifest({}, json_mode(), bundles, compress=compress, unhashed=by_path)
+    return report
 
-    with open(out_path, "w") as f:
-        json.dump(data, f, indent=2, ensure_ascii=False)
 
-    logger.info(f"Wrote: {out_path}")
-    return out_path
+def publish_outputs(
+    outputs: dict[str, dict],
+    compress: bool | None = None,
+    field_decimals: dict[str, int] | None = None,
+    hashed: bool | None = None,
+    shard: bool | None = None,
+    columnar: bool | None = None,
+    decimals: int = FLOAT_DECIMALS,
+    bundle: bool = True,
+) -> PublishReport:
+    """
+    Write every output (skipping unchanged ones), plus compressed sidecars
+    when asked for, and return per-file results.
+
+    Args:
+        outputs: dict mapping relative paths to data dicts.
+        compress: Also write .gz/.br sidecars (default: PIPELINE_PRECOMPRESS).
+        field_decimals: Per-field float precision overrides for compact mode.
+        hashed: Also publish content-hashed copies and update manifest.json
+            (default: PIPELINE_HASHED_NAMES).
+        shard: Also publish an index and per-indicator shards for every
+            indicators.json (default: PIPELINE_SHARD_INDICATORS).
+        columnar: Also publish a .col columnar encoding next to every output
+            that contains tables (default: PIPELINE_COLUMNAR).
+        decimals: Float precision for compact mode, as declared by the domain.
+        bundle: Rebuild the bundle.json of every <domain>/<year>/ directory
+            written to, for domains listed in bundles.PAGES.
+    """
+    if shard if shard is not None else shards.sharding_enabled():
+        outputs = shards.expand(outputs)
+        for stale in shards.stale_shards(DATA_DIR, outputs):
+            stale.unlink()
+    mode = json_mode()
+    payloads = {
+        rel_path: _serialize_output(rel_path, data, mode, field_decimals, decimals)
+        for rel_path, data in outputs.items()
+    }
+    if columnar if columnar is not None else columnar_enabled():
+        payloads.update(_columnar_payloads(payloads))
+    report = publish_payloads(payloads, compress, hashed)
+    if bundle:
+        from src.publish import bundles  # imports this module
+
+        for domain in sorted({PurePosixPath(p).parts[0] for p in outputs} & bundles.PAGES.keys()):
+            bundles.bundle(domain, report.paths, hashed)
+    logger.info(
+        f"Publish: {report.written} written, {report.skipped} unchanged "
+        f"({report.bytes_written:,} bytes written, {report.bytes_saved:,} bytes saved)"
+    )
+    for domain, (files, before, after) in report.sizes_by_domain().items():
+        change = f"{(after - before) / before:+.0%}" if before else "new"
+        logger.info(f"  {domain} ({mode}): {files} files, {before:,} → {after:,} bytes ({change})")
+    return report
 
 
-def publish_all(outputs: dict[str, dict]) -> list[Path]:
+def publish_all(outputs: dict[str, dict], decimals: int = FLOAT_DECIMALS) -> list[Path]:
     """
     Write all pipeline outputs to their respective JSON files.
 
     Args:
         outputs: dict mapping relative paths to data dicts.
             e.g. {"budget/2025-26/summary.json": {...}, ...}
+        decimals: Float precision the domain declares for its outputs.
     """
-    paths = []
-    for rel_path, data in outputs.items():
-        paths.append(write_json(data, rel_path))
-    return paths
+    return publish_outputs(outputs, decimals=decimals).paths
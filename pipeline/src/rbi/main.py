@@ -20,7 +20,7 @@ from pathlib import Path
 # Set up path so we can import our modules
 sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
 
-from src.rbi.sources.world_bank import fetch_multiple
+from src.rbi.sources.world_bank import PRECISION, fetch_multiple
 from src.rbi.transform.monetary_policy import (
     build_monetary_policy,
     CURRENT_RATES,
@@ -40,6 +40,7 @@ from src.rbi.validate.schemas import (
     TimeSeriesPoint,
 )
 from src.publish.writer import publish_all
+from src.validate.engine import validate_outputs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -49,6 +50,19 @@ logger = logging.getLogger("rbi-pipeline")
 
 SURVEY_YEAR = "2025-26"
 
+OUTPUT_DIR = f"rbi/{SURVEY_YEAR}"
+FLOAT_DECIMALS = PRECISION
+
+# Output filename → Pydantic model, in validation order
+SCHEMAS = {
+    "summary.json": RBISummary,
+    "monetary-policy.json": MonetaryPolicyData,
+    "liquidity.json": LiquidityData,
+    "credit.json": CreditData,
+    "forex.json": ForexData,
+    "indicators.json": RBIIndicatorsData,
+}
+
 
 def calendar_to_fiscal(cal_year: str) -> str:
     """Convert calendar year to Indian fiscal year string: '2020' -> '2020-21'."""
@@ -56,12 +70,8 @@ def calendar_to_fiscal(cal_year: str) -> str:
     return f"{y}-{str(y + 1)[-2:]}"
 
 
-def run_rbi_pipeline():
-    logger.info("=" * 60)
-    logger.info(f"RBI Data Pipeline — {SURVEY_YEAR}")
-    logger.info("=" * 60)
-
-    # ── Stage 1: FETCH ──────────────────────────────────────────
+def fetch() -> dict:
+    """Stage 1: World Bank indicators (curated MPC data is read in TRANSFORM)."""
     logger.info("Stage 1: FETCH from World Bank API")
     wb_data = fetch_multiple(
         [
@@ -83,8 +93,13 @@ def run_rbi_pipeline():
     for key, data in wb_data.items():
         logger.info(f"  {key}: {len(data)} data points")
 
-    # ── Stage 2: TRANSFORM ──────────────────────────────────────
+    return {"wb_data": wb_data}
+
+
+def transform(raw: dict) -> dict[str, dict]:
+    """Stage 2: build every output file, keyed by filename."""
     logger.info("Stage 2: TRANSFORM")
+    wb_data = raw["wb_data"]
 
     # 2a. Monetary Policy (curated RBI data, no WB dependency)
     monetary_data = build_monetary_policy(SURVEY_YEAR)
@@ -125,46 +140,47 @@ def run_rbi_pipeline():
     }
     logger.info(f"  indicators.json: {len(indicators)} indicators")
 
-    # ── Stage 3: VALIDATE ──────────────────────────────────────
+    return {
+        "summary.json": summary_data,
+        "monetary-policy.json": monetary_data,
+        "liquidity.json": liquidity_data,
+        "credit.json": credit_data,
+        "forex.json": forex_data,
+        "indicators.json": indicators_data,
+    }
+
+
+def validate(outputs: dict[str, dict]) -> list[str]:
+    """Stage 3: check each output against its Pydantic model. Returns error strings."""
     logger.info("Stage 3: VALIDATE")
-    errors = []
-
-    validations = [
-        ("summary.json", RBISummary, summary_data),
-        ("monetary-policy.json", MonetaryPolicyData, monetary_data),
-        ("liquidity.json", LiquidityData, liquidity_data),
-        ("credit.json", CreditData, credit_data),
-        ("forex.json", ForexData, forex_data),
-        ("indicators.json", RBIIndicatorsData, indicators_data),
-    ]
+    return validate_outputs(outputs, SCHEMAS, decimals=FLOAT_DECIMALS).errors
 
-    for name, model, data in validations:
-        try:
-            model(**data)
-            logger.info(f"  {name} ✓")
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            logger.error(f"  {name} FAILED: {e}")
 
+def publish(outputs: dict[str, dict]) -> list[Path]:
+    """Stage 4: write outputs under public/data/rbi/."""
+    logger.info("Stage 4: PUBLISH")
+    paths = publish_all(
+        {f"{OUTPUT_DIR}/{name}": data for name, data in outputs.items()}, decimals=FLOAT_DECIMALS
+    )
+    logger.info(f"Published {len(paths)} files")
+    return paths
+
+
+def run_rbi_pipeline():
+    logger.info("=" * 60)
+    logger.info(f"RBI Data Pipeline — {SURVEY_YEAR}")
+    logger.info("=" * 60)
+
+    outputs = transform(fetch())
+
+    errors = validate(outputs)
     if errors:
         logger.error(f"Validation failed with {len(errors)} error(s):")
         for err in errors:
             logger.error(f"  - {err}")
         sys.exit(1)
 
-    # ── Stage 4: PUBLISH ──────────────────────────────────────
-    logger.info("Stage 4: PUBLISH")
-    outputs = {
-        f"rbi/{SURVEY_YEAR}/summary.json": summary_data,
-        f"rbi/{SURVEY_YEAR}/monetary-policy.json": monetary_data,
-        f"rbi/{SURVEY_YEAR}/liquidity.json": liquidity_data,
-        f"rbi/{SURVEY_YEAR}/credit.json": credit_data,
-        f"rbi/{SURVEY_YEAR}/forex.json": forex_data,
-        f"rbi/{SURVEY_YEAR}/indicators.json": indicators_data,
-    }
-
-    paths = publish_all(outputs)
-    logger.info(f"Published {len(paths)} files")
+    publish(outputs)
 
     logger.info("=" * 60)
     logger.info("RBI pipeline complete!")
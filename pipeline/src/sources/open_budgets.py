@@ -2,24 +2,93 @@
 CKAN API client for openbudgetsindia.org.
 Attempts to fetch Union Budget data via the CKAN API.
 Falls back to curated data if the API is inaccessible.
+
+The search queries run concurrently and each query's result is cached under
+pipeline/.cache/ckan/ (keyed by query and row count, one-day TTL, honouring
+PIPELINE_CACHE_MODE like the World Bank client). The best few CSV/Excel
+resources are then downloaded in parallel into data-raw/:
+
+  - a file is named after its resource, reduced to [A-Za-z0-9._-] and
+    MAX_NAME_LENGTH characters, so a name holding "/", ".." or spaces can
+    neither escape data-raw/ nor fail to open
+  - bodies are streamed in 1 MiB chunks into <file>.part
+  - a partial file is resumed with an HTTP Range request (If-Range on the
+    ETag seen earlier, so a changed file restarts from scratch), also when
+    the connection drops mid-download
+  - a finished file gets a <file>.meta.json sidecar with its URL, size,
+    SHA-256 and validators; a file only counts as downloaded when its size
+    and hash still match the sidecar, so truncated or corrupted files are
+    fetched again instead of reused
+  - the size and hash CKAN publishes for a resource, when present, are
+    checked before the file is accepted
+  - each target is downloaded under an exclusive lock (.<file>.lock), so
+    processes fetching the same resource — parallel budget years share
+    most search results — wait for one another instead of racing on the
+    .part file; the one that waits then finds the file complete
+
+src/common/ckan_standin.py serves a local stand-in of the API for tests.
 """
 
+import fcntl
+import hashlib
+import json
 import logging
+import re
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 
 import requests
 
+from src.common import http_client
+from src.common.cache import CACHE_ROOT, DiskCache, cache_mode, refresh_after
+
 logger = logging.getLogger(__name__)
 
 BASE_URL = "https://openbudgetsindia.org"
 API_BASE = f"{BASE_URL}/api/3/action"
 DATA_RAW_DIR = Path(__file__).parent.parent.parent / "data-raw"
 
+SEARCH_CACHE = DiskCache(CACHE_ROOT / "ckan", max_bytes=5 * 1024 * 1024)
+SEARCH_TTL = 24 * 3600
+CHUNK_SIZE = 1 << 20  # 1 MiB; the old 8 KB chunks cost a syscall per 8 KB
+DOWNLOAD_WORKERS = 4
+MAX_DOWNLOADS = 4  # candidate resources fetched per run
+RESUME_ATTEMPTS = 5
+DOWNLOAD_TIMEOUT = 60
+FORMATS = ("csv", "xlsx", "xls")
+META_SUFFIX = ".meta.json"
+PART_SUFFIX = ".part"
+
+_CONTENT_RANGE = re.compile(r"bytes (?:\d+-\d+|\*)/(\d+)")
+_UNSAFE_NAME = re.compile(r"[^A-Za-z0-9._-]+")
+MAX_NAME_LENGTH = 100  # characters of a resource name kept in its filename
+_DIGEST_LENGTHS = {32: "md5", 40: "sha1", 64: "sha256"}
+
+
+def search_queries(year: str) -> list[str]:
+    return [
+        f"union budget {year}",
+        "union budget expenditure",
+        "union budget receipt",
+        "demand for grants",
+    ]
+
 
 def search_datasets(query: str = "union budget 2025-26", rows: int = 10) -> list[dict] | None:
-    """Search CKAN for budget datasets."""
+    """Search CKAN for budget datasets, through the per-query cache."""
+    key = SEARCH_CACHE.key(API_BASE, query, rows)
+    mode = cache_mode()
+    entry = SEARCH_CACHE.get(key)
+    if mode == "refresh" and entry is not None and entry.fetched_at < refresh_after():
+        entry = None
+    if entry is not None and (mode == "offline" or entry.is_fresh()):
+        return entry.data
+    if mode == "offline":
+        logger.warning(f"No cached CKAN search for '{query}' (offline mode)")
+        return None
     try:
-        resp = requests.get(
+        resp = http_client.get(
             f"{API_BASE}/package_search",
             params={"q": query, "rows": rows},
             timeout=15,
@@ -29,65 +98,260 @@ def search_datasets(query: str = "union budget 2025-26", rows: int = 10) -> list
         if data.get("success"):
             results = data["result"]["results"]
             logger.info(f"Found {len(results)} datasets for '{query}'")
+            SEARCH_CACHE.put(key, results, SEARCH_TTL)
             return results
         return None
     except Exception as e:
         logger.warning(f"CKAN API search failed: {e}")
+        if entry is not None:
+            logger.info(f"  Using cached results for '{query}'")
+            return entry.data
         return None
 
 
-def download_resource(resource_url: str, filename: str) -> Path | None:
-    """Download a CKAN resource file to data-raw/."""
+def _meta_path(target: Path) -> Path:
+    return target.with_name(target.name + META_SUFFIX)
+
+
+def _read_meta(target: Path) -> dict | None:
+    try:
+        return json.loads(_meta_path(target).read_text())
+    except (OSError, ValueError):
+        return None
+
+
+def _expected_digest(ckan_hash: str | None) -> tuple[str, str] | None:
+    """(algorithm, hex digest) from a CKAN resource hash such as "sha256:ab12.." or a bare hex digest."""
+    if not ckan_hash:
+        return None
+    algorithm, _, value = ckan_hash.strip().lower().rpartition(":")
+    algorithm = algorithm or _DIGEST_LENGTHS.get(len(value), "")
+    if algorithm not in hashlib.algorithms_available or not re.fullmatch(r"[0-9a-f]+", value):
+        return None
+    return algorithm, value
+
+
+def _digests(path: Path, extra: str | None = None) -> dict[str, str]:
+    """SHA-256 (plus `extra`, e.g. md5) of a file, read in chunks."""
+    hashers = {"sha256": hashlib.sha256()}
+    if extra and extra != "sha256":
+        hashers[extra] = hashlib.new(extra)
+    with open(path, "rb") as f:
+        while chunk := f.read(CHUNK_SIZE):
+            for hasher in hashers.values():
+                hasher.update(chunk)
+    return {name: hasher.hexdigest() for name, hasher in hashers.items()}
+
+
+def is_complete(target: Path) -> bool:
+    """True when `target` matches the size and SHA-256 recorded in its sidecar."""
+    meta = _read_meta(target)
+    if not target.exists() or not meta or meta.get("sha256") is None:
+        return False
+    if target.stat().st_size != meta.get("size"):
+        return False
+    return _digests(target)["sha256"] == meta["sha256"]
+
+
+def _total_size(resp: requests.Response) -> int | None:
+    match = _CONTENT_RANGE.fullmatch(resp.headers.get("Content-Range", ""))
+    if match:
+        return int(match.group(1))
+    length = resp.headers.get("Content-Length")
+    return int(length) if length and resp.status_code == 200 else None
+
+
+def _fetch_part(url: str, part: Path, meta: dict) -> int | None:
+    """
+    Stream `url` into `part`, resuming from the bytes already there.
+
+    Updates meta's validators and returns the file's total size when the
+    server reports it.
+    """
+    offset = part.stat().st_size if part.exists() else 0
+    # Ranges count bytes as sent, so the body must not be content-encoded
+    headers = {"Accept-Encoding": "identity"}
+    if offset:
+        headers["Range"] = f"bytes={offset}-"
+        if meta.get("etag"):
+            headers["If-Range"] = meta["etag"]
+    resp = http_client.get(url, headers=headers, timeout=DOWNLOAD_TIMEOUT, stream=True)
+    with resp:
+        if resp.status_code == 416 and offset:  # nothing left to fetch
+            return _total_size(resp)
+        resp.raise_for_status()
+        total = _total_size(resp)
+        if resp.status_code == 206:
+            logger.info(f"  Resuming {part.name} at {offset:,} bytes")
+            mode = "ab"
+        else:  # full body: no range support, or the file changed
+            mode = "wb"
+        meta.update(etag=resp.headers.get("ETag"), last_modified=resp.headers.get("Last-Modified"))
+        _meta_path(part).write_text(json.dumps(meta))
+        with open(part, mode) as f:
+            for chunk in resp.iter_content(chunk_size=CHUNK_SIZE):
+                f.write(chunk)
+    return total
+
+
+def download_resource(
+    resource_url: str,
+    filename: str,
+    expected_size: int | None = None,
+    expected_hash: str | None = None,
+) -> Path | None:
+    """
+    Download a CKAN resource file to data-raw/, resuming partial downloads.
+
+    Args:
+        expected_size: The resource's published size in bytes, if any.
+        expected_hash: The resource's published hash ("sha256:<hex>",
+            "md5:<hex>" or a bare hex digest), if any.
+    """
+    if filename != Path(filename).name or filename.startswith("."):
+        raise ValueError(f"Unsafe download filename: {filename!r}")
     DATA_RAW_DIR.mkdir(parents=True, exist_ok=True)
     target = DATA_RAW_DIR / filename
+    with open(DATA_RAW_DIR / f".{filename}.lock", "w") as lock:
+        fcntl.flock(lock, fcntl.LOCK_EX)
+        return _download_locked(resource_url, target, expected_size, expected_hash)
+
+
+def _download_locked(
+    resource_url: str, target: Path, expected_size: int | None, expected_hash: str | None
+) -> Path | None:
+    """download_resource() for a target whose lock is held."""
+    filename = target.name
     if target.exists():
-        logger.info(f"Already downloaded: {filename}")
-        return target
+        if is_complete(target):
+            logger.info(f"Already downloaded: {filename}")
+            return target
+        logger.warning(f"{filename} does not match its sidecar, downloading again")
+        target.unlink()
+        _meta_path(target).unlink(missing_ok=True)
+    if cache_mode() == "offline":
+        logger.warning(f"Not downloading {filename} (offline mode)")
+        return None
+
+    part = target.with_name(target.name + PART_SUFFIX)
+    meta = _read_meta(part) or {}
+    if meta.get("url") != resource_url:  # a partial file from another resource
+        part.unlink(missing_ok=True)
+        meta = {"url": resource_url}
+    start = time.perf_counter()
     try:
-        resp = requests.get(resource_url, timeout=30, stream=True)
-        resp.raise_for_status()
-        with open(target, "wb") as f:
-            for chunk in resp.iter_content(chunk_size=8192):
-                f.write(chunk)
-        logger.info(f"Downloaded: {filename}")
-        return target
+        for attempt in range(1, RESUME_ATTEMPTS + 1):
+            interrupted = False
+            try:
+                total = _fetch_part(resource_url, part, meta)
+            except (requests.exceptions.ConnectionError, requests.exceptions.ChunkedEncodingError) as e:
+                total, interrupted = None, True
+                logger.info(f"  Download of {filename} interrupted ({attempt}/{RESUME_ATTEMPTS}): {e}")
+            size = part.stat().st_size if part.exists() else 0
+            # Without a reported size, a body that arrived without error is complete
+            if (total is None and not interrupted) or size == total:
+                break
+            if total is not None and size > total:
+                part.unlink()  # cannot be a prefix of this file
+        else:
+            raise ValueError(f"incomplete after {RESUME_ATTEMPTS} attempts")
+
+        expected = _expected_digest(expected_hash)
+        digests = _digests(part, expected[0] if expected else None)
+        if expected_size is not None and size != int(expected_size):
+            raise ValueError(f"size {size:,} does not match the published {int(expected_size):,}")
+        if expected and digests[expected[0]] != expected[1]:
+            raise ValueError(f"{expected[0]} does not match the published hash")
     except Exception as e:
         logger.warning(f"Download failed for {filename}: {e}")
+        if isinstance(e, ValueError):  # bad bytes: do not resume from them
+            part.unlink(missing_ok=True)
+            _meta_path(part).unlink(missing_ok=True)
         return None
 
+    meta.update(size=size, sha256=digests["sha256"], downloaded=time.time())
+    try:
+        part.replace(target)
+        _meta_path(target).write_text(json.dumps(meta))
+    except OSError as e:
+        # Another writer got there first (one not taking the lock)
+        if is_complete(target):
+            logger.info(f"Already downloaded: {filename}")
+            return target
+        logger.warning(f"Download failed for {filename}: {e}")
+        return None
+    _meta_path(part).unlink(missing_ok=True)
+    elapsed = time.perf_counter() - start
+    logger.info(f"Downloaded: {filename} ({size:,} bytes in {elapsed:.2f}s)")
+    return target
+
+
+def _safe_stem(name: str) -> str:
+    """A CKAN resource name as a filename stem: no separators, "..", spaces or leading dots."""
+    stem = _UNSAFE_NAME.sub("_", name)[:MAX_NAME_LENGTH].strip("._-")
+    return stem if stem.replace(".", "") else "budget_data"
 
-def fetch_budget_data() -> dict | None:
+
+def _candidates(results: list[list[dict] | None]) -> list[dict]:
+    """CSV/Excel resources in query, dataset and resource order, each URL once, with unique filenames."""
+    seen: set[str] = set()
+    filenames: set[str] = set()
+    candidates = []
+    for datasets in results:
+        for dataset in datasets or []:
+            for resource in dataset.get("resources", []):
+                fmt = (resource.get("format") or "").lower()
+                url = resource.get("url")
+                if fmt not in FORMATS or not url or url in seen:
+                    continue
+                seen.add(url)
+                name = resource.get("name") or "budget_data"
+                stem = _safe_stem(name)
+                filename = f"{stem}.{fmt}"
+                if filename in filenames:
+                    filename = f"{stem}-{hashlib.sha256(url.encode()).hexdigest()[:8]}.{fmt}"
+                filenames.add(filename)
+                candidates.append({
+                    "dataset": dataset.get("title"),
+                    "resource": name,
+                    "url": url,
+                    "filename": filename,
+                    "format": fmt,
+                    "size": int(resource["size"]) if str(resource.get("size")).isdigit() else None,
+                    "hash": resource.get("hash"),
+                })
+    return candidates
+
+
+def fetch_budget_data(year: str = "2025-26") -> dict | None:
     """
-    Try to fetch Union Budget data from Open Budgets India.
+    Try to fetch Union Budget data for a fiscal year from Open Budgets India.
     Returns parsed dataset metadata if successful, None otherwise.
     """
     logger.info("Attempting to fetch data from Open Budgets India CKAN API...")
 
-    # Try multiple search queries
-    for query in [
-        "union budget 2025-26",
-        "union budget expenditure",
-        "union budget receipt",
-        "demand for grants",
-    ]:
-        results = search_datasets(query)
-        if results:
-            # Look for CSV/Excel resources
-            for dataset in results:
-                for resource in dataset.get("resources", []):
-                    fmt = (resource.get("format") or "").lower()
-                    if fmt in ("csv", "xlsx", "xls"):
-                        name = resource.get("name", "budget_data")
-                        url = resource.get("url")
-                        if url:
-                            path = download_resource(url, f"{name}.{fmt}")
-                            if path:
-                                return {
-                                    "dataset": dataset.get("title"),
-                                    "resource": name,
-                                    "path": str(path),
-                                    "format": fmt,
-                                }
+    queries = search_queries(year)
+    with ThreadPoolExecutor(max_workers=len(queries)) as pool:
+        results = list(pool.map(search_datasets, queries))
+
+    candidates = _candidates(results)[:MAX_DOWNLOADS]
+    if candidates:
+        with ThreadPoolExecutor(max_workers=DOWNLOAD_WORKERS) as pool:
+            paths = list(pool.map(
+                lambda c: download_resource(c["url"], c["filename"], c["size"], c["hash"]),
+                candidates,
+            ))
+        downloaded = [(c, path) for c, path in zip(candidates, paths) if path]
+        if downloaded:
+            # The best match is the first candidate that downloaded
+            best, path = downloaded[0]
+            return {
+                "dataset": best["dataset"],
+                "resource": best["resource"],
+                "path": str(path),
+                "format": best["format"],
+                "downloads": [str(p) for _, p in downloaded],
+            }
 
     logger.info("Could not fetch live data from CKAN API. Using curated data.")
     return None
@@ -39,6 +39,7 @@ from src.states.validate.schemas import (
     StatesIndicatorsData,
 )
 from src.publish.writer import publish_all
+from src.validate.engine import validate_outputs
 
 logging.basicConfig(
     level=logging.INFO,
@@ -48,20 +49,31 @@ logger = logging.getLogger("states-pipeline")
 
 SURVEY_YEAR = "2025-26"
 
+OUTPUT_DIR = f"states/{SURVEY_YEAR}"
+FLOAT_DECIMALS = 2  # published float precision; curated values carry at most 2 places
+
+# Output filename → Pydantic model, in validation order
+SCHEMAS = {
+    "summary.json": StatesSummary,
+    "gsdp.json": GSDPData,
+    "revenue.json": RevenueData,
+    "fiscal-health.json": FiscalHealthData,
+    "indicators.json": StatesIndicatorsData,
+}
 
-def run_states_pipeline():
-    logger.info("=" * 60)
-    logger.info(f"State Finances Data Pipeline — {SURVEY_YEAR}")
-    logger.info(f"Data vintage: {DATA_YEAR} (base year: {BASE_YEAR})")
-    logger.info("=" * 60)
 
-    # ── Stage 1: FETCH ──────────────────────────────────────────
+def fetch() -> dict:
+    """Stage 1: curated RBI Handbook tables (no API calls)."""
     logger.info("Stage 1: FETCH (curated data — no external API)")
     logger.info(f"  GSDP entries: {len(STATE_GSDP_DATA)}")
     logger.info(f"  Revenue entries: {len(STATE_REVENUE_DATA)}")
     logger.info(f"  Fiscal entries: {len(STATE_FISCAL_DATA)}")
 
-    # ── Stage 2: TRANSFORM ──────────────────────────────────────
+    return {}
+
+
+def transform(raw: dict) -> dict[str, dict]:
+    """Stage 2: build every output file, keyed by filename."""
     logger.info("Stage 2: TRANSFORM")
 
     gsdp_data = build_gsdp(STATE_GSDP_DATA, SURVEY_YEAR, BASE_YEAR, STATE_GSDP_HISTORY)
@@ -70,44 +82,47 @@ def run_states_pipeline():
     summary_data = _build_summary(STATE_GSDP_DATA)
     indicators_data = _build_indicators(STATE_GSDP_DATA, STATE_REVENUE_DATA, STATE_FISCAL_DATA)
 
-    # ── Stage 3: VALIDATE ──────────────────────────────────────
+    return {
+        "summary.json": summary_data,
+        "gsdp.json": gsdp_data,
+        "revenue.json": revenue_data,
+        "fiscal-health.json": fiscal_data,
+        "indicators.json": indicators_data,
+    }
+
+
+def validate(outputs: dict[str, dict]) -> list[str]:
+    """Stage 3: check each output against its Pydantic model. Returns error strings."""
     logger.info("Stage 3: VALIDATE")
-    errors = []
-
-    validations = [
-        ("summary.json", StatesSummary, summary_data),
-        ("gsdp.json", GSDPData, gsdp_data),
-        ("revenue.json", RevenueData, revenue_data),
-        ("fiscal-health.json", FiscalHealthData, fiscal_data),
-        ("indicators.json", StatesIndicatorsData, indicators_data),
-    ]
-
-    for name, model, data in validations:
-        try:
-            model(**data)
-            logger.info(f"  {name} ✓")
-        except Exception as e:
-            errors.append(f"{name}: {e}")
-            logger.error(f"  {name} FAILED: {e}")
+    return validate_outputs(outputs, SCHEMAS, decimals=FLOAT_DECIMALS).errors
+
+
+def publish(outputs: dict[str, dict]) -> list[Path]:
+    """Stage 4: write outputs under public/data/states/."""
+    logger.info("Stage 4: PUBLISH")
+    paths = publish_all(
+        {f"{OUTPUT_DIR}/{name}": data for name, data in outputs.items()}, decimals=FLOAT_DECIMALS
+    )
+    logger.info(f"Published {len(paths)} files")
+    return paths
+
+
+def run_states_pipeline():
+    logger.info("=" * 60)
+    logger.info(f"State Finances Data Pipeline — {SURVEY_YEAR}")
+    logger.info(f"Data vintage: {DATA_YEAR} (base year: {BASE_YEAR})")
+    logger.info("=" * 60)
 
+    outputs = transform(fetch())
+
+    errors = validate(outputs)
     if errors:
         logger.error(f"Validation failed with {len(errors)} error(s):")
         for err in errors:
             logger.error(f"  - {err}")
         sys.exit(1)
 
-    # ── Stage 4: PUBLISH ──────────────────────────────────────
-    logger.info("Stage 4: PUBLISH")
-    outputs = {
-        f"states/{SURVEY_YEAR}/summary.json": summary_data,
-        f"states/{SURVEY_YEAR}/gsdp.json": gsdp_data,
-        f"states/{SURVEY_YEAR}/revenue.json": revenue_data,
-        f"states/{SURVEY_YEAR}/fiscal-health.json": fiscal_data,
-        f"states/{SURVEY_YEAR}/indicators.json": indicators_data,
-    }
-
-    paths = publish_all(outputs)
-    logger.info(f"Published {len(paths)} files")
+    publish(outputs)
 
     logger.info("=" * 60)
     logger.info("State Finances pipeline complete!")
@@ -210,12 +210,14 @@ def build_budget_trends(year: str) -> dict:
     """
     Build trends.json from curated 20-year Budget at a Glance data.
 
-    Returns the full series sorted by year, with source attribution.
+    Returns the series up to and including `year`, sorted by year, with
+    source attribution.
     """
-    logger.info(f"  trends.json: {len(BUDGET_TRENDS_SERIES)} years of budget data")
+    series = [row for row in BUDGET_TRENDS_SERIES if row["year"] <= year]
+    logger.info(f"  trends.json: {len(series)} years of budget data")
 
     return {
         "year": year,
-        "series": BUDGET_TRENDS_SERIES,
+        "series": series,
         "source": "https://indiabudget.gov.in/ — Budget at a Glance (various years)",
     }
@@ -164,14 +164,27 @@ MINISTRY_DATA: list[dict] = [
 ]
 
 
+def covers_year(year: str) -> bool:
+    """True when the curated data has figures for `year`'s budget."""
+    return any(h["year"] == year for m in MINISTRY_DATA for h in m["history"])
+
+
 def build_budget_vs_actual(year: str) -> dict:
     """
     Build budget-vs-actual.json from curated ministry-level data.
 
-    Returns ministry list with BE/RE/Actual history, sorted by latest BE descending.
+    Returns the ministries with a BE for `year`, their history cut off at
+    `year` (an archive year must not show later budgets), sorted by that
+    year's BE descending. Check covers_year(year) first: without figures for the
+    year the list is empty.
     """
+    ministries = []
+    for m in MINISTRY_DATA:
+        history = [h for h in m["history"] if h["year"] <= year]
+        if history and history[-1]["year"] == year:
+            ministries.append({**m, "history": history})
     sorted_ministries = sorted(
-        MINISTRY_DATA,
+        ministries,
         key=lambda m: m["history"][-1]["be"],
         reverse=True,
     )
@@ -1,7 +1,17 @@
 """
 Derived metrics: % of total, YoY change, per-capita, human context strings.
+
+Each scalar helper has a column version (*_array) that takes whole
+pandas/NumPy columns and gives the same numbers, rounding included: values
+that land exactly on a rounding boundary are re-rounded with Python's
+round(), so binary error in the scaled value can't flip them. Where the
+scalar helper returns None, the array version holds NaN; to_records()
+turns those back into None.
 """
 
+import numpy as np
+import pandas as pd
+
 POPULATION = 1_450_000_000  # 2025 estimate
 
 
@@ -32,6 +42,49 @@ def per_capita_daily(amount_crore: float, population: int = POPULATION) -> float
     return round(yearly / 365, 2)
 
 
+def round_like_python(values, ndigits: int = 0) -> np.ndarray:
+    """Element-wise round(x, ndigits) — np.round, with round() for exact-half ties."""
+    values = np.asarray(values, dtype=np.float64)
+    rounded = np.round(values, ndigits)
+    scaled = values * 10.0**ndigits
+    fraction = np.abs(scaled - np.trunc(scaled))
+    with np.errstate(invalid="ignore"):
+        ties = np.abs(fraction - 0.5) < 1e-9 * np.maximum(1.0, np.abs(scaled))
+    for i in np.flatnonzero(ties):
+        rounded[i] = round(float(values[i]), ndigits)
+    return rounded
+
+
+def percent_of_total_array(amounts, total: float) -> np.ndarray:
+    """percent_of_total() for a column of amounts."""
+    amounts = np.asarray(amounts, dtype=np.float64)
+    if total == 0:
+        return np.zeros_like(amounts)
+    return round_like_python(amounts / total * 100, 1)
+
+
+def yoy_change_array(current, previous) -> np.ndarray:
+    """yoy_change() for two columns; NaN where there is no previous value (or it is 0)."""
+    current = np.asarray(current, dtype=np.float64)
+    previous = pd.to_numeric(pd.Series(previous, dtype=object), errors="coerce").to_numpy(np.float64)
+    missing = np.isnan(previous) | (previous == 0)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        change = round_like_python((current - previous) / previous * 100, 1)
+    change[missing] = np.nan
+    return change
+
+
+def per_capita_array(amounts_crore, population=POPULATION) -> np.ndarray:
+    """per_capita() for a column of amounts (population may be a column too)."""
+    total_rs = np.asarray(amounts_crore, dtype=np.float64) * 1e7
+    return round_like_python(total_rs / np.asarray(population, dtype=np.float64), 0)
+
+
+def to_records(frame: pd.DataFrame) -> list[dict]:
+    """DataFrame rows as plain dicts of Python values, NaN → None."""
+    return frame.astype(object).where(frame.notna(), None).to_dict("records")
+
+
 # Human context generators for specific ministries
 HUMAN_CONTEXTS: dict[str, callable] = {}
 
@@ -1,9 +1,38 @@
 """
 Ministry name normalization.
 Handles abbreviations commonly found in budget documents.
+
+The abbreviation table is compiled once into a single alternation, so a
+name is expanded in one regex pass. Unlike the old one-re.sub-per-entry
+loop, an expansion cannot hide a later abbreviation glued to it ("Dept.MoRD"
+now expands both); names with spaces between words normalize as before.
+normalize_ministry_names() does the same for a pandas Series, normalizing
+each distinct name once — budget-head tables repeat a few dozen ministry
+names across thousands of rows.
+
+MinistryIndex resolves raw ministry/department strings to the canonical ids
+used in published data (e.g. "rural-development", "consumer-affairs"):
+an exact lookup on the normalized name with filler words dropped, else the
+best fuzzy match over every canonical name and alias. Words are paired by
+character-trigram similarity (Dice coefficient, from an inverted index over
+the alias vocabulary) and weighted by how few ministries use them, so
+"affairs" or "development" count for little and "Urban Development" does
+not pass for "Rural Development". A short word no alias uses also pairs
+with consecutive alias words it spells the initials of, so "Agriculture,
+Cooperation & FW" finds "... Farmers Welfare" and "Health & FW" finds
+"Health & Family Welfare". A fuzzy match must also pair a word that names
+only that ministry. Each result carries its score as its confidence;
+matches below the threshold resolve to no id.
 """
 
+import math
 import re
+from collections import Counter
+from dataclasses import dataclass
+from itertools import chain
+
+import numpy as np
+import pandas as pd
 
 # Common abbreviations in Indian budget documents
 ABBREVIATIONS = {
@@ -25,15 +54,39 @@ ABBREVIATIONS = {
     r"\bGovt\.\b": "Government",
 }
 
+# One alternation, earlier entries winning where two match at the same place.
+# Every entry is \b plus a literal first character, so the shared \b and a
+# lookahead on those characters let the scan skip most positions outright.
+_FIRST_CHARS = "".join(sorted({re.escape(p[2]) for p in ABBREVIATIONS}))
+_ABBREVIATION_RE = re.compile(
+    rf"\b(?=[{_FIRST_CHARS}])(?:" + "|".join(f"(?P<a{i}>{p[2:]})" for i, p in enumerate(ABBREVIATIONS)) + ")"
+)
+_EXPANSIONS = {f"a{i}": r for i, r in enumerate(ABBREVIATIONS.values())}
+_SPACES_RE = re.compile(r"\s+")
+
+
+def _expand(match: re.Match) -> str:
+    return _EXPANSIONS[match.lastgroup]
+
 
 def normalize_ministry_name(name: str) -> str:
     """Expand abbreviations and clean up ministry names."""
-    result = name.strip()
-    for pattern, replacement in ABBREVIATIONS.items():
-        result = re.sub(pattern, replacement, result)
+    result = _ABBREVIATION_RE.sub(_expand, name.strip())
     # Collapse multiple spaces
-    result = re.sub(r"\s+", " ", result).strip()
-    return result
+    return _SPACES_RE.sub(" ", result).strip()
+
+
+def _per_distinct(names: pd.Series, fn) -> tuple[np.ndarray, list]:
+    """Factorize `names` and apply `fn` to each distinct value: (codes, results)."""
+    codes, uniques = pd.factorize(names)
+    return codes, [fn(str(name)) for name in uniques]
+
+
+def normalize_ministry_names(names: pd.Series) -> pd.Series:
+    """normalize_ministry_name over a Series; missing values stay missing."""
+    codes, normalized = _per_distinct(names, normalize_ministry_name)
+    values = np.array([*normalized, None], dtype=object)[codes]  # code -1 → None
+    return pd.Series(values, index=names.index, name=names.name)
 
 
 def slugify(name: str) -> str:
@@ -43,3 +96,187 @@ def slugify(name: str) -> str:
     s = re.sub(r"[\s]+", "-", s)
     s = re.sub(r"-+", "-", s)
     return s.strip("-")
+
+
+# ─── Canonical ministries ────────────────────────────────────────
+# id → canonical name, then aliases seen in budget documents (and the short
+# ministryName labels of schemes.json). Ids match the ministry ids in
+# expenditure.json / schemes.json.
+CANONICAL_MINISTRIES: dict[str, tuple[str, ...]] = {
+    "interest-payments": ("Interest Payments",),
+    "defence": ("Ministry of Defence", "Defence Services", "Defence Pensions"),
+    "rural-development": (
+        "Ministry of Rural Development", "Department of Rural Development", "Department of Land Resources",
+    ),
+    "agriculture": (
+        "Ministry of Agriculture & Farmers Welfare", "Department of Agriculture and Farmers Welfare",
+        "Department of Agriculture, Cooperation & Farmers Welfare",
+        "Department of Agricultural Research and Education", "Agriculture",
+    ),
+    "education": (
+        "Ministry of Education", "Department of School Education and Literacy",
+        "Department of Higher Education", "Ministry of Human Resource Development",
+    ),
+    "health": (
+        "Ministry of Health & Family Welfare", "Department of Health and Family Welfare",
+        "Department of Health Research", "Health",
+    ),
+    "railways": ("Ministry of Railways",),
+    "home-affairs": ("Ministry of Home Affairs", "Police"),
+    "road-transport": ("Ministry of Road Transport & Highways",),
+    "transfers-to-states": ("Transfers to States & UTs", "Transfers to States"),
+    "subsidies": ("Subsidies (Food, Fertilizer, Fuel)",),
+    "consumer-affairs": (
+        "Ministry of Consumer Affairs, Food & Public Distribution",
+        "Department of Food & Public Distribution", "Department of Consumer Affairs",
+    ),
+    "housing-urban": ("Ministry of Housing & Urban Affairs", "Ministry of Urban Development"),
+    "finance": (
+        "Ministry of Finance", "Department of Economic Affairs", "Department of Expenditure",
+        "Department of Revenue",
+    ),
+}
+
+# Words that say what kind of body it is, not which one (with abbreviations
+# the table leaves alone, e.g. "Dept. of" where no word follows the dot)
+FILLER_WORDS = frozenset({
+    "ministry", "department", "of", "the", "and", "for", "government", "india", "union",
+    "min", "dept", "deptt", "govt",
+})
+MATCH_THRESHOLD = 0.6
+TOKEN_MATCH = 0.5  # word similarity at which a distinctive alias word counts as present
+MAX_ACRONYM = 4  # longest unknown word tried as the initials of alias words
+ACRONYM_MATCH = 0.9  # similarity of an acronym to the words it spells (below 1: never an exact match)
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_INITIALS_RE = re.compile(r"\b(?:[a-z]\.){2,}")
+
+
+def match_key(name: str) -> str:
+    """
+    Normalized, lowercased name without filler words: "M/o Rural Devt." →
+    "rural devt". Dotted initials are joined into one word ("F.W." → "fw").
+    """
+    text = _INITIALS_RE.sub(lambda m: m.group().replace(".", ""), normalize_ministry_name(name).lower())
+    tokens = _TOKEN_RE.findall(text)
+    return " ".join(t for t in tokens if t not in FILLER_WORDS)
+
+
+def _trigrams(key: str) -> set[str]:
+    padded = f"  {key} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def _idf(used_by: int, total: int) -> float:
+    """Smoothed inverse document frequency of a word used by `used_by` of `total` ministries."""
+    return math.log((total + 1) / (used_by + 1)) + 1
+
+
+@dataclass(frozen=True)
+class MinistryMatch:
+    id: str | None
+    name: str | None  # canonical name
+    confidence: float
+
+
+class MinistryIndex:
+    """Exact and trigram lookup of ministry names → canonical ids."""
+
+    def __init__(
+        self,
+        ministries: dict[str, tuple[str, ...]] = CANONICAL_MINISTRIES,
+        threshold: float = MATCH_THRESHOLD,
+    ):
+        self.threshold = threshold
+        self.names = {ministry_id: names[0] for ministry_id, names in ministries.items()}
+        self.exact: dict[str, str] = {}
+        self.entries: list[tuple[str, tuple[str, ...]]] = []  # (ministry id, words) per alias
+        self.by_word: dict[str, list[int]] = {}  # word → aliases using it
+        used_by: dict[str, set[str]] = {}
+        for ministry_id, names in ministries.items():
+            for name in names:
+                key = match_key(name)
+                if key in self.exact:
+                    continue
+                self.exact[key] = ministry_id
+                words = tuple(dict.fromkeys(key.split()))
+                for word in words:
+                    self.by_word.setdefault(word, []).append(len(self.entries))
+                    used_by.setdefault(word, set()).add(ministry_id)
+                self.entries.append((ministry_id, words))
+        self.weights = {word: _idf(len(ids), len(ministries)) for word, ids in used_by.items()}
+        self.unknown_weight = _idf(0, len(ministries))  # a word no alias uses is as telling as any
+        self.distinctive = frozenset(word for word, ids in used_by.items() if len(ids) == 1)
+        self.word_grams = {word: len(_trigrams(word)) for word in used_by}
+        self.postings: dict[str, list[str]] = {}  # trigram → vocabulary words
+        for word in used_by:
+            for gram in _trigrams(word):
+                self.postings.setdefault(gram, []).append(word)
+
+    def _similar(self, word: str) -> dict[str, float]:
+        """Dice coefficient of `word` against every vocabulary word sharing a trigram with it."""
+        grams = _trigrams(word)
+        shared = Counter(chain.from_iterable(self.postings.get(gram, ()) for gram in grams))
+        return {other: 2 * count / (len(grams) + self.word_grams[other]) for other, count in shared.items()}
+
+    def _acronym_at(self, query_word: str, words: tuple[str, ...]) -> int | None:
+        """Where `query_word` spells the initials of consecutive alias words ("fw" → "farmers welfare")."""
+        if not (2 <= len(query_word) <= MAX_ACRONYM and query_word.isalpha()) or query_word in self.weights:
+            return None
+        start = "".join(word[0] for word in words).find(query_word)
+        return start if start >= 0 else None
+
+    def _score(self, similar: dict[str, dict[str, float]], entry: int) -> float:
+        """Weighted Dice of the query words against one alias; 0 unless a distinctive word pairs up."""
+        words = self.entries[entry][1]
+        query_sims = {query_word: max(sims.get(word, 0.0) for word in words) for query_word, sims in similar.items()}
+        word_sims = [max(sims.get(word, 0.0) for sims in similar.values()) for word in words]
+        for query_word in similar:
+            start = self._acronym_at(query_word, words)
+            if start is not None:
+                query_sims[query_word] = max(query_sims[query_word], ACRONYM_MATCH)
+                spelled = slice(start, start + len(query_word))
+                word_sims[spelled] = [max(sim, ACRONYM_MATCH) for sim in word_sims[spelled]]
+        matched = total = 0.0
+        for query_word, sim in query_sims.items():
+            weight = self.weights.get(query_word, self.unknown_weight)
+            matched += weight * sim
+            total += weight
+        distinctive = False
+        for word, sim in zip(words, word_sims):
+            matched += self.weights[word] * sim
+            total += self.weights[word]
+            distinctive = distinctive or (sim >= TOKEN_MATCH and word in self.distinctive)
+        return matched / total if distinctive else 0.0
+
+    def resolve(self, name: str) -> MinistryMatch:
+        key = match_key(name)
+        ministry_id = self.exact.get(key)
+        if ministry_id is not None:
+            return MinistryMatch(ministry_id, self.names[ministry_id], 1.0)
+        similar = {word: self._similar(word) for word in dict.fromkeys(key.split())}
+        candidates = {entry for sims in similar.values() for word in sims for entry in self.by_word[word]}
+        if not candidates:
+            return MinistryMatch(None, None, 0.0)
+        # Highest score; ties go to the earlier alias
+        best, score = max(
+            ((entry, self._score(similar, entry)) for entry in candidates),
+            key=lambda item: (item[1], -item[0]),
+        )
+        score = round(score, 3)
+        if score < self.threshold:
+            return MinistryMatch(None, None, score)
+        ministry_id = self.entries[best][0]
+        return MinistryMatch(ministry_id, self.names[ministry_id], score)
+
+    def resolve_many(self, names: pd.Series) -> pd.DataFrame:
+        """id, canonical name and confidence for every row of `names` (each distinct name resolved once)."""
+        codes, matches = _per_distinct(names, self.resolve)
+        matches.append(MinistryMatch(None, None, 0.0))  # code -1: missing name
+        return pd.DataFrame(
+            {
+                "id": np.array([m.id for m in matches], dtype=object)[codes],
+                "name": np.array([m.name for m in matches], dtype=object)[codes],
+                "confidence": np.array([m.confidence for m in matches], dtype=np.float64)[codes],
+            },
+            index=names.index,
+        )
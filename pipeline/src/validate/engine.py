@@ -0,0 +1,201 @@
+"""
+Shared VALIDATE engine for every domain pipeline.
+
+Each output is serialized exactly as the writer will publish it
+(src/publish/writer.py serialize(), same JSON mode) and those bytes are
+validated with the model's TypeAdapter.validate_json — so what passes
+validation is byte for byte what lands in public/data, and pydantic-core
+parses the JSON itself instead of walking Python dicts built by hand.
+TypeAdapters are built once per model and reused. Files are validated on a
+thread pool and the result is a ValidationReport with per-file timings.
+
+With PIPELINE_VALIDATION_CACHE=1, passing results are cached on disk
+(pipeline/.cache/validation/) keyed by the SHA-256 of the payload and a
+fingerprint of the model: its name plus the bytes of every source file
+defining it or a model it nests (each file hashed once per process, well
+under a millisecond), so editing a field, constraint or validator
+invalidates the model's entries, and unchanged outputs skip validation.
+The cache is off by default: today's outputs validate in a few
+milliseconds per domain, and src/bench_validate.py shows a warm cache
+only breaks even with validating (a cold one costs about twice as much).
+Turn it on if outputs grow to where validation dominates.
+
+Usage in a domain's validate stage:
+
+  report = validate_outputs(outputs, SCHEMAS, decimals=FLOAT_DECIMALS)
+  return report.errors
+"""
+
+import hashlib
+import logging
+import os
+import sys
+import time
+import typing
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from functools import cache
+from pathlib import Path
+
+import pydantic
+from pydantic import BaseModel, TypeAdapter, ValidationError
+
+from src.common.cache import CACHE_ROOT, DiskCache
+from src.publish import writer
+
+logger = logging.getLogger(__name__)
+
+VALIDATE_WORKERS = 4
+VALIDATION_CACHE_ENV = "PIPELINE_VALIDATION_CACHE"
+CACHE = DiskCache(CACHE_ROOT / "validation", max_bytes=5 * 1024 * 1024)
+
+
+@cache
+def adapter_for(model: type[BaseModel]) -> TypeAdapter:
+    """Compiled validator for a model, built on first use."""
+    return TypeAdapter(model)
+
+
+def _nested_models(model: type[BaseModel]) -> list[type[BaseModel]]:
+    """The model, its model bases and every model reachable through its field annotations."""
+    seen: dict[type, None] = {}
+    stack: list[typing.Any] = [model]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, type) and issubclass(item, BaseModel) and item is not BaseModel:
+            if item in seen:
+                continue
+            seen[item] = None
+            stack.extend(item.__bases__)
+            stack.extend(f.annotation for f in item.model_fields.values())
+        else:
+            stack.extend(typing.get_args(item))
+    return sorted(seen, key=lambda cls: f"{cls.__module__}.{cls.__qualname__}")
+
+
+@cache
+def _module_digest(module_name: str) -> str:
+    """SHA-256 of a module's source file; its name when it has none."""
+    module = sys.modules.get(module_name)
+    try:
+        return hashlib.sha256(Path(module.__file__).read_bytes()).hexdigest()
+    except (AttributeError, TypeError, OSError):  # built-in, dynamic or missing module
+        return module_name
+
+
+@cache
+def schema_fingerprint(model: type[BaseModel]) -> str:
+    """Changes whenever the model (or any model it nests) is edited."""
+    digest = hashlib.sha256(pydantic.VERSION.encode())
+    for cls in _nested_models(model):
+        digest.update(f"{cls.__module__}.{cls.__qualname__}".encode())
+        digest.update(_module_digest(cls.__module__).encode())
+    return digest.hexdigest()
+
+
+def cache_enabled() -> bool:
+    return os.environ.get(VALIDATION_CACHE_ENV, "").strip().lower() in ("1", "true", "yes")
+
+
+@dataclass
+class FileResult:
+    name: str
+    model: str
+    seconds: float
+    size: int
+    error: str | None = None
+    cached: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+@dataclass
+class ValidationReport:
+    results: list[FileResult] = field(default_factory=list)
+    wall: float = 0.0
+
+    @property
+    def errors(self) -> list[str]:
+        return [f"{r.name}: {r.error}" for r in self.results if not r.ok]
+
+    @property
+    def seconds(self) -> float:
+        """Sum of per-file validation time."""
+        return sum(r.seconds for r in self.results)
+
+    def log(self) -> None:
+        for r in self.results:
+            if r.cached:
+                logger.info(f"  {r.name} ✓ (unchanged, cached)")
+            elif r.ok:
+                logger.info(f"  {r.name} ✓ ({r.size:,} bytes, {r.seconds * 1000:.1f} ms)")
+            else:
+                logger.error(f"  {r.name} FAILED: {r.error}")
+        cached = sum(r.cached for r in self.results)
+        logger.info(
+            f"  Validated {len(self.results)} file(s) in {self.wall * 1000:.1f} ms "
+            f"(sum {self.seconds * 1000:.1f} ms, {cached} cached, {len(self.errors)} failed)"
+        )
+
+
+def validate_payload(
+    name: str, model: type[BaseModel], payload: bytes, use_cache: bool | None = None
+) -> FileResult:
+    """Validate one serialized output against its model, skipping known-good payloads."""
+    use_cache = cache_enabled() if use_cache is None else use_cache
+    start = time.perf_counter()
+    key = None
+    if use_cache:
+        key = DiskCache.key(hashlib.sha256(payload).hexdigest(), schema_fingerprint(model))
+        if CACHE.get(key) is not None:
+            return FileResult(name, model.__name__, time.perf_counter() - start, len(payload), cached=True)
+    error = None
+    try:
+        adapter_for(model).validate_json(payload)
+    except ValidationError as e:
+        error = str(e)
+    if key is not None and error is None:
+        CACHE.put(key, {"model": f"{model.__module__}.{model.__qualname__}"}, ttl=float("inf"))
+    return FileResult(name, model.__name__, time.perf_counter() - start, len(payload), error)
+
+
+def validate_outputs(
+    outputs: dict[str, dict],
+    schemas: dict[str, type[BaseModel]],
+    label: Callable[[str], str] | None = None,
+    max_workers: int = VALIDATE_WORKERS,
+    decimals: int = writer.FLOAT_DECIMALS,
+) -> ValidationReport:
+    """
+    Validate every output that has a schema, concurrently.
+
+    Args:
+        outputs: output key → data, as returned by the domain's transform().
+        schemas: output key → Pydantic model. A schema whose output is
+            missing is reported as a failure.
+        label: Maps an output key to the name used in logs and errors
+            (default: the key itself).
+        decimals: The float precision the outputs are published with.
+    """
+    label = label or (lambda key: key)
+    mode = writer.json_mode()
+
+    def run(item: tuple[str, type[BaseModel]]) -> FileResult:
+        key, model = item
+        if key not in outputs:
+            return FileResult(label(key), model.__name__, 0.0, 0, "output missing")
+        try:
+            payload = writer.serialize(outputs[key], mode, decimals=decimals)
+        except (TypeError, ValueError) as e:  # not JSON-serializable: would fail to publish too
+            return FileResult(label(key), model.__name__, 0.0, 0, f"cannot serialize: {e}")
+        return validate_payload(label(key), model, payload)
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        results = list(pool.map(run, schemas.items()))
+    report = ValidationReport(results, time.perf_counter() - start)
+    report.log()
+    return report
@@ -0,0 +1,153 @@
+"""
+Tests for per-year budget inputs and the multi-year stages in src/main.py.
+Archive years are written as prepared inputs to a temporary data-raw/ directory.
+"""
+
+import json
+from pathlib import Path
+
+import pandas as pd
+import pytest
+from openpyxl import Workbook
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import main
+from src.extract import csv_parser
+from src.publish import writer
+
+
+@pytest.fixture(autouse=True)
+def dirs(monkeypatch, tmp_path):
+    monkeypatch.setattr(csv_parser, "INPUTS_DIR", tmp_path / "data-raw")
+    monkeypatch.setattr(writer, "DATA_DIR", tmp_path / "data")
+    monkeypatch.delenv(writer.HASHED_NAMES_ENV, raising=False)
+    return tmp_path
+
+
+def write_year(year: str) -> Path:
+    """Prepared inputs for `year`: the curated tables, relabelled."""
+    inputs = csv_parser.load_year_inputs(csv_parser.CURATED_YEAR)
+    directory = csv_parser.INPUTS_DIR / year
+    directory.mkdir(parents=True)
+    (directory / "summary.json").write_text(json.dumps({**inputs["summary"], "year": year}))
+    for name in csv_parser.YEAR_TABLES:
+        inputs[name].to_csv(directory / f"{name}.csv", index=False)
+    return directory
+
+
+class TestInputs:
+    def test_prepared_year_matches_curated_tables(self):
+        write_year("2019-20")
+        loaded = csv_parser.load_year_inputs("2019-20")
+        curated = csv_parser.load_year_inputs(csv_parser.CURATED_YEAR)
+        assert loaded["summary"]["year"] == "2019-20"
+        for name in csv_parser.YEAR_TABLES:
+            pd.testing.assert_frame_equal(loaded[name], curated[name], check_dtype=False, check_categorical=False)
+        assert loaded["expenditure"]["name"].dtype == "category"
+        assert loaded["expenditure"]["budget_estimate"].dtype == "int64"
+
+    def test_ministry_names_resolve_to_canonical_ids(self):
+        directory = write_year("2016-17")
+        expenditure = pd.read_csv(directory / "expenditure.csv", keep_default_na=False)
+        expenditure.loc[2, ["id", "name"]] = ["ministry-of-rural-development", "M/o Rural Devpt."]
+        expenditure.loc[3, ["id", "name"]] = ["", "Department of Agriculture, Cooperation & FW"]
+        expenditure.loc[5, "name"] = "Dept. of Health and F.W."
+        expenditure.loc[len(expenditure)] = ["coal", "Ministry of Coal", 500, 400, "[]"]
+        expenditure.to_csv(directory / "expenditure.csv", index=False)
+        schemes = pd.read_csv(directory / "schemes.csv", keep_default_na=False)
+        schemes.loc[0, "ministry"] = "ministry-of-rural-development"  # MGNREGA
+        schemes.loc[1, "ministry"] = ""  # PM-KISAN, ministryName "Agriculture"
+        schemes.to_csv(directory / "schemes.csv", index=False)
+
+        loaded = csv_parser.load_year_inputs("2016-17")
+        rows = loaded["expenditure"].set_index("id")["name"]
+        assert rows["rural-development"] == "Ministry of Rural Development"
+        assert rows["agriculture"] == "Ministry of Agriculture & Farmers Welfare"
+        assert rows["health"] == "Ministry of Health & Family Welfare"
+        assert rows["coal"] == "Ministry of Coal"  # not a canonical ministry: kept as given
+        assert loaded["schemes"]["ministry"].tolist()[:2] == ["rural-development", "agriculture"]
+
+    def test_unrecognized_ministry_without_id(self):
+        directory = write_year("2016-17")
+        with open(directory / "expenditure.csv", "a") as f:
+            f.write(",Ministry of Coal,500,400,[]\n")
+        with pytest.raises(ValueError, match="Ministry of Coal"):
+            csv_parser.load_year_inputs("2016-17")
+
+    def test_input_years(self):
+        write_year("2019-20")
+        (csv_parser.INPUTS_DIR / "notes").mkdir()
+        assert csv_parser.input_years() == ["2019-20", "2025-26"]
+
+    def test_missing_year_and_column(self):
+        with pytest.raises(FileNotFoundError):
+            csv_parser.load_year_inputs("2010-11")
+        directory = write_year("2019-20")
+        (directory / "schemes.csv").write_text("id,name\nx,y\n")
+        with pytest.raises(ValueError, match="allocation"):
+            csv_parser.load_year_inputs("2019-20")
+
+    def test_workbook_without_expected_headers(self):
+        directory = write_year("2019-20")
+        (directory / "statewise.csv").unlink()
+        workbook = Workbook()
+        workbook.active.append(["State ID", "State", "Transfer", "Population"])
+        workbook.active.append(["up", "Uttar Pradesh", 100, 200])
+        workbook.save(directory / "statewise.xlsx")
+        with pytest.raises(ValueError, match="no sheet has column"):
+            csv_parser.load_year_inputs("2019-20")
+
+    def test_empty_table(self):
+        directory = write_year("2019-20")
+        (directory / "receipts.csv").write_text("id,name,amount,previous_year\n")
+        with pytest.raises(ValueError, match="no rows"):
+            csv_parser.load_year_inputs("2019-20")
+
+
+class TestStages:
+    def test_archive_year_has_no_shared_outputs(self):
+        write_year("2019-20")
+        outputs = main.transform({"year": "2019-20", "api_result": None})
+        assert set(outputs) == set(main.schemas_for("2019-20"))
+        assert outputs["budget/2019-20/receipts.json"]["year"] == "2019-20"
+        assert outputs["budget/2019-20/trends.json"]["series"][-1]["year"] == "2019-20"
+        assert main.validate(outputs) == []
+        # Narrowed dtypes publish the same values as the curated tables
+        current = main.transform({"api_result": None})
+        assert outputs["budget/2019-20/expenditure.json"]["ministries"] == current["budget/2025-26/expenditure.json"]["ministries"]
+        assert outputs["budget/2019-20/schemes.json"]["schemes"] == current["budget/2025-26/schemes.json"]["schemes"]
+
+    def test_budget_vs_actual_cut_off_at_year(self):
+        write_year("2021-22")
+        bva = main.transform({"year": "2021-22", "api_result": None})["budget/2021-22/budget-vs-actual.json"]
+        assert {h["year"] for m in bva["ministries"] for h in m["history"]} == {"2019-20", "2020-21", "2021-22"}
+        # Ranked by the 2021-22 BE, not the latest one
+        ranks = [m["history"][-1]["be"] for m in bva["ministries"]]
+        assert ranks == sorted(ranks, reverse=True)
+        assert bva["ministries"][0]["id"] == "defence" and bva["ministries"][1]["id"] == "consumer-affairs"
+
+    def test_budget_vs_actual_skipped_before_curated_data(self):
+        write_year("2016-17")
+        outputs = main.transform({"year": "2016-17", "api_result": None})
+        assert "budget/2016-17/budget-vs-actual.json" not in outputs
+        assert set(outputs) == set(main.schemas_for("2016-17"))
+        assert main.validate(outputs) == []
+
+    def test_current_year_index_keeps_published_years(self):
+        (writer.DATA_DIR / "budget" / "2019-20").mkdir(parents=True)
+        (writer.DATA_DIR / "budget" / "2019-20" / "summary.json").write_text("{}")
+        outputs = main.transform({"api_result": None})
+        assert outputs["years.json"] == {"years": ["2019-20", "2025-26"], "latest": "2025-26"}
+        assert "tax-calculator/slabs.json" in outputs
+
+    def test_publish_years_index(self):
+        for year in ("2025-26", "2018-19"):
+            (writer.DATA_DIR / "budget" / year).mkdir(parents=True)
+            (writer.DATA_DIR / "budget" / year / "summary.json").write_text("{}")
+        (writer.DATA_DIR / "budget" / "2017-18").mkdir()  # nothing published
+        main.publish_years_index()
+        index = json.loads((writer.DATA_DIR / "years.json").read_bytes())
+        assert index == {"years": ["2018-19", "2025-26"], "latest": "2025-26"}
@@ -0,0 +1,99 @@
+"""
+Tests for the build orchestrator's graph construction and DAG scheduling.
+Stage functions below stand in for a domain module so no network or disk I/O happens.
+"""
+
+from pathlib import Path
+
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.build import DOMAINS, PREFETCH, YEARS_NODE, Node, build_graph, parse_only, parse_years, run_dag
+
+FAKE = __name__
+
+
+def fetch():
+    return {"n": 2}
+
+
+def transform(raw):
+    return {"double.json": {"n": raw["n"] * 2}}
+
+
+def validate(outputs):
+    return [] if outputs["double.json"]["n"] == 4 else ["double.json: wrong"]
+
+
+def publish(outputs):
+    return sorted(outputs)
+
+
+def broken_fetch():
+    raise RuntimeError("API down")
+
+
+class TestGraph:
+    def test_four_stages_per_domain(self):
+        nodes = build_graph(["economy", "rbi"])
+        assert len(nodes) == 9
+        assert nodes["economy:transform"].deps == ("economy:fetch",)
+        # PUBLISH runs after VALIDATE but receives the TRANSFORM outputs
+        assert nodes["rbi:publish"].deps == ("rbi:validate",)
+        assert nodes["rbi:publish"].arg == "rbi:transform"
+
+    def test_world_bank_prefetch_only_for_wb_domains(self):
+        nodes = build_graph(["economy", "states"])
+        assert nodes[PREFETCH].args == (["economy"],)
+        assert nodes["economy:fetch"].deps == (PREFETCH,)
+        assert nodes["states:fetch"].deps == ()
+        assert PREFETCH not in build_graph(["states", "elections"])
+
+    def test_one_budget_chain_per_year(self):
+        nodes = build_graph(["budget", "rbi"], ["2024-25", "2025-26"])
+        assert "budget:fetch" not in nodes
+        assert nodes["budget@2024-25:fetch"].args == ("2024-25",)
+        assert nodes["budget@2025-26:publish"].deps == ("budget@2025-26:validate",)
+        assert nodes[YEARS_NODE].deps == ("budget@2024-25:publish", "budget@2025-26:publish")
+        assert nodes["rbi:fetch"].args == ()
+        assert YEARS_NODE not in build_graph(["budget"])
+
+    def test_years_sorted_and_checked(self):
+        assert parse_years("2025-26, 2016-17,2025-26") == ["2016-17", "2025-26"]
+        assert parse_years(None) is None
+        with pytest.raises(ValueError):
+            parse_years("2025")
+
+    def test_only_keeps_domain_order(self):
+        assert parse_only("rbi, economy") == ["economy", "rbi"]
+        assert parse_only(None) == list(DOMAINS)
+
+    def test_only_rejects_unknown(self):
+        with pytest.raises(ValueError):
+            parse_only("economy,nope")
+
+
+class TestRunDag:
+    def _chain(self, prefix: str, fetch_fn: str = "fetch") -> dict[str, Node]:
+        return {
+            f"{prefix}:fetch": Node(f"{prefix}:fetch", FAKE, fetch_fn),
+            f"{prefix}:transform": Node(f"{prefix}:transform", FAKE, "transform", (f"{prefix}:fetch",), f"{prefix}:fetch"),
+            f"{prefix}:validate": Node(f"{prefix}:validate", FAKE, "validate", (f"{prefix}:transform",), f"{prefix}:transform"),
+            f"{prefix}:publish": Node(f"{prefix}:publish", FAKE, "publish", (f"{prefix}:validate",), f"{prefix}:transform"),
+        }
+
+    def test_passes_results_downstream(self):
+        results = run_dag(self._chain("a"), max_workers=2)
+        assert all(r.status == "ok" for r in results.values())
+        assert results["a:publish"].value == ["double.json"]
+
+    def test_failure_skips_downstream_only(self):
+        nodes = {**self._chain("a"), **self._chain("b", fetch_fn="broken_fetch")}
+        results = run_dag(nodes, max_workers=2)
+        assert results["a:publish"].status == "ok"
+        assert results["b:fetch"].status == "failed"
+        assert "API down" in results["b:fetch"].error
+        assert {results[f"b:{s}"].status for s in ("transform", "validate", "publish")} == {"skipped"}
@@ -0,0 +1,83 @@
+"""
+Tests for per-page bundles built from published outputs.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.publish import bundles, writer
+
+
+@pytest.fixture(autouse=True)
+def data_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(writer, "DATA_DIR", tmp_path)
+    monkeypatch.delenv(writer.JSON_MODE_ENV, raising=False)
+    monkeypatch.delenv(writer.HASHED_NAMES_ENV, raising=False)
+    monkeypatch.setitem(bundles.PAGES, "economy", ("summary.json", "fiscal.json", "sectors.json"))
+    return tmp_path
+
+
+OUTPUTS = {
+    "economy/2025-26/summary.json": {"year": "2025-26", "value": 6.5},
+    "economy/2025-26/fiscal.json": {"series": [1, 2, 3]},
+    "economy/2025-26/glossary.json": {"terms": []},
+}
+
+
+def test_bundle_matches_members(data_dir):
+    published = writer.publish_all(OUTPUTS)
+    paths = bundles.bundle("economy", published)
+
+    assert paths == [data_dir / "economy/2025-26/bundle.json"]
+    content = json.loads(paths[0].read_bytes())
+    # Listed members only, in PAGES order; sectors.json was never published
+    assert list(content) == ["economy/2025-26/summary.json", "economy/2025-26/fiscal.json"]
+    for rel_path, data in content.items():
+        assert data == json.loads((data_dir / rel_path).read_bytes())
+    assert not (data_dir / "economy/2025-26/bundle.json.gz").exists()  # sidecars only with --precompress
+
+
+def test_manifest_lists_contents(data_dir):
+    bundles.bundle("economy", writer.publish_all(OUTPUTS))
+    manifest = json.loads((data_dir / writer.MANIFEST).read_bytes())
+    assert manifest["bundles"] == {
+        "economy/2025-26/bundle.json": ["economy/2025-26/summary.json", "economy/2025-26/fiscal.json"],
+    }
+
+
+def test_hashed_bundle(data_dir, monkeypatch):
+    monkeypatch.setenv(writer.HASHED_NAMES_ENV, "1")
+    bundles.bundle("economy", writer.publish_all(OUTPUTS))
+    manifest = json.loads((data_dir / writer.MANIFEST).read_bytes())
+    entry = manifest["files"]["economy/2025-26/bundle.json"]
+    assert (data_dir / entry["file"]).exists()
+
+
+def test_unchanged_bundle_is_skipped(data_dir):
+    published = writer.publish_all(OUTPUTS)
+    bundles.bundle("economy", published)
+    mtime = (data_dir / "economy/2025-26/bundle.json").stat().st_mtime_ns
+    bundles.bundle("economy", published)
+    assert (data_dir / "economy/2025-26/bundle.json").stat().st_mtime_ns == mtime
+
+
+def test_unconfigured_domain(data_dir):
+    published = writer.publish_all({"geo/2025-26/summary.json": {}})
+    assert bundles.bundle("geo", published) == []
+
+
+def test_republish_rebuilds_bundle(data_dir):
+    writer.publish_all(OUTPUTS)
+    bundle_path = data_dir / "economy/2025-26/bundle.json"
+    assert json.loads(bundle_path.read_bytes())["economy/2025-26/summary.json"]["value"] == 6.5
+    # A domain script publishing on its own, outside the build DAG
+    writer.publish_all({"economy/2025-26/summary.json": {"year": "2025-26", "value": 7.0}})
+    content = json.loads(bundle_path.read_bytes())
+    assert content["economy/2025-26/summary.json"]["value"] == 7
+    assert list(content) == ["economy/2025-26/summary.json", "economy/2025-26/fiscal.json"]
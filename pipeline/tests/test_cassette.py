@@ -0,0 +1,99 @@
+"""
+Tests for HTTP record/replay: record against a local origin, replay through the stand-in server.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.common import cassette, http_client
+from src.common.standin_server import StandInServer
+
+
+class OriginHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", '"abc"')
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def origin():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), OriginHandler)
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    monkeypatch.delenv(cassette.RECORD_ENV, raising=False)
+    monkeypatch.delenv(cassette.REPLAY_ENV, raising=False)
+    http_client.configure()
+    yield
+    http_client.configure()
+
+
+@pytest.fixture
+def recorded(origin, tmp_path, monkeypatch):
+    """Record two requests against the origin and compact them into a cassette."""
+    monkeypatch.setenv(cassette.RECORD_ENV, str(tmp_path))
+    http_client.get(f"{origin}/v2/indicator/A", params={"per_page": 100, "format": "json"})
+    http_client.get(f"{origin}/api/cpi", params={"year": "2024", "month_code": "4"})
+    monkeypatch.delenv(cassette.RECORD_ENV)
+    counts = cassette.compact(tmp_path)
+    return origin, tmp_path, counts
+
+
+def test_request_key_ignores_param_order():
+    assert cassette.request_key("/x", "b=2&a=1") == cassette.request_key("/x", "a=1&b=2") == "/x?a=1&b=2"
+
+
+def test_record_and_compact(recorded):
+    origin, directory, counts = recorded
+    host = origin.removeprefix("http://")
+    assert counts == {host: 2}
+    assert list(directory.glob("*.jsonl")) == []
+    interactions = cassette.load(directory)[host]
+    assert interactions["/v2/indicator/A?format=json&per_page=100"]["headers"]["ETag"] == '"abc"'
+
+
+def test_replay_matches_origin(recorded, monkeypatch):
+    origin, directory, _ = recorded
+    with StandInServer.from_directory(directory) as server:
+        monkeypatch.setenv(cassette.REPLAY_ENV, server.url)
+        resp = http_client.get(f"{origin}/v2/indicator/A", params={"format": "json", "per_page": 100})
+        assert resp.json() == {"path": "/v2/indicator/A?per_page=100&format=json"}
+        assert http_client.get(f"{origin}/v2/indicator/B").status_code == 404
+        assert http_client.get(f"{origin}/v2/indicator/A", params={"format": "json", "per_page": 100},
+                               headers={"If-None-Match": '"abc"'}).status_code == 304
+        assert server.stats == {"hits": 1, "misses": 1, "not_modified": 1, "errors": 0}
+
+
+def test_injected_latency_and_errors(recorded, monkeypatch):
+    origin, directory, _ = recorded
+    with StandInServer.from_directory(directory, latency=0.1, error_rate=1.0) as server:
+        monkeypatch.setenv(cassette.REPLAY_ENV, server.url)
+        start = time.perf_counter()
+        resp = http_client.get(f"{origin}/api/cpi", params={"year": "2024", "month_code": "4"})
+        assert time.perf_counter() - start >= 0.1
+        assert resp.status_code == 503
+        assert server.stats["errors"] == 1
@@ -0,0 +1,78 @@
+"""
+Tests for the columnar encoding of published tables.
+"""
+
+import json
+import math
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.publish import columnar, writer
+
+YEARS = [f"{y}-{(y + 1) % 100:02d}" for y in range(1985, 2025)]
+
+DOC = {
+    "year": "2025-26",
+    "nationalTimeSeries": [{"year": y, "value": round(50 + i * 1.3, 1)} for i, y in enumerate(YEARS)],
+    "growthTimeSeries": [{"year": y, "value": None if i == 3 else 6.25 + i} for i, y in enumerate(YEARS)],
+    "states": [
+        {"id": "KA", "name": "Karnataka", "value": 973, "share": 0.123456789},
+        {"id": "KL", "name": "Kerala", "value": 1084, "share": 0.05},
+        {"id": "MH", "name": "Maharashtra", "value": 929, "share": 0.2},
+    ],
+    "mixed": [{"year": "2019-20", "value": 2}, {"year": "2020-21", "value": 2.5}],
+    "notes": [{"text": "a"}, {"text": "b"}],
+    "source": "test",
+}
+
+
+class TestColumnar:
+    def test_exact_round_trip(self):
+        payload = columnar.encode(DOC)
+        assert payload[:4] == columnar.MAGIC
+        back = columnar.decode(payload)
+        # json.dumps also compares key order and int-vs-float
+        assert json.dumps(back) == json.dumps(DOC)
+
+    def test_shared_year_axis(self):
+        header, _ = columnar._parse(columnar.encode(DOC))
+        assert header["strings"].count(YEARS) == 1
+        assert header["doc"]["notes"] == [{"text": "a"}, {"text": "b"}]  # no numeric column: inline
+
+    def test_dtypes(self):
+        header, _ = columnar._parse(columnar.encode(DOC))
+        national, growth, states, mixed = header["tables"]
+        assert national["columns"][1]["dtype"] == "f4"
+        assert growth["columns"][1]["nulls"] is not None
+        assert [c.get("dtype") for c in states["columns"]] == [None, None, "i4", "f8"]
+        assert mixed["columns"][1]["ints"] == [0]
+
+    def test_read_tables(self):
+        doc, tables = columnar.read_tables(columnar.encode(DOC))
+        assert doc["growthTimeSeries"] == {"$table": 1}
+        growth = tables[1]
+        assert growth["year"] == YEARS
+        assert math.isnan(growth["value"][3])
+        np.testing.assert_allclose(tables[0]["value"], [r["value"] for r in DOC["nationalTimeSeries"]])
+
+    def test_no_tables(self):
+        assert columnar.encode({"year": "2025-26", "value": 1}) is None
+
+    def test_rejects_other_bytes(self):
+        with pytest.raises(ValueError):
+            columnar.decode(b"{}" + bytes(16))
+
+
+def test_published_next_to_json(monkeypatch, tmp_path):
+    monkeypatch.setattr(writer, "DATA_DIR", tmp_path)
+    monkeypatch.delenv(writer.JSON_MODE_ENV, raising=False)
+    writer.publish_outputs({"economy/2025-26/gdp-growth.json": DOC, "x/small.json": {"a": 1}}, columnar=True)
+    col = tmp_path / "economy/2025-26/gdp-growth.col"
+    assert columnar.decode(col.read_bytes()) == json.loads((tmp_path / "economy/2025-26/gdp-growth.json").read_bytes())
+    assert not (tmp_path / "x/small.col").exists()
@@ -0,0 +1,83 @@
+"""
+Tests for JSON Patch deltas between published generations.
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.publish import delta, writer
+
+DECISIONS = [{"date": f"2024-{m:02d}-07", "rate": 6.5, "change": 0} for m in range(1, 13)]
+OLD = {"year": "2025-26", "decisions": DECISIONS, "source": "RBI", "a/b": {"x~y": 1}}
+
+
+class TestDiff:
+    @pytest.mark.parametrize("new", [
+        {**OLD, "decisions": DECISIONS + [{"date": "2025-02-07", "rate": 6.25, "change": -0.25}]},
+        {**OLD, "decisions": [{"date": "2023-12-08", "rate": 6.5, "change": 0}] + DECISIONS},
+        {**OLD, "decisions": DECISIONS[:5] + DECISIONS[7:]},
+        {**OLD, "decisions": DECISIONS[:3] + [{"date": "x", "rate": 1, "change": 1}] + DECISIONS[4:]},
+        {"year": "2025-26", "decisions": [], "a/b": {"x~y": 2}, "note": None},
+        {**OLD, "source": 7},
+        [1, 2, 3],
+    ])
+    def test_round_trip(self, new):
+        assert delta.apply(OLD, delta.diff(OLD, new)) == new
+
+    def test_append_is_one_add(self):
+        new = {**OLD, "decisions": DECISIONS + [{"date": "2025-02-07", "rate": 6.25, "change": -0.25}]}
+        assert delta.diff(OLD, new) == [
+            {"op": "add", "path": "/decisions/12", "value": new["decisions"][-1]}
+        ]
+
+    def test_pointer_escaping(self):
+        ops = delta.diff(OLD, {**OLD, "a/b": {"x~y": 2}})
+        assert ops == [{"op": "replace", "path": "/a~1b/x~0y", "value": 2}]
+
+    def test_int_float_distinguished(self):
+        assert delta.diff({"v": 1}, {"v": 1.5}) == [{"op": "replace", "path": "/v", "value": 1.5}]
+        assert delta.diff({"v": 1}, {"v": True}) == [{"op": "replace", "path": "/v", "value": True}]
+
+
+class TestPublishedDeltas:
+    @pytest.fixture(autouse=True)
+    def data_dir(self, monkeypatch, tmp_path):
+        monkeypatch.setattr(writer, "DATA_DIR", tmp_path)
+        monkeypatch.delenv(writer.JSON_MODE_ENV, raising=False)
+        return tmp_path
+
+    def test_delta_listed_and_applies(self, data_dir):
+        rel = "rbi/2025-26/monetary-policy.json"
+        writer.publish_outputs({rel: OLD}, hashed=True)
+        old_entry = json.loads((data_dir / writer.MANIFEST).read_bytes())["files"][rel]
+        new = {**OLD, "decisions": DECISIONS + [{"date": "2025-02-07", "rate": 6.25, "change": -0.25}]}
+        writer.publish_outputs({rel: new}, hashed=True)
+
+        entry = json.loads((data_dir / writer.MANIFEST).read_bytes())["files"][rel]
+        assert entry["delta"]["from"] == old_entry["sha256"]
+        assert entry["delta"]["file"] == writer.delta_name(rel, old_entry["sha256"], entry["sha256"])
+        patch = json.loads((data_dir / entry["delta"]["file"]).read_bytes())
+        previous = json.loads((data_dir / old_entry["file"]).read_bytes())
+        assert delta.apply(previous, patch) == json.loads((data_dir / entry["file"]).read_bytes())
+        assert entry["delta"]["size"] < entry["size"]
+
+    def test_old_deltas_pruned(self, data_dir):
+        rel = "rbi/2025-26/monetary-policy.json"
+        for n in range(1, 5):
+            writer.publish_outputs({rel: {**OLD, "decisions": DECISIONS[:n]}}, hashed=True)
+        entry = json.loads((data_dir / writer.MANIFEST).read_bytes())["files"][rel]
+        patches = sorted(p.name for p in (data_dir / "rbi/2025-26").glob("monetary-policy.*.patch.json"))
+        assert patches == [Path(entry["delta"]["file"]).name]
+
+    def test_no_delta_when_rewritten_wholesale(self, data_dir):
+        rel = "x/values.json"
+        writer.publish_outputs({rel: {"v": list(range(50))}}, hashed=True)
+        writer.publish_outputs({rel: {"v": list(range(100, 150))}}, hashed=True)
+        entry = json.loads((data_dir / writer.MANIFEST).read_bytes())["files"][rel]
+        assert entry["delta"] is None
@@ -0,0 +1,135 @@
+"""
+Parity tests: column versions of the derive helpers and the vectorized
+budget transform against the scalar helpers they replace.
+"""
+
+import json
+import math
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src import main as budget
+from src.extract.csv_parser import (
+    get_curated_expenditure_data,
+    get_curated_receipts_data,
+    get_curated_schemes_data,
+    get_curated_statewise_data,
+    get_curated_summary,
+)
+from src.transform.derive import (
+    human_context,
+    per_capita,
+    per_capita_array,
+    percent_of_total,
+    percent_of_total_array,
+    round_like_python,
+    yoy_change,
+    yoy_change_array,
+)
+
+
+def _same(scalar, array_value) -> bool:
+    if scalar is None:
+        return math.isnan(array_value)
+    return scalar == array_value
+
+
+class TestArrayHelpers:
+    def test_round_ties_match_python(self):
+        # np.round gives 0.4 and 0.4 for these; round() gives 0.3 and 0.5
+        values = [0.35, 0.45, 0.25, 2.675, 1.005, -0.35, 12.5, 13.5, float("nan")]
+        for ndigits in (0, 1, 2):
+            got = round_like_python(values, ndigits)
+            for value, rounded in zip(values, got):
+                expected = round(value, ndigits)
+                assert expected == rounded or (math.isnan(expected) and math.isnan(rounded))
+
+    def test_random_parity(self):
+        rng = random.Random(7)
+        current = [rng.choice([rng.randint(0, 10**7), rng.randint(0, 4000) / 8]) for _ in range(5000)]
+        previous = [rng.choice([None, 0, rng.randint(1, 10**7), c * 0.8]) for c in current]
+        total = sum(current)
+
+        pct = percent_of_total_array(current, total)
+        yoy = yoy_change_array(current, previous)
+        pc = per_capita_array(current)
+        for i, (c, p) in enumerate(zip(current, previous)):
+            assert percent_of_total(c, total) == pct[i]
+            assert _same(yoy_change(c, p), yoy[i])
+            assert per_capita(c) == pc[i]
+
+    def test_zero_total(self):
+        assert percent_of_total_array([1, 2], 0).tolist() == [0.0, 0.0]
+
+    def test_per_capita_column_population(self):
+        got = per_capita_array([100, 250], np.array([1_000_000, 3_000_000]))
+        assert got.tolist() == [per_capita(100, 1_000_000), per_capita(250, 3_000_000)]
+
+
+def _scalar_reference() -> dict:
+    """The per-row iterrows construction the vectorized transform replaced."""
+    total_expenditure = get_curated_summary()["totalExpenditure"]
+    receipts_df = get_curated_receipts_data()
+    total_receipts = receipts_df["amount"].sum()
+    receipts = [{
+        "id": r["id"], "name": r["name"], "amount": r["amount"],
+        "percentOfTotal": percent_of_total(r["amount"], total_receipts),
+        "previousYear": r["previous_year"],
+        "yoyChange": yoy_change(r["amount"], r["previous_year"]),
+    } for _, r in receipts_df.iterrows()]
+    ministries = [{
+        "id": r["id"], "name": r["name"], "budgetEstimate": r["budget_estimate"],
+        "revisedEstimate": None, "actualExpenditure": None,
+        "percentOfTotal": percent_of_total(r["budget_estimate"], total_expenditure),
+        "yoyChange": yoy_change(r["budget_estimate"], r["previous_year"]),
+        "perCapita": per_capita(r["budget_estimate"]),
+        "humanContext": human_context(r["id"], r["budget_estimate"]),
+        "schemes": json.loads(r["schemes_json"]),
+    } for _, r in get_curated_expenditure_data().iterrows()]
+    statewise_df = get_curated_statewise_data()
+    total_transfers = statewise_df["transfer"].sum()
+    states = [{
+        "id": r["id"], "name": r["name"], "transfer": r["transfer"],
+        "perCapita": round(r["transfer"] * 1e7 / r["population"]),
+        "percentOfTotal": percent_of_total(r["transfer"], total_transfers),
+        "population": r["population"],
+    } for _, r in statewise_df.iterrows()]
+    schemes = [{
+        "id": r["id"], "name": r["name"], "ministry": r["ministry"],
+        "ministryName": r["ministryName"], "allocation": r["allocation"],
+        "previousYear": r["previous_year"],
+        "yoyChange": yoy_change(r["allocation"], r["previous_year"]),
+        "humanContext": r["humanContext"],
+    } for _, r in get_curated_schemes_data().iterrows()]
+    return {"receipts": receipts, "ministries": ministries, "states": states, "schemes": schemes}
+
+
+@pytest.fixture(scope="module")
+def outputs():
+    return budget.transform({"api_result": None})
+
+
+def _json(value) -> str:
+    return json.dumps(value, default=lambda v: v.item())
+
+
+def test_transform_matches_scalar_path(outputs):
+    year = budget.YEAR
+    expected = _scalar_reference()
+    assert _json(outputs[f"budget/{year}/receipts.json"]["categories"]) == _json(expected["receipts"])
+    assert _json(outputs[f"budget/{year}/expenditure.json"]["ministries"]) == _json(expected["ministries"])
+    assert _json(outputs[f"budget/{year}/statewise.json"]["states"]) == _json(expected["states"])
+    assert _json(outputs[f"budget/{year}/schemes.json"]["schemes"]) == _json(expected["schemes"])
+
+
+def test_transform_emits_plain_python_values(outputs):
+    ministry = outputs[f"budget/{budget.YEAR}/expenditure.json"]["ministries"][0]
+    assert type(ministry["budgetEstimate"]) is int
+    assert type(ministry["percentOfTotal"]) is float
@@ -0,0 +1,71 @@
+"""
+Tests for the shared pooled HTTP transport, against a local keep-alive server.
+"""
+
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.common import http_client
+
+
+class JSONHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"  # keep-alive
+
+    def do_GET(self):
+        body = json.dumps({"path": self.path}).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), JSONHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_port}"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture(autouse=True)
+def fresh_session():
+    http_client.configure()
+    yield
+    http_client.configure()
+
+
+def test_connections_are_reused(server):
+    for i in range(5):
+        resp = http_client.get(f"{server}/item/{i}")
+        assert resp.json() == {"path": f"/item/{i}"}
+    counts = http_client.stats()["127.0.0.1"]
+    assert counts == {"requests": 5, "connections": 1, "reused": 4}
+
+
+def test_connection_errors_are_retried(monkeypatch):
+    monkeypatch.setattr(http_client, "RETRY_DELAY_BASE", 0)
+    attempts = []
+    session = http_client.get_session()
+
+    def flaky(url, **kwargs):
+        attempts.append(url)
+        raise http_client.requests.exceptions.ConnectionError("refused")
+
+    monkeypatch.setattr(session, "get", flaky)
+    with pytest.raises(http_client.requests.exceptions.ConnectionError):
+        http_client.get("http://example.invalid/", retries=3)
+    assert len(attempts) == 3
@@ -0,0 +1,215 @@
+"""
+Tests for the MOSPI CPI client and its shared rate limiter. HTTP calls are replaced with canned pages.
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.common import http_client
+from src.common.cache import CACHE_MODE_ENV, DiskCache
+from src.common.rate_limit import TokenBucket
+from src.economy.sources import mospi
+
+
+class FakeResponse:
+    def __init__(self, payload):
+        self._payload = payload
+
+    def raise_for_status(self):
+        pass
+
+    def json(self):
+        return self._payload
+
+
+def cpi_record(group, subgroup, inflation, state="All India"):
+    return {"group": group, "subgroup": subgroup, "state": state, "index": "180.5", "inflation": str(inflation)}
+
+
+@pytest.fixture(autouse=True)
+def store(monkeypatch, tmp_path):
+    """Point the month store at a throwaway directory."""
+    monkeypatch.delenv(CACHE_MODE_ENV, raising=False)
+    cache = DiskCache(tmp_path / "mospi")
+    monkeypatch.setattr(mospi, "MONTH_CACHE", cache)
+    return cache
+
+
+@pytest.fixture
+def fake_api(monkeypatch):
+    """One page of records per month (food inflation = month number), then an empty page."""
+    calls = []
+    lock = threading.Lock()
+    active = [0, 0]  # current, peak concurrent requests
+
+    def get(url, params=None, timeout=None, **kwargs):
+        with lock:
+            calls.append((int(params["year"]), int(params["month_code"]), int(params["page"])))
+            active[0] += 1
+            active[1] = max(active)
+        time.sleep(0.01)
+        with lock:
+            active[0] -= 1
+        if params["page"] != "1":
+            return FakeResponse({"data": []})
+        month = int(params["month_code"])
+        return FakeResponse({"data": [
+            cpi_record("Food and Beverages", "Food and Beverages-Overall", month),
+            cpi_record("Food and Beverages", "Food and Beverages-Overall", 99, state="Kerala"),
+            cpi_record("Miscellaneous", "Health", 5.0),
+        ]})
+
+    monkeypatch.setattr(http_client, "get", get)
+    monkeypatch.setattr(mospi, "_LIMITER", TokenBucket(1000, burst=10))
+    return calls, active
+
+
+def monthly_matrix(inflation: dict[str, list], start: str = "2024-04") -> pd.DataFrame:
+    """A fetch_cpi_monthly()-shaped matrix: index = 100 + month number."""
+    n = len(next(iter(inflation.values())))
+    months = pd.period_range(start, periods=n, freq="M")
+    columns = {}
+    for code, values in inflation.items():
+        columns[("index", code)] = [100.0 + i if v is not None else None for i, v in enumerate(values)]
+        columns[("inflation", code)] = values
+    matrix = pd.DataFrame(columns, index=months, dtype=float)
+    matrix.columns.names = ["measure", "division"]
+    return matrix
+
+
+class TestTokenBucket:
+    def test_burst_then_rate(self):
+        bucket = TokenBucket(rate=50, burst=5)
+        start = time.monotonic()
+        for _ in range(15):
+            bucket.acquire()
+        # 5 immediate, then 10 more at 50/s
+        assert 0.18 <= time.monotonic() - start < 0.5
+
+    def test_shared_across_threads(self):
+        bucket = TokenBucket(rate=100, burst=1)
+        start = time.monotonic()
+        threads = [threading.Thread(target=lambda: [bucket.acquire() for _ in range(5)]) for _ in range(4)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        assert time.monotonic() - start >= 0.18  # 20 tokens at 100/s, one up front
+
+    def test_rejects_bad_settings(self):
+        with pytest.raises(ValueError):
+            TokenBucket(rate=0)
+
+
+class TestFetchMonth:
+    def test_stops_at_empty_page_and_filters_all_india(self, fake_api):
+        calls, _ = fake_api
+        result = mospi._fetch_month(2023, 7)
+        assert [c[2] for c in calls] == [1, 2]
+        food = result[("Food and Beverages", "Food and Beverages-Overall")]
+        assert food == {"index": 180.5, "inflation": 7.0}
+
+
+class TestFetchCpiByCategory:
+    def test_parallel_months_give_fy_averages(self, fake_api):
+        calls, active = fake_api
+        divisions = mospi.fetch_cpi_by_category(start_fy="2023-24")
+        food = next(d for d in divisions if d["division"] == "01")
+        # FY 2023-24 covers months 4..12 and 1..3 → mean of 1..12
+        assert food["series"][0] == {"period": "2023-24", "value": 6.5}
+        months = {(y, m) for y, m, _ in calls}
+        assert (2023, 4) in months and (2024, 3) in months
+        assert len(calls) == 2 * len(months)
+        assert active[1] > 1
+
+    def test_six_month_minimum(self):
+        five = monthly_matrix({"06": [4.0] * 5 + [None] * 7})
+        assert mospi.fy_averages(five)["06"].isna().all()
+        six = monthly_matrix({"06": [4.0] * 5 + [10.0] + [None] * 6})
+        assert mospi.fy_averages(six).loc["2024-25", "06"] == 5.0
+
+    def test_unreachable_api_returns_none(self, monkeypatch):
+        monkeypatch.setattr(mospi, "_LIMITER", TokenBucket(1000, burst=10))
+        monkeypatch.setattr(mospi, "_fetch_page", lambda *args: [])
+        assert mospi.fetch_cpi_by_category(start_fy="2024-25") is None
+
+
+class TestMonthStore:
+    def test_closed_months_never_refetched(self, fake_api, store):
+        calls, _ = fake_api
+        first = mospi._load_month(2023, 7, closed=True)
+        assert first[1] is True
+        calls.clear()
+        again = mospi._load_month(2023, 7, closed=True)
+        assert again == (first[0], False)
+        assert calls == []
+
+    def test_provisional_months_revalidated_when_stale(self, fake_api, store, monkeypatch):
+        calls, _ = fake_api
+        mospi._load_month(2026, 8, closed=False)
+        monkeypatch.setattr(mospi, "PROVISIONAL_TTL", 0)
+        mospi._load_month(2026, 8, closed=False)  # still fresh under the old TTL
+        assert len({(y, m) for y, m, _ in calls}) == 1
+        mospi._load_month(2026, 9, closed=False)  # stored with TTL 0
+        calls.clear()
+        _, called = mospi._load_month(2026, 9, closed=True)  # FY closed since: one last check
+        assert called and calls
+        calls.clear()
+        assert mospi._load_month(2026, 9, closed=True)[1] is False
+
+    def test_routine_run_only_fetches_uncached_months(self, fake_api):
+        calls, _ = fake_api
+        first = mospi.fetch_cpi_by_category(start_fy="2022-23")
+        calls.clear()
+        assert mospi.fetch_cpi_by_category(start_fy="2022-23") == first
+        assert calls == []
+
+    def test_unreleased_month_not_stored(self, monkeypatch, store):
+        monkeypatch.setattr(mospi, "_fetch_month", lambda year, month: {})
+        assert mospi._load_month(2026, 9, closed=False) == ({}, True)
+        assert store.get(store.key(2026, 9, mospi.BASE_YEAR, mospi.SECTOR_CODE)) is None
+
+
+class TestMonthlyMatrix:
+    def test_fy_boundaries(self):
+        matrix = monthly_matrix({"01": [float(i) for i in range(24)]}, start="2023-04")
+        averages = mospi.fy_averages(matrix)
+        assert list(averages.index) == ["2023-24", "2024-25"]
+        assert averages["01"].tolist() == [5.5, 17.5]
+
+    def test_rolling_and_momentum(self):
+        values = [2.0, 4.0, 6.0, None, 8.0] + [1.0] * 12
+        aggregates = mospi.monthly_aggregates(monthly_matrix({"07": values}))
+        assert aggregates[("rolling3", "07")].iloc[2] == 4.0
+        # A missing month breaks the window rather than being skipped
+        assert aggregates[("rolling3", "07")].iloc[4:6].isna().all()
+        assert aggregates[("rolling12", "07")].iloc[-1] == 1.0
+        assert aggregates[("momentum", "07")].iloc[1] == 1.0  # 100 → 101
+        assert pd.isna(aggregates[("momentum", "07")].iloc[0])
+
+    def test_monthly_output_validates(self):
+        from src.economy.transform.inflation import build_monthly_inflation
+        from src.economy.validate.schemas import MonthlyInflationData
+
+        output = build_monthly_inflation(monthly_matrix({"01": [3.0, None, 5.0]}), "2025-26")
+        MonthlyInflationData(**output)
+        series = output["divisions"][0]["series"]
+        assert [p["month"] for p in series] == ["2024-04", "2024-06"]
+        assert series[1]["momentum"] is None
+        assert build_monthly_inflation(None, "2025-26") is None
+
+    def test_unreachable_mospi_keeps_published_file(self):
+        from src.economy import main as economy
+
+        outputs = economy.transform({"wb_data": {}, "mospi_monthly": None})
+        assert "inflation-monthly.json" not in outputs
+        assert economy.validate(outputs) == []
+        assert economy.validate({k: v for k, v in outputs.items() if k != "fiscal.json"})  # required ones still are
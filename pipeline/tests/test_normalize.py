@@ -0,0 +1,131 @@
+"""
+Tests for ministry name normalization and canonical id resolution.
+"""
+
+import random
+import re
+from pathlib import Path
+
+import pandas as pd
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.extract.csv_parser import get_curated_expenditure_data
+from src.transform.normalize import (
+    ABBREVIATIONS,
+    MinistryIndex,
+    match_key,
+    normalize_ministry_name,
+    normalize_ministry_names,
+)
+
+
+def sequential(name: str) -> str:
+    """The original one-re.sub-per-abbreviation normalizer."""
+    result = name.strip()
+    for pattern, replacement in ABBREVIATIONS.items():
+        result = re.sub(pattern, replacement, result)
+    return re.sub(r"\s+", " ", result).strip()
+
+
+class TestNormalize:
+    @pytest.mark.parametrize("raw, expected", [
+        ("M/o Rural Development", "Ministry of Rural Development"),
+        ("  D/o  Food&Public Distribution ", "Department of Food& Public Distribution"),
+        ("MoRT&H", "Ministry of Road Transport & Highways"),
+        ("MoR", "Ministry of Railways"),
+        ("MoRD", "Ministry of Rural Development"),
+        ("Deptt of Expenditure", "Department of Expenditure"),
+    ])
+    def test_expands_abbreviations(self, raw, expected):
+        assert normalize_ministry_name(raw) == expected
+
+    def test_matches_sequential_on_spaced_words(self):
+        words = [
+            "M/o", "Min. of", "Min.of", "Deptt", "Dept.", "Dept.of", "D/o", "MoD", "MoF", "MHA", "MoRD",
+            "MoHFW", "MoE", "MoRT&H", "MoA&FW", "MoR", "&", "A&B", "Govt.", "Govt.of", "Rural", "(MoD)",
+        ]
+        rng = random.Random(7)
+        for _ in range(3000):
+            name = " ".join(rng.choice(words) for _ in range(rng.randint(1, 6)))
+            assert normalize_ministry_name(name) == sequential(name), name
+
+    def test_glued_abbreviations_all_expand(self):
+        # The sequential loop lost the word boundary after expanding "Dept."
+        assert normalize_ministry_name("Dept.MoRD") == "DepartmentMinistry of Rural Development"
+
+    def test_series_keeps_index_and_missing(self):
+        names = pd.Series(["MoD", None, "MoD", "M/o Railways"], index=[10, 11, 12, 13], name="ministry")
+        result = normalize_ministry_names(names)
+        assert result.index.tolist() == [10, 11, 12, 13]
+        assert result.name == "ministry"
+        assert result.isna().tolist() == [False, True, False, False]
+        assert result.dropna().tolist() == ["Ministry of Defence", "Ministry of Defence", "Ministry of Railways"]
+
+
+class TestMinistryIndex:
+    index = MinistryIndex()
+
+    def test_curated_names_resolve_to_their_ids(self):
+        expenditure = get_curated_expenditure_data()
+        result = self.index.resolve_many(expenditure["name"])
+        assert result["id"].tolist() == expenditure["id"].tolist()
+        assert (result["confidence"] == 1.0).all()
+
+    def test_aliases_and_abbreviations_are_exact(self):
+        assert self.index.resolve("D/o Food & Public Distribution").id == "consumer-affairs"
+        assert self.index.resolve("Ministry of Road Transport and Highways").confidence == 1.0
+        assert self.index.resolve("MoHFW").name == "Ministry of Health & Family Welfare"
+
+    def test_fuzzy_match_scores_below_one(self):
+        match = self.index.resolve("M/o Rural Devpt.")
+        assert match.id == "rural-development"
+        assert 0.5 <= match.confidence < 1.0
+        assert self.index.resolve("Ministry of Home Affairs (Police)").id == "home-affairs"
+
+    def test_unknown_names_resolve_to_nothing(self):
+        coal = self.index.resolve("Ministry of Coal")
+        assert coal.id is None and coal.confidence < 0.5
+        assert self.index.resolve("").id is None
+
+    @pytest.mark.parametrize("name", [
+        "Ministry of Women and Child Development",
+        "Ministry of Corporate Affairs",
+        "Ministry of Tribal Affairs",
+    ])
+    def test_shared_generic_words_do_not_match(self, name):
+        match = self.index.resolve(name)
+        assert match.id is None and match.confidence < self.index.threshold
+
+    @pytest.mark.parametrize("name, ministry_id", [
+        ("Department of Agriculture, Cooperation & FW", "agriculture"),
+        ("M/o Agri. & FW", "agriculture"),
+        ("Department of Health & FW", "health"),
+        ("Dept. of Health and F.W.", "health"),
+        ("Department of Food & PD", "consumer-affairs"),
+        ("D/o School Edu. & Literacy", "education"),
+        ("M/o Road Tpt. & Highways", "road-transport"),
+    ])
+    def test_abbreviated_long_form_names(self, name, ministry_id):
+        match = self.index.resolve(name)
+        assert match.id == ministry_id
+        assert self.index.threshold <= match.confidence < 1.0
+
+    def test_distinctive_word_decides_between_ministries(self):
+        assert self.index.resolve("Ministry of Urban Development").id == "housing-urban"
+        assert self.index.resolve("Ministry of Housing and Urban Development").id == "housing-urban"
+        assert self.index.resolve("Dept of Rural Devlopment").id == "rural-development"
+
+    def test_resolve_many(self):
+        names = pd.Series(["MoRD", "Ministry of Coal", None, "MoRD"])
+        result = self.index.resolve_many(names)
+        assert result["id"].isna().tolist() == [False, True, True, False]
+        assert result["id"][0] == result["id"][3] == "rural-development"
+        assert result["confidence"].tolist()[2] == 0.0
+
+    def test_match_key_drops_filler_words(self):
+        assert match_key("Dept. of Health & Family Welfare") == "health family welfare"
+        assert match_key("Dept. of Health and F.W.") == "health fw"
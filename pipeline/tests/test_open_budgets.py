@@ -0,0 +1,167 @@
+"""
+Tests for CKAN search caching and resumable, verified downloads, against the
+stand-in CKAN server.
+"""
+
+import hashlib
+import json
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.common import cassette, http_client
+from src.common.cache import CACHE_MODE_ENV, DiskCache
+from src.common.ckan_standin import CkanStandIn
+from src.sources import open_budgets
+
+BODY = b"id,name,budget_estimate\n" + b"".join(f"m{i},Ministry {i},{i * 100}\n".encode() for i in range(5000))
+
+
+def dataset(title: str, name: str, **resource) -> dict:
+    return {"title": title, "resources": [{"name": name, "format": "CSV", "url": f"/files/{name}.csv", **resource}]}
+
+
+@pytest.fixture(autouse=True)
+def isolated(monkeypatch, tmp_path):
+    monkeypatch.setattr(open_budgets, "DATA_RAW_DIR", tmp_path / "data-raw")
+    monkeypatch.setattr(open_budgets, "SEARCH_CACHE", DiskCache(tmp_path / "ckan"))
+    monkeypatch.setattr(open_budgets, "CHUNK_SIZE", 4096)
+    monkeypatch.delenv(CACHE_MODE_ENV, raising=False)
+    monkeypatch.delenv(cassette.REPLAY_ENV, raising=False)
+    http_client.configure()
+    yield
+    http_client.configure()
+
+
+def serve(monkeypatch, datasets: list[dict], drop_after: int | None = None) -> CkanStandIn:
+    server = CkanStandIn(datasets, {"expenditure.csv": BODY, "receipts.csv": BODY[:100]}, drop_after=drop_after)
+    server.start()
+    monkeypatch.setattr(open_budgets, "API_BASE", f"{server.url}/api/3/action")
+    return server
+
+
+class TestSearch:
+    def test_cached_per_query(self, monkeypatch):
+        server = serve(monkeypatch, [dataset("Union Budget 2025-26 Expenditure", "expenditure")])
+        try:
+            assert open_budgets.search_datasets("union budget 2025-26")[0]["title"] == "Union Budget 2025-26 Expenditure"
+            assert open_budgets.search_datasets("union budget 2025-26") is not None
+            assert open_budgets.search_datasets("demand for grants") == []
+            assert server.stats["searches"] == 2
+        finally:
+            server.stop()
+
+    def test_offline_uses_cache_only(self, monkeypatch):
+        server = serve(monkeypatch, [dataset("Union Budget 2025-26 Expenditure", "expenditure")])
+        try:
+            open_budgets.search_datasets("union budget 2025-26")
+            monkeypatch.setenv(CACHE_MODE_ENV, "offline")
+            assert len(open_budgets.search_datasets("union budget 2025-26")) == 1
+            assert open_budgets.search_datasets("union budget receipt") is None
+            assert server.stats["searches"] == 1
+        finally:
+            server.stop()
+
+
+class TestDownload:
+    def test_dropped_connection_resumes(self, monkeypatch):
+        server = serve(monkeypatch, [], drop_after=30_000)
+        try:
+            path = open_budgets.download_resource(f"{server.url}/files/expenditure.csv", "expenditure.csv")
+        finally:
+            server.stop()
+        assert path.read_bytes() == BODY
+        assert server.stats["ranged"] >= 1 and server.stats["dropped"] >= 1
+        meta = json.loads(path.with_name("expenditure.csv.meta.json").read_text())
+        assert meta["size"] == len(BODY)
+        assert meta["sha256"] == hashlib.sha256(BODY).hexdigest()
+        assert not path.with_name("expenditure.csv.part").exists()
+
+    def test_partial_file_resumed_with_range(self, monkeypatch):
+        server = serve(monkeypatch, [])
+        raw = open_budgets.DATA_RAW_DIR
+        raw.mkdir(parents=True)
+        url = f"{server.url}/files/expenditure.csv"
+        (raw / "expenditure.csv.part").write_bytes(BODY[:1000])
+        (raw / "expenditure.csv.part.meta.json").write_text(json.dumps({"url": url, "etag": server.etag(BODY)}))
+        try:
+            path = open_budgets.download_resource(url, "expenditure.csv")
+        finally:
+            server.stop()
+        assert path.read_bytes() == BODY
+        assert server.stats == {**server.stats, "downloads": 1, "ranged": 1}
+
+    def test_truncated_file_downloaded_again(self, monkeypatch):
+        server = serve(monkeypatch, [])
+        url = f"{server.url}/files/expenditure.csv"
+        try:
+            path = open_budgets.download_resource(url, "expenditure.csv")
+            assert open_budgets.download_resource(url, "expenditure.csv") == path
+            assert server.stats["downloads"] == 1
+            path.write_bytes(BODY[:500])  # truncated by hand
+            assert not open_budgets.is_complete(path)
+            open_budgets.download_resource(url, "expenditure.csv")
+        finally:
+            server.stop()
+        assert server.stats["downloads"] == 2
+        assert path.read_bytes() == BODY
+
+    def test_published_hash_mismatch_rejected(self, monkeypatch):
+        server = serve(monkeypatch, [])
+        try:
+            path = open_budgets.download_resource(
+                f"{server.url}/files/expenditure.csv", "expenditure.csv", expected_hash="md5:" + "0" * 32
+            )
+        finally:
+            server.stop()
+        assert path is None
+        assert [p.name for p in open_budgets.DATA_RAW_DIR.iterdir()] == [".expenditure.csv.lock"]
+
+    def test_concurrent_downloads_of_one_resource(self, monkeypatch):
+        server = serve(monkeypatch, [], drop_after=30_000)
+        url = f"{server.url}/files/expenditure.csv"
+        try:
+            with ThreadPoolExecutor(max_workers=4) as pool:
+                paths = list(pool.map(lambda _: open_budgets.download_resource(url, "expenditure.csv"), range(4)))
+        finally:
+            server.stop()
+        assert len(set(paths)) == 1 and paths[0].read_bytes() == BODY
+        # One resumed download; the other callers waited and found it complete
+        assert server.stats["downloads"] == server.stats["dropped"] + 1
+
+
+class TestFetch:
+    def test_resource_names_become_safe_filenames(self, tmp_path):
+        names = ["../../etc/passwd", "Demand for Grants/2025-26", "..", "Receipts: BE & RE " + "x" * 200]
+        datasets = [{"title": "t", "resources": [
+            {"name": name, "format": "CSV", "url": f"/files/{i}.csv"} for i, name in enumerate(names)
+        ]}]
+        filenames = [c["filename"] for c in open_budgets._candidates([datasets])]
+        assert filenames[:3] == ["etc_passwd.csv", "Demand_for_Grants_2025-26.csv", "budget_data.csv"]
+        assert filenames[3].startswith("Receipts_BE_RE_xxx") and len(filenames[3]) <= 104
+        assert all(Path(f).name == f and not f.startswith(".") for f in filenames)
+        with pytest.raises(ValueError, match="Unsafe"):
+            open_budgets.download_resource("http://example.invalid/x.csv", "../x.csv")
+
+    def test_best_candidate_through_replay(self, monkeypatch):
+        server = serve(monkeypatch, [
+            dataset("Demand for Grants", "receipts"),
+            dataset("Union Budget 2025-26 Expenditure", "expenditure",
+                    size=len(BODY), hash=hashlib.sha256(BODY).hexdigest()),
+        ])
+        # Route the real API URLs to the stand-in, as PIPELINE_HTTP_REPLAY does for a build
+        monkeypatch.setattr(open_budgets, "API_BASE", open_budgets.BASE_URL + "/api/3/action")
+        monkeypatch.setenv(cassette.REPLAY_ENV, server.url)
+        try:
+            result = open_budgets.fetch_budget_data("2025-26")
+        finally:
+            server.stop()
+        assert result["resource"] == "expenditure"
+        assert Path(result["path"]).read_bytes() == BODY
+        assert sorted(Path(p).name for p in result["downloads"]) == ["expenditure.csv", "receipts.csv"]
+        assert server.stats["searches"] == 4
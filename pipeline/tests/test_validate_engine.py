@@ -0,0 +1,112 @@
+"""
+Tests for the shared VALIDATE engine.
+"""
+
+import importlib
+from pathlib import Path
+
+import pytest
+from pydantic import BaseModel
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.common.cache import DiskCache
+from src.publish import writer
+from src.validate import engine
+
+
+class Point(BaseModel):
+    year: str
+    value: float
+
+
+class Series(BaseModel):
+    name: str
+    points: list[Point]
+
+
+SCHEMAS = {"a.json": Series, "b.json": Point}
+
+
+@pytest.fixture(autouse=True)
+def compact(monkeypatch, tmp_path):
+    monkeypatch.delenv(writer.JSON_MODE_ENV, raising=False)
+    monkeypatch.delenv(engine.VALIDATION_CACHE_ENV, raising=False)
+    monkeypatch.setattr(engine, "CACHE", DiskCache(tmp_path / "validation"))
+
+
+def test_valid_outputs():
+    report = engine.validate_outputs(
+        {"a.json": {"name": "x", "points": [{"year": "2024-25", "value": 1.5}]},
+         "b.json": {"year": "2024-25", "value": 2}},
+        SCHEMAS,
+    )
+    assert report.errors == []
+    assert [r.name for r in report.results] == ["a.json", "b.json"]
+    assert all(r.size > 0 and r.seconds >= 0 for r in report.results)
+
+
+def test_errors_are_labelled():
+    report = engine.validate_outputs(
+        {"a.json": {"name": "x", "points": [{"year": "2024-25"}]}},
+        SCHEMAS,
+        label=lambda key: key.removesuffix(".json"),
+    )
+    assert len(report.errors) == 2
+    assert report.errors[0].startswith("a: ") and "value" in report.errors[0]
+    assert report.errors[1] == "b: output missing"
+
+
+def test_validates_published_bytes():
+    # NaN passes Point(**data) but is published as null, which the model rejects
+    report = engine.validate_outputs({"b.json": {"year": "2024-25", "value": float("nan")}}, {"b.json": Point})
+    assert report.errors
+
+
+def test_adapter_is_cached():
+    assert engine.adapter_for(Point) is engine.adapter_for(Point)
+
+
+class TestCache:
+    OUTPUTS = {"a.json": {"name": "x", "points": [{"year": "2024-25", "value": 1.5}]}}
+
+    @pytest.fixture(autouse=True)
+    def enabled(self, monkeypatch):
+        monkeypatch.setenv(engine.VALIDATION_CACHE_ENV, "1")
+
+    def test_unchanged_output_skips_validation(self):
+        first = engine.validate_outputs(self.OUTPUTS, {"a.json": Series})
+        second = engine.validate_outputs(self.OUTPUTS, {"a.json": Series})
+        assert [r.cached for r in first.results] == [False]
+        assert [r.cached for r in second.results] == [True]
+        assert second.errors == []
+
+    def test_changed_output_is_revalidated(self):
+        engine.validate_outputs(self.OUTPUTS, {"a.json": Series})
+        changed = {"a.json": {"name": "y", "points": []}}
+        assert not engine.validate_outputs(changed, {"a.json": Series}).results[0].cached
+
+    def test_failures_are_not_cached(self):
+        bad = {"a.json": {"name": "x"}}
+        engine.validate_outputs(bad, {"a.json": Series})
+        assert engine.validate_outputs(bad, {"a.json": Series}).errors
+
+    def test_model_change_invalidates(self, tmp_path, monkeypatch):
+        def load(name: str, value: str):
+            path = tmp_path / f"{name}.py"
+            path.write_text(f"from pydantic import BaseModel, Field\n\nclass Point(BaseModel):\n    value: {value}\n")
+            monkeypatch.syspath_prepend(str(tmp_path))
+            return importlib.import_module(name).Point
+
+        loose, strict = load("loose_schemas", "float"), load("strict_schemas", "float = Field(ge=0)")
+        assert engine.schema_fingerprint(loose) != engine.schema_fingerprint(strict)
+        assert engine.schema_fingerprint(Series) != engine.schema_fingerprint(Point)
+        # Nested models count: Series covers Point's source too
+        assert Point in engine._nested_models(Series)
+
+    def test_off_by_default(self, monkeypatch):
+        monkeypatch.delenv(engine.VALIDATION_CACHE_ENV)
+        engine.validate_outputs(self.OUTPUTS, {"a.json": Series})
+        assert not engine.validate_outputs(self.OUTPUTS, {"a.json": Series}).results[0].cached
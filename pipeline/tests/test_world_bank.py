@@ -0,0 +1,283 @@
+"""
+Tests for the shared World Bank client. HTTP calls are replaced with canned responses.
+"""
+
+import threading
+import time
+from pathlib import Path
+
+import pytest
+import requests
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.common import http_client, indicator_registry, world_bank
+from src.common.cache import CACHE_MODE_ENV, REFRESH_AFTER_ENV, DiskCache
+
+
+class FakeResponse:
+    def __init__(self, payload, status_code=200, headers=None):
+        self._payload = payload
+        self.status_code = status_code
+        self.headers = headers or {}
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.exceptions.HTTPError(f"{self.status_code} error")
+
+    def json(self):
+        return self._payload
+
+
+real_get = http_client.get
+
+
+def wb_payload(code: str, points: dict[str, float | None]) -> list:
+    return [
+        {"page": 1, "pages": 1, "per_page": 100, "total": len(points)},
+        [{"indicator": {"id": code}, "date": year, "value": value} for year, value in points.items()],
+    ]
+
+
+@pytest.fixture(autouse=True)
+def tmp_cache(monkeypatch, tmp_path):
+    """Point the response cache at a throwaway directory."""
+    cache = DiskCache(tmp_path / "world_bank")
+    monkeypatch.setattr(world_bank, "CACHE", cache)
+    monkeypatch.delenv(CACHE_MODE_ENV, raising=False)
+    monkeypatch.delenv(REFRESH_AFTER_ENV, raising=False)
+    return cache
+
+
+@pytest.fixture
+def fake_get(monkeypatch):
+    """
+    Serve every indicator with two points after a short delay, paginating
+    semicolon-joined multi-indicator queries. Records (codes, request headers).
+    """
+    calls = []
+
+    def get(url, params=None, headers=None, timeout=None, retries=None, **kwargs):
+        codes = url.rsplit("/", 1)[-1]
+        calls.append((codes, headers or {}))
+        time.sleep(0.05)
+        if (headers or {}).get("If-None-Match") == '"v1"':
+            return FakeResponse(None, status_code=304)
+        points = {"2021": 1.234, "2020": 5.678, "2019": None}
+        records = [
+            record for code in codes.split(";") for record in wb_payload(code, points)[1]
+        ]
+        per_page, page = params["per_page"], params.get("page", 1)
+        meta = {"page": page, "pages": -(-len(records) // per_page), "per_page": per_page}
+        payload = [meta, records[(page - 1) * per_page:page * per_page]]
+        return FakeResponse(payload, headers={"ETag": '"v1"'})
+
+    monkeypatch.setattr(http_client, "get", get)
+    return calls
+
+
+class TestFetchMultiple:
+    INDICATORS = {f"k{i}": f"CODE.{i}" for i in range(8)}
+
+    def test_shape_and_order(self, fake_get):
+        keys = ["k3", "k1", "missing", "k0"]
+        result = world_bank.fetch_multiple(self.INDICATORS, keys, precision=1)
+        assert list(result) == ["k3", "k1", "k0"]
+        assert result["k1"] == [{"year": "2020", "value": 5.7}, {"year": "2021", "value": 1.2}]
+
+    def test_concurrent_matches_sequential(self, fake_get, monkeypatch):
+        served = http_client.get
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = []
+
+        def get(url, **kwargs):
+            with lock:
+                in_flight[0] += 1
+                peak.append(in_flight[0])
+            try:
+                return served(url, **kwargs)
+            finally:
+                with lock:
+                    in_flight[0] -= 1
+
+        monkeypatch.setattr(http_client, "get", get)
+        monkeypatch.setenv(CACHE_MODE_ENV, "refresh")
+        concurrent = world_bank.fetch_multiple(self.INDICATORS, max_in_flight=8, batched=False)
+        concurrent_peak = max(peak)
+        peak.clear()
+        monkeypatch.setenv(REFRESH_AFTER_ENV, str(time.time() + 1))
+        sequential = world_bank.fetch_multiple(self.INDICATORS, max_in_flight=1, batched=False)
+        assert concurrent == sequential
+        # Requests overlap (each is held for 50ms), but never more than allowed
+        assert 1 < concurrent_peak <= 8
+        assert max(peak) == 1
+
+
+class TestBatched:
+    INDICATORS = {f"k{i}": f"CODE.{i}" for i in range(120)}
+
+    def test_batches_and_pages(self, fake_get, monkeypatch):
+        monkeypatch.setattr(world_bank, "BATCH_PER_PAGE", 40)
+        result = world_bank.fetch_multiple(self.INDICATORS, precision=1)
+        batches = [codes.count(";") + 1 for codes, _ in fake_get]
+        # 50 + 50 + 20 codes × 3 records, 40 records per page
+        assert sorted(batches) == [20, 20] + [50] * 8
+        assert all(points == [{"year": "2020", "value": 5.7}, {"year": "2021", "value": 1.2}]
+                   for points in result.values())
+        assert list(result) == list(self.INDICATORS)
+
+    def test_matches_per_code_fetch(self, fake_get, monkeypatch):
+        batched = world_bank.fetch_multiple(self.INDICATORS)
+        monkeypatch.setenv(CACHE_MODE_ENV, "refresh")
+        monkeypatch.setenv(REFRESH_AFTER_ENV, str(time.time() + 1))
+        single = world_bank.fetch_multiple(self.INDICATORS, batched=False)
+        assert batched == single
+        assert len(fake_get) == 3 + 120
+
+    def test_failed_batch_falls_back_per_code(self, fake_get, monkeypatch):
+        served = http_client.get
+
+        def get(url, **kwargs):
+            if ";" in url:
+                return FakeResponse([{"message": [{"key": "Invalid value"}]}])
+            return served(url, **kwargs)
+
+        monkeypatch.setattr(http_client, "get", get)
+        result = world_bank.fetch_multiple({"a": "CODE.A", "b": "CODE.B"})
+        assert result["a"] == result["b"] == [{"year": "2020", "value": 5.68}, {"year": "2021", "value": 1.23}]
+        assert sorted(codes for codes, _ in fake_get) == ["CODE.A", "CODE.B"]
+
+
+    def test_code_missing_from_batch_is_fetched_singly(self, fake_get, monkeypatch):
+        served = http_client.get
+
+        def get(url, **kwargs):
+            resp = served(url, **kwargs)
+            if ";" in url:  # the batch comes back without CODE.B's records
+                meta, records = resp.json()
+                resp = FakeResponse([meta, [r for r in records if r["indicator"]["id"] != "CODE.B"]])
+            return resp
+
+        monkeypatch.setattr(http_client, "get", get)
+        result = world_bank.fetch_multiple({"a": "CODE.A", "b": "CODE.B"})
+        assert result["a"] == result["b"] == [{"year": "2020", "value": 5.68}, {"year": "2021", "value": 1.23}]
+        assert [codes for codes, _ in fake_get] == ["CODE.A;CODE.B", "CODE.B"]
+
+    def test_stale_batch_revalidates(self, fake_get, monkeypatch):
+        monkeypatch.setattr(world_bank, "BATCH_PER_PAGE", 40)
+        wanted = [world_bank._storage_request(code, 2000, 2025, 2) for code in self.INDICATORS.values()]
+        world_bank._fetch_batched(wanted, 8, ttl=0)
+        downloads = len(fake_get)
+        world_bank._fetch_batched(wanted, 8)
+        revalidated = fake_get[downloads:]
+        # One conditional request per page, all answered 304
+        assert len(revalidated) == downloads
+        assert all(headers == {"If-None-Match": '"v1"'} for _, headers in revalidated)
+        result = world_bank.fetch_multiple(self.INDICATORS)
+        assert len(fake_get) == 2 * downloads  # entries are fresh again
+        assert all(points == [{"year": "2020", "value": 5.68}, {"year": "2021", "value": 1.23}]
+                   for points in result.values())
+
+    def test_changed_batch_downloads_again(self, fake_get, tmp_cache):
+        indicators = {"a": "CODE.A", "b": "CODE.B"}
+        wanted = [world_bank._storage_request(code, 2000, 2025, 2) for code in indicators.values()]
+        world_bank._fetch_batched(wanted, 8, ttl=0)
+        batch_key = world_bank._batch_key(["CODE.A", "CODE.B"], world_bank.WDI_SOURCE, 2000, 2025, 2)
+        tmp_cache.put(batch_key, [{"If-None-Match": '"v0"'}])
+        world_bank._fetch_batched(wanted, 8)
+        assert [headers for _, headers in fake_get] == [{}, {"If-None-Match": '"v0"'}, {}]
+        assert tmp_cache.get(batch_key).data == [{"If-None-Match": '"v1"'}]
+        assert world_bank.fetch_multiple(indicators) == {
+            "a": [{"year": "2020", "value": 5.68}, {"year": "2021", "value": 1.23}],
+            "b": [{"year": "2020", "value": 5.68}, {"year": "2021", "value": 1.23}],
+        }
+        assert len(fake_get) == 3
+
+
+class TestCache:
+    def test_warm_run_makes_no_calls(self, fake_get):
+        first = world_bank.fetch_indicator("SP.POP.TOTL")
+        second = world_bank.fetch_indicator("SP.POP.TOTL")
+        assert first == second
+        assert len(fake_get) == 1
+
+    def test_key_includes_range_and_precision(self, fake_get):
+        # An unregistered code, so no shared entry is involved
+        world_bank.fetch_indicator("TEST.CODE", precision=2)
+        world_bank.fetch_indicator("TEST.CODE", precision=4)
+        world_bank.fetch_indicator("TEST.CODE", start_year=2010, precision=4)
+        assert len(fake_get) == 3
+
+    def test_stale_entry_revalidates(self, fake_get):
+        world_bank.fetch_indicator("SP.POP.TOTL", ttl=0)
+        again = world_bank.fetch_indicator("SP.POP.TOTL", ttl=0)
+        assert again[0]["year"] == "2020"
+        assert fake_get[1][1]["If-None-Match"] == '"v1"'
+
+    def test_stale_entry_served_when_api_down(self, fake_get, monkeypatch):
+        world_bank.fetch_indicator("SP.POP.TOTL", ttl=0)
+
+        def down(*args, **kwargs):
+            raise requests.exceptions.ConnectionError("down")
+
+        monkeypatch.setattr(http_client.get_session(), "get", down)
+        monkeypatch.setattr(http_client.time, "sleep", lambda s: pytest.fail("should not back off"))
+        monkeypatch.setattr(http_client, "get", real_get)
+        assert len(world_bank.fetch_indicator("SP.POP.TOTL", ttl=0)) == 2
+
+    def test_offline_and_refresh(self, fake_get, monkeypatch):
+        monkeypatch.setenv(CACHE_MODE_ENV, "offline")
+        assert world_bank.fetch_indicator("SP.POP.TOTL") == []
+        assert fake_get == []
+
+        monkeypatch.setenv(CACHE_MODE_ENV, "default")
+        world_bank.fetch_indicator("SP.POP.TOTL")
+        monkeypatch.setenv(CACHE_MODE_ENV, "refresh")
+        monkeypatch.setenv(REFRESH_AFTER_ENV, str(time.time()))
+        world_bank.fetch_indicator("SP.POP.TOTL")
+        assert len(fake_get) == 2
+        assert fake_get[1][1] == {}
+
+        # Within one refresh run, an entry re-downloaded by an earlier caller is reused
+        world_bank.fetch_indicator("SP.POP.TOTL")
+        assert len(fake_get) == 2
+
+    def test_lru_eviction(self, tmp_path):
+        cache = DiskCache(tmp_path / "lru", max_bytes=400)
+        for i in range(5):
+            cache.put(f"k{i}", list(range(20)))
+            time.sleep(0.01)
+        assert cache.get("k0") is None
+        assert cache.get("k4") is not None
+        assert sum(p.stat().st_size for p in (tmp_path / "lru").glob("*.json")) <= 400
+
+
+class TestIndicatorRegistry:
+    def test_shared_codes_span_widest_range(self):
+        registry = indicator_registry.build_registry()
+        population = registry["SP.POP.TOTL"]
+        assert {"economy.population", "census.population"} <= set(population.users)
+        assert population.covers(2000, 2025)
+
+    def test_shared_code_fetched_once(self, fake_get):
+        census = world_bank.fetch_indicator("SP.POP.TOTL", precision=2)
+        economy = world_bank.fetch_indicator("SP.POP.TOTL", precision=4)
+        assert len(fake_get) == 1
+        assert census == [{"year": "2020", "value": 5.68}, {"year": "2021", "value": 1.23}]
+        assert economy == [{"year": "2020", "value": 5.678}, {"year": "2021", "value": 1.234}]
+
+    def test_view_is_sliced_to_requested_years(self, fake_get):
+        assert world_bank.fetch_indicator("SP.POP.TOTL", start_year=2021) == [
+            {"year": "2021", "value": 1.23}
+        ]
+
+    def test_prefetch_warms_domain_fetches(self, fake_get):
+        counts = indicator_registry.prefetch(["economy", "rbi"])
+        assert len(counts) > world_bank.BATCH_SIZE / 5
+        assert len(fake_get) == 1  # one batched request for the whole union
+        from src.rbi.sources import world_bank as rbi_wb
+        rbi_wb.fetch_multiple()
+        assert len(fake_get) == 1
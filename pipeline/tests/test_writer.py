@@ -0,0 +1,254 @@
+"""
+Tests for the public/data writer: skip-if-unchanged, atomic replacement,
+serialization, sidecars, the hashed-name manifest and indicator shards.
+"""
+
+import json
+import os
+from pathlib import Path
+
+import pytest
+
+# Add pipeline src to path
+import sys
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from src.publish import shards, writer
+
+
+@pytest.fixture(autouse=True)
+def data_dir(monkeypatch, tmp_path):
+    monkeypatch.setattr(writer, "DATA_DIR", tmp_path)
+    monkeypatch.delenv(writer.JSON_MODE_ENV, raising=False)
+    monkeypatch.delenv(writer.HASHED_NAMES_ENV, raising=False)
+    monkeypatch.delenv(shards.SHARD_ENV, raising=False)
+    monkeypatch.delenv(writer.COLUMNAR_ENV, raising=False)
+    monkeypatch.delenv(writer.PRECOMPRESS_ENV, raising=False)
+    return tmp_path
+
+
+OUTPUTS = {
+    "economy/2025-26/summary.json": {"year": "2025-26", "name": "Économie", "value": 6.5},
+    "economy/2025-26/fiscal.json": {"series": [1, 2, 3]},
+}
+
+
+class TestPublish:
+    def test_pretty_matches_previous_writer(self, data_dir, monkeypatch):
+        monkeypatch.setenv(writer.JSON_MODE_ENV, "pretty")
+        writer.publish_all(OUTPUTS)
+        text = (data_dir / "economy/2025-26/summary.json").read_text()
+        assert text == '{\n  "year": "2025-26",\n  "name": "Économie",\n  "value": 6.5\n}'
+
+    def test_unchanged_files_are_skipped(self, data_dir):
+        first = writer.publish_outputs(OUTPUTS)
+        assert (first.written, first.skipped) == (2, 0)
+        path = data_dir / "economy/2025-26/fiscal.json"
+        os.utime(path, (0, 0))
+
+        second = writer.publish_outputs({**OUTPUTS, "economy/2025-26/summary.json": {"year": "2026-27"}})
+        assert (second.written, second.skipped) == (1, 1)
+        assert second.bytes_saved == path.stat().st_size
+        assert path.stat().st_mtime == 0  # untouched
+        assert second.paths == [data_dir / p for p in OUTPUTS]
+
+    def test_new_date_alone_keeps_published_file(self, data_dir):
+        rel = "economy/2025-26/summary.json"
+        writer.publish_outputs({rel: {"value": 6.5, "lastUpdated": "2026-10-16"}}, hashed=True)
+        again = writer.publish_outputs({rel: {"value": 6.5, "lastUpdated": "2026-10-17"}}, hashed=True)
+        assert (again.written, again.hashed) == (0, [])
+        assert json.loads((data_dir / rel).read_bytes())["lastUpdated"] == "2026-10-16"
+
+        writer.publish_outputs({rel: {"value": 7.0, "lastUpdated": "2026-10-17"}})
+        assert json.loads((data_dir / rel).read_bytes()) == {"value": 7, "lastUpdated": "2026-10-17"}
+
+    def test_same_size_different_content_is_rewritten(self, data_dir):
+        writer.write_json({"v": 1}, "x.json")
+        result = writer.write_bytes(writer.serialize({"v": 2}), "x.json")
+        assert result.written
+        assert (data_dir / "x.json").read_text() == '{"v":2}'
+
+    def test_failed_write_leaves_original(self, data_dir, monkeypatch):
+        monkeypatch.setenv(writer.JSON_MODE_ENV, "pretty")
+        writer.write_json({"v": 1}, "x.json")
+
+        def crash(fd):
+            raise OSError("disk full")
+
+        monkeypatch.setattr(writer.os, "fsync", crash)
+        with pytest.raises(OSError):
+            writer.write_json({"v": 22}, "x.json")
+        assert (data_dir / "x.json").read_text() == '{\n  "v": 1\n}'
+        assert [p.name for p in data_dir.iterdir()] == ["x.json"]
+
+
+class TestSerialize:
+    DATA = {"name": "Économie", "growth": 6.499999999999999, "whole": 7.0, "pop": 1_460_000_000,
+            "series": [{"lat": 28.613912, "value": 0.1 + 0.2}], "empty": [], "none": None, "ok": True}
+
+    def test_compact_trims_floats(self):
+        assert writer.serialize(self.DATA).decode() == (
+            '{"name":"Économie","growth":6.5,"whole":7,"pop":1460000000,'
+            '"series":[{"lat":28.6139,"value":0.3}],"empty":[],"none":null,"ok":true}'
+        )
+
+    def test_field_precision_override(self):
+        out = writer.serialize(self.DATA, field_decimals={"lat": 6, "growth": 0})
+        assert b'"lat":28.613912' in out and b'"growth":6,' in out
+
+    def test_domain_precision(self, data_dir):
+        writer.publish_all({"states/summary.json": self.DATA}, decimals=2)
+        out = (data_dir / "states/summary.json").read_bytes()
+        assert b'"lat":28.61,' in out and b'"growth":6.5,' in out
+
+    def test_stdlib_fallback_matches_orjson(self, monkeypatch):
+        fast = writer.serialize(self.DATA)
+        monkeypatch.setattr(writer, "orjson", None)
+        assert writer.serialize(self.DATA) == fast
+
+    def test_size_report_by_domain(self, data_dir, monkeypatch):
+        monkeypatch.setenv(writer.JSON_MODE_ENV, "pretty")
+        pretty = writer.publish_outputs(OUTPUTS, compress=False)
+        monkeypatch.delenv(writer.JSON_MODE_ENV)
+        compact = writer.publish_outputs(OUTPUTS, compress=False)
+        files, before, after = compact.sizes_by_domain()["economy"]
+        assert files == 2
+        assert before == sum(r.size for r in pretty.results)
+        assert after == sum(r.size for r in compact.results) < before
+
+
+class TestSidecars:
+    @pytest.fixture(autouse=True)
+    def precompress(self, monkeypatch):
+        monkeypatch.setenv(writer.PRECOMPRESS_ENV, "1")
+
+    def test_off_by_default(self, data_dir, monkeypatch):
+        monkeypatch.delenv(writer.PRECOMPRESS_ENV)
+        assert writer.publish_outputs(OUTPUTS).sidecars == []
+        assert not list(data_dir.rglob("*.gz"))
+
+    def test_sidecars_round_trip(self, data_dir):
+        import gzip
+        report = writer.publish_outputs(OUTPUTS)
+        path = data_dir / "economy/2025-26/summary.json"
+        assert gzip.decompress(path.with_name("summary.json.gz").read_bytes()) == path.read_bytes()
+        if writer.brotli is not None:
+            assert writer.brotli.decompress(path.with_name("summary.json.br").read_bytes()) == path.read_bytes()
+        assert len(report.sidecars) == 2 * len(writer.sidecar_suffixes())
+
+    def test_regenerated_only_on_change(self, data_dir):
+        writer.publish_outputs(OUTPUTS)
+        again = writer.publish_outputs({**OUTPUTS, "economy/2025-26/fiscal.json": {"series": [4]}})
+        assert {p.name for p in again.sidecars} == {"fiscal.json" + s for s in writer.sidecar_suffixes()}
+
+        (data_dir / "economy/2025-26/summary.json.gz").unlink()
+        assert [p.name for p in writer.publish_outputs(OUTPUTS).sidecars if "summary" in p.name] == ["summary.json.gz"]
+
+    def test_precompress_tree_covers_static_files(self, data_dir):
+        static = data_dir / "geo" / "states.topo.json"
+        static.parent.mkdir()
+        static.write_text('{"type": "Topology"}')
+        assert static.with_name("states.topo.json.gz") in writer.precompress_tree()
+        assert writer.precompress_tree() == []
+
+    def test_without_brotli_only_gzip(self, data_dir, monkeypatch):
+        monkeypatch.setattr(writer, "brotli", None)
+        report = writer.publish_outputs(OUTPUTS)
+        assert {p.suffix for p in report.sidecars} == {".gz"}
+
+
+class TestManifest:
+    def test_hashed_copy_and_manifest(self, data_dir):
+        report = writer.publish_outputs(OUTPUTS, compress=True, hashed=True)
+        manifest = json.loads((data_dir / writer.MANIFEST).read_bytes())
+        entry = manifest["files"]["economy/2025-26/summary.json"]
+        plain = data_dir / "economy/2025-26/summary.json"
+        assert entry["file"] == f"economy/2025-26/summary.{entry['sha256'][:8]}.json"
+        assert (data_dir / entry["file"]).read_bytes() == plain.read_bytes()
+        assert entry["size"] == plain.stat().st_size
+        assert (data_dir / (entry["file"] + ".gz")).exists()
+        assert len(report.hashed) == 2 * (1 + len(writer.sidecar_suffixes()))
+
+    def test_off_by_default(self, data_dir):
+        writer.publish_outputs(OUTPUTS, bundle=False)
+        assert not (data_dir / writer.MANIFEST).exists()
+        writer.publish_outputs(OUTPUTS)
+        # Only the bundle is recorded, no hashed files
+        assert json.loads((data_dir / writer.MANIFEST).read_bytes())["files"] == {}
+
+    def test_plain_publish_drops_stale_entry(self, data_dir):
+        writer.publish_outputs({"economy/summary.json": {"v": 1}, "rbi/summary.json": {"rate": 6.5}}, hashed=True)
+        old = json.loads((data_dir / writer.MANIFEST).read_bytes())["files"]["economy/summary.json"]["file"]
+        writer.publish_outputs({"economy/summary.json": {"v": 2}, "rbi/summary.json": {"rate": 6.5}})
+        manifest = json.loads((data_dir / writer.MANIFEST).read_bytes())
+        # The changed file is served from its plain path; the unchanged entry stays
+        assert set(manifest["files"]) == {"rbi/summary.json"}
+        assert (data_dir / old).exists()
+
+    def test_unchanged_keeps_generated_time(self, data_dir):
+        writer.publish_outputs(OUTPUTS, hashed=True)
+        before = (data_dir / writer.MANIFEST).read_bytes()
+        second = writer.publish_outputs(OUTPUTS, hashed=True)
+        assert second.hashed == []
+        assert (data_dir / writer.MANIFEST).read_bytes() == before
+
+    def test_merges_domains_and_prunes_old_generations(self, data_dir):
+        writer.publish_outputs({"rbi/summary.json": {"rate": 6.5}}, hashed=True)
+        names = []
+        for value in (1, 2, 3):
+            writer.publish_outputs({"economy/summary.json": {"v": value}}, hashed=True)
+            manifest = json.loads((data_dir / writer.MANIFEST).read_bytes())
+            names.append(manifest["files"]["economy/summary.json"]["file"])
+        assert set(manifest["files"]) == {"rbi/summary.json", "economy/summary.json"}
+        assert manifest["files"]["economy/summary.json"]["previous"] == names[1]
+        assert not (data_dir / names[0]).exists()
+        assert (data_dir / names[1]).exists() and (data_dir / names[2]).exists()
+
+
+INDICATORS = {
+    "census/2025-26/indicators.json": {
+        "year": "2025-26",
+        "indicators": [
+            {"id": "sex_ratio", "name": "Sex Ratio", "category": "demographics", "unit": "per 1000",
+             "states": [{"id": "KA", "value": 973}], "source": "Census 2011"},
+            {"id": "literacy_total", "name": "Literacy", "category": "literacy", "unit": "percent",
+             "states": [{"id": "KA", "value": 75.4}], "source": "Census 2011"},
+        ],
+    },
+}
+
+
+class TestShards:
+    def test_index_and_shards(self, data_dir):
+        report = writer.publish_outputs(INDICATORS, shard=True)
+        index = json.loads((data_dir / "census/2025-26/indicators-index.json").read_bytes())
+        assert index["indicators"][0] == {
+            "id": "sex_ratio", "name": "Sex Ratio", "category": "demographics",
+            "unit": "per 1000", "source": "Census 2011",
+            "shard": "census/2025-26/indicators/sex_ratio.json",
+        }
+        for entry, indicator in zip(index["indicators"], INDICATORS["census/2025-26/indicators.json"]["indicators"]):
+            shard = json.loads((data_dir / entry["shard"]).read_bytes())
+            assert shard == {"year": "2025-26", "indicator": indicator}
+        # The monolithic file is still published
+        assert (data_dir / "census/2025-26/indicators.json").exists()
+        assert len(report.results) == 4
+
+    def test_off_by_default(self, data_dir):
+        writer.publish_outputs(INDICATORS)
+        assert not (data_dir / "census/2025-26/indicators").exists()
+
+    def test_removed_indicator_shard_is_deleted(self, data_dir):
+        writer.publish_outputs(INDICATORS, compress=True, shard=True)
+        shard = data_dir / "census/2025-26/indicators/literacy_total.json"
+        assert shard.with_name(shard.name + ".gz").exists()
+        data = INDICATORS["census/2025-26/indicators.json"]
+        fewer = {"census/2025-26/indicators.json": {**data, "indicators": data["indicators"][:1]}}
+        writer.publish_outputs(fewer, compress=True, shard=True)
+        assert not shard.exists()
+        assert all(p.name.startswith("sex_ratio.json") for p in shard.parent.iterdir())
+
+    def test_unsafe_id_rejected(self):
+        bad = {"x/indicators.json": {"year": "2025-26", "indicators": [{"id": "../evil"}]}}
+        with pytest.raises(ValueError):
+            shards.expand(bad)
@@ -64,7 +64,8 @@ export function useBudgetData(year: string): BudgetData {
       loadStatewise(year),
       loadSchemes(year),
       loadBudgetTrends(year),
-      loadBudgetVsActual(year),
+      // Not published for years before the curated BE/RE/Actual series
+      loadBudgetVsActual(year).catch(() => null),
     ])
       .then(([summary, receipts, expenditure, sankey, treemap, statewise, schemes, trends, budgetVsActual]) => {
         if (!cancelled) {
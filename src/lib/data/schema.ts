@@ -857,6 +857,22 @@ export interface CPICategoryEntry {
   series: { period: string; value: number }[];
 }
 
+export interface MonthlyCPIPoint {
+  month: string;  // 'YYYY-MM'
+  index: number | null;
+  inflation: number | null;  // YoY %
+  rolling3: number | null;  // trailing 3-month mean of YoY %
+  rolling12: number | null;  // trailing 12-month mean of YoY %
+  momentum: number | null;  // month-on-month % change in the index
+}
+
+export interface MonthlyInflationData {
+  year: string;
+  baseYear: string;
+  divisions: { division: string; name: string; series: MonthlyCPIPoint[] }[];
+  source: string;
+}
+
 // ─── Loan Spreads (for EMI calculator) ──────────────────────────
 
 export interface LoanSpread {
@@ -1168,6 +1184,27 @@ export interface GlossaryData {
   terms: GlossaryTerm[];
 }
 
+// ─── Indicator shards (pipeline --shard-indicators) ──────────────
+
+export interface IndicatorIndexEntry {
+  id: string;
+  name: string;
+  category: string;
+  unit: string;
+  source?: string;
+  shard: string;  // path under /data/, e.g. 'census/2025-26/indicators/sex_ratio.json'
+}
+
+export interface IndicatorIndex {
+  year: string;
+  indicators: IndicatorIndexEntry[];
+}
+
+export interface IndicatorShard<T> {
+  year: string;
+  indicator: T;
+}
+
 export interface CitizenQuestion {
   id: string;
   domain: string;
@@ -14,6 +14,7 @@ import type {
   EconomySummary,
   GDPGrowthData,
   InflationData,
+  MonthlyInflationData,
   FiscalData,
   ExternalData,
   SectorsData,
@@ -63,17 +64,85 @@ import type {
   RepresentationData,
   ElectionsIndicatorsData,
   GlossaryData,
+  IndicatorIndex,
+  IndicatorShard,
   LoanSpreadsData,
   CitizenQuestion,
 } from './data/schema.ts';
 
 const cache = new Map<string, unknown>();
 
-async function fetchJson<T>(path: string): Promise<T> {
-  if (cache.has(path)) return cache.get(path) as T;
+interface ManifestEntry {
+  file: string;
+  size: number;
+  sha256: string;
+  generated: string;
+  previous?: string | null;
+  // JSON Patch (RFC 6902) from the previous generation, when smaller than the file
+  delta?: { from: string; file: string; size: number } | null;
+}
+
+interface Manifest {
+  files: Record<string, ManifestEntry>;
+  // bundle path → logical paths it contains
+  bundles?: Record<string, string[]>;
+}
+
+// Published by the pipeline build: logical path → immutable content-hashed
+// file (`--hashed`) and per-page bundles. Without a manifest (or an entry)
+// the plain path is fetched. index.html preloads it and the request starts
+// when this module loads, so it runs alongside the app bundle instead of
+// ahead of the first data fetch.
+let manifest: Promise<{ files: Record<string, ManifestEntry>; bundleOf: Map<string, string> }> | null =
+  null;
+const bundles = new Map<string, Promise<Record<string, unknown>>>();
+
+function loadManifest() {
+  manifest ??= fetch('/data/manifest.json')
+    .then((res) => (res.ok ? (res.json() as Promise<Manifest>) : { files: {} }))
+    .catch((): Manifest => ({ files: {} }))
+    .then((m) => {
+      const bundleOf = new Map<string, string>();
+      for (const [bundle, members] of Object.entries(m.bundles ?? {})) {
+        for (const member of members) bundleOf.set(member, bundle);
+      }
+      return { files: m.files ?? {}, bundleOf };
+    });
+  return manifest;
+}
+
+loadManifest();
+
+function resolve(files: Record<string, ManifestEntry>, logical: string): string {
+  const entry = files[logical];
+  return `/data/${entry ? entry.file : logical}`;
+}
+
+async function fetchOne(path: string): Promise<unknown> {
   const res = await fetch(path);
   if (!res.ok) throw new Error(`Failed to fetch ${path}: ${res.status}`);
-  const data = await res.json();
+  return res.json();
+}
+
+async function fetchJson<T>(path: string): Promise<T> {
+  if (cache.has(path)) return cache.get(path) as T;
+  const { files, bundleOf } = await loadManifest();
+  const logical = path.replace(/^\/data\//, '');
+  const bundle = bundleOf.get(logical);
+  if (bundle) {
+    // One request per page: every member of the bundle lands in the cache
+    if (!bundles.has(bundle)) {
+      bundles.set(bundle, fetchOne(resolve(files, bundle)) as Promise<Record<string, unknown>>);
+    }
+    try {
+      const members = await bundles.get(bundle)!;
+      for (const [member, data] of Object.entries(members)) cache.set(`/data/${member}`, data);
+      if (cache.has(path)) return cache.get(path) as T;
+    } catch {
+      bundles.delete(bundle); // fall back to the individual file
+    }
+  }
+  const data = await fetchOne(resolve(files, logical));
   cache.set(path, data);
   return data as T;
 }
@@ -123,6 +192,9 @@ export const loadGDPGrowth = (year: string) =>
 export const loadInflation = (year: string) =>
   fetchJson<InflationData>(`/data/economy/${year}/inflation.json`);
 
+export const loadMonthlyInflation = (year: string) =>
+  fetchJson<MonthlyInflationData>(`/data/economy/${year}/inflation-monthly.json`);
+
 export const loadFiscal = (year: string) =>
   fetchJson<FiscalData>(`/data/economy/${year}/fiscal.json`);
 
@@ -283,6 +355,14 @@ export const loadLoanSpreads = () =>
 export const loadGlossary = (domain: string, year: string) =>
   fetchJson<GlossaryData>(`/data/${domain}/${year}/glossary.json`);
 
+// ─── Indicator shards (explorer lazy loading) ──────────────────
+// Only published when the pipeline runs with --shard-indicators
+export const loadIndicatorIndex = (domain: string, year: string) =>
+  fetchJson<IndicatorIndex>(`/data/${domain}/${year}/indicators-index.json`);
+
+export const loadIndicatorShard = <T>(shard: string) =>
+  fetchJson<IndicatorShard<T>>(`/data/${shard}`);
+
 // ─── Citizen Questions (search) ─────────────────────────────────
 export const loadQuestions = () =>
   fetchJson<CitizenQuestion[]>('/data/questions.json');